@@ -64,6 +64,8 @@ class Settings(dict):
             value = os.path.abspath(os.path.expandvars(value))
         elif key == 'test_data.directory':
             value = os.path.abspath(os.path.expandvars(value))
+        elif key == 'database.cache':
+            value = os.path.abspath(os.path.expandvars(os.path.expanduser(value)))
         else:
             raise SettingsError('Unexpecting setting "{0}" encountered.'.format(key))
         self.sources[key] = '-'
@@ -136,6 +138,12 @@ class Settings(dict):
                     value = value.strip()
                     self['test_data.directory'] = value
                     self.sources['test_data.directory'] = "from {0}".format(self.filename)
+
+                elif line.find('database.cache') != -1:
+                    value = line.split()[-1]  # Get the last token from this line
+                    value = value.strip()
+                    self['database.cache'] = value
+                    self.sources['database.cache'] = "from {0}".format(self.filename)
     
     def reset(self):
         """
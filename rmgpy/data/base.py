@@ -163,6 +163,10 @@ class Database:
     local_context['Book'] = Book
     local_context['Thesis'] = Thesis
 
+    # The attributes set when loading each component of a lazy database, as a
+    # mapping of attribute names to component names (see :meth:`deferLoading`)
+    lazyAttributes = {}
+
     def __init__(self,
                  entries=None,
                  top=None,
@@ -179,6 +183,65 @@ class Database:
         self.solvent = solvent
         self.shortDesc = shortDesc
         self.longDesc = longDesc
+        self.moleculeIndex = None
+        self.moleculeIndexSize = 0
+        self.nodeFilters = {}
+        self.unloadedComponents = {}
+
+    def __getattr__(self, name):
+        """
+        Load the component of a lazy database that sets the attribute `name`
+        when the attribute is first accessed. This is only called for
+        attributes that are not set.
+        """
+        component = self.lazyAttributes.get(name)
+        if component is None or component not in self.__dict__.get('unloadedComponents', ()):
+            raise AttributeError(name)
+        self.loadComponent(component)
+        return getattr(self, name)
+
+    def __getstate__(self):
+        """
+        Return the state of the database for pickling. Components that were
+        not loaded yet are loaded first, since the functions that load them
+        cannot be pickled.
+        """
+        self.loadAllComponents()
+        return self.__dict__
+
+    def deferLoading(self, component, method, *args):
+        """
+        Defer loading the given `component` of the database until one of its
+        attributes in :attr:`lazyAttributes` is first accessed, which calls
+        ``method(*args)`` to load it. Until then, these attributes are removed
+        from the database; they are restored just before the component is
+        loaded.
+        """
+        defaults = {}
+        for attribute, attributeComponent in self.lazyAttributes.iteritems():
+            if attributeComponent == component and attribute in self.__dict__:
+                defaults[attribute] = self.__dict__.pop(attribute)
+        self.unloadedComponents[component] = (method, args, defaults)
+
+    def loadComponent(self, component):
+        """
+        Load the given `component` of a lazy database, if it was not loaded
+        yet.
+        """
+        try:
+            method, args, defaults = self.unloadedComponents.pop(component)
+        except KeyError:
+            return
+        self.__dict__.update(defaults)
+        method(*args)
+
+    def loadAllComponents(self):
+        """
+        Load all of the components of a lazy database that were not loaded
+        yet.
+        """
+        for component in self.__dict__.get('unloadedComponents', {}).keys():
+            self.loadComponent(component)
 
     def load(self, path, local_context=None, global_context=None):
         """
@@ -232,10 +295,51 @@ class Database:
         self.solvent = local_context['solvent']
         self.shortDesc = local_context['shortDesc']
         self.longDesc = local_context['longDesc'].strip()
+
+        # Index the molecule and species entries (e.g. of libraries) for lookup
+        self.indexMoleculeEntries()
         
         # Return the loaded database (to allow for Database().load() syntax)
         return self
 
+    def indexMoleculeEntries(self):
+        """
+        Index the entries whose item is a :class:`Molecule` or a species (an
+        object with a `molecule` list) by the connectivity key of the item,
+        which is the same for all resonance structures. Entries with other
+        items (e.g. groups) are not indexed.
+        """
+        self.moleculeIndex = {}
+        for position, entry in enumerate(self.entries.itervalues()):
+            item = entry.item
+            if not isinstance(item, Molecule):
+                molecules = getattr(item, 'molecule', None)
+                if not molecules or not isinstance(molecules[0], Molecule):
+                    continue
+                item = molecules[0]
+            self.moleculeIndex.setdefault(item.get_connectivity_key(), []).append((position, entry))
+        self.moleculeIndexSize = len(self.entries)
+
+    def getMoleculeEntryCandidates(self, molecules):
+        """
+        Return the list of entries that may be isomorphic to any of the
+        :class:`Molecule` objects in `molecules` (e.g. the resonance structures
+        of a species), in the order of the entries in the database. Entries
+        not returned cannot be isomorphic to any of the molecules, so a search
+        for a matching entry only needs to check the returned entries.
+        """
+        if self.moleculeIndex is None or self.moleculeIndexSize != len(self.entries):
+            # Entries were added or removed since the index was made
+            self.indexMoleculeEntries()
+        keys = set([molecule.get_connectivity_key() for molecule in molecules])
+        if len(keys) == 1:
+            return [entry for position, entry in self.moleculeIndex.get(keys.pop(), [])]
+        candidates = []
+        for key in keys:
+            candidates.extend(self.moleculeIndex.get(key, []))
+        candidates.sort(key=lambda candidate: candidate[0])
+        return [entry for position, entry in candidates]
+
     def getEntriesToSave(self):
         """
         Return a sorted list of the entries in this database that should be
@@ -1000,17 +1104,26 @@ class Database:
         not generally used in other GAVs due to species generally not being prelabeled.
         """
 
+        # Precompiled necessary conditions are only checked for molecules
+        useFilters = isinstance(structure, Molecule)
+
         if root is None:
             for root in self.top:
+                if useFilters and not self.matchNodeFilter(root, structure, atoms):
+                    continue
                 if self.matchNodeToStructure(root, structure, atoms, strict):
                     break # We've found a matching root
             else: # didn't break - matched no top nodes
                 return None
+        elif useFilters and not self.matchNodeFilter(root, structure, atoms):
+            return None
         elif not self.matchNodeToStructure(root, structure, atoms, strict):
             return None
         
         next = []
         for child in root.children:
+            if useFilters and not self.matchNodeFilter(child, structure, atoms, matchedParent=root):
+                continue
             if self.matchNodeToStructure(child, structure, atoms, strict):
                 next.append(child)
 
@@ -1025,6 +1138,76 @@ class Database:
             #logging.warning('For {0}, a node {1} with overlapping children {2} was encountered in tree with top level nodes {3}. Assuming the first match is the better one.'.format(structure, root, next, self.top))
             return self.descendTree(structure, atoms, next[0], strict)
 
+    def getNodeFilter(self, node):
+        """
+        Return the precompiled necessary conditions for a molecule to match
+        the group of `node`, which are made on the first use of each node.
+        For each labeled atom of the group, these are the number of its
+        neighbors and a list of (atom, bond) pairs, each of which must be
+        matched by a neighbor of the labeled atom in the molecule and its bond.
+
+        Two lists of conditions are returned: all conditions, and only those
+        not already implied by a match to the parent node (the delta from the
+        parent). The second is used when descending the tree, since children
+        are only checked after their parent has matched.
+        """
+        try:
+            parent, item, conditions, deltaConditions = self.nodeFilters[node]
+        except KeyError:
+            pass
+        else:
+            if parent is node.parent and item is node.item:
+                return conditions, deltaConditions
+
+        conditions = getGroupNeighborConditions(node.item)
+        deltaConditions = conditions
+        parentConditions = getGroupNeighborConditions(node.parent.item) if node.parent is not None else []
+        parentConditions = dict([(label, neighbors) for label, numNeighbors, neighbors in parentConditions])
+        # With other labels, other atoms of the structure would be ignored when matching the parent
+        if conditions and set(parentConditions) == set([label for label, numNeighbors, neighbors in conditions]):
+            deltaConditions = []
+            for label, numNeighbors, neighbors in conditions:
+                parentNeighbors = parentConditions.get(label, [])
+                neighbors = [(atom, bond) for atom, bond in neighbors
+                             if not any([parentAtom.isSpecificCaseOf(atom) and parentBond.isSpecificCaseOf(bond)
+                                         for parentAtom, parentBond in parentNeighbors])]
+                deltaConditions.append((label, numNeighbors, neighbors))
+        self.nodeFilters[node] = (node.parent, node.item, conditions, deltaConditions)
+        return conditions, deltaConditions
+
+    def matchNodeFilter(self, node, structure, atoms, matchedParent=None):
+        """
+        Return ``False`` if the :class:`Molecule` `structure` centered at
+        `atoms` certainly does not match the group of `node`, using the
+        precompiled conditions of :meth:`getNodeFilter`, or ``True`` if it
+        may match, in which case :meth:`matchNodeToStructure` decides. If
+        the structure is known to match the parent of `node`, given as
+        `matchedParent`, only the conditions added by the node are checked.
+        """
+        conditions, deltaConditions = self.getNodeFilter(node)
+        if matchedParent is not None and matchedParent is node.parent:
+            conditions = deltaConditions
+        for label, numNeighbors, neighbors in conditions:
+            atom = atoms.get(label)
+            if atom is None or isinstance(atom, list):
+                continue
+            if len(atom.edges) < numNeighbors:
+                return False
+            for groupAtom, groupBond in neighbors:
+                for neighbor, bond in atom.edges.iteritems():
+                    if neighbor.isSpecificCaseOf(groupAtom) and bond.isSpecificCaseOf(groupBond):
+                        break
+                else:
+                    return False
+        return True
+
+    def clearNodeFilters(self):
+        """
+        Remove the precompiled conditions of the nodes, e.g. after groups
+        have been modified in place.
+        """
+        self.nodeFilters.clear()
+
     def areSiblings(self, node, nodeOther):
         """
         Return `True` if `node` and `nodeOther` have the same parent node.  Otherwise, return `False`.
@@ -1262,6 +1445,23 @@ def getAllCombinations(nodeLists):
 
     return items
 
+def getGroupNeighborConditions(group):
+    """
+    Return a list of (label, number of neighbors, [(atom, bond), ...]) tuples
+    with the neighbors of each labeled atom of the :class:`Group` object
+    `group` and their bonds, which must be matched by the neighbors of the
+    corresponding atoms in any molecule that matches the group. An empty
+    list is returned for other items, such as logic nodes.
+    """
+    if not isinstance(group, Group):
+        return []
+    conditions = []
+    for label, center in group.getLabeledAtoms().iteritems():
+        if isinstance(center, list):
+            continue
+        conditions.append((label, len(center.edges), center.edges.items()))
+    return conditions
+
 ################################################################################
 
 class ForbiddenStructures(Database):
@@ -116,6 +116,67 @@ class TestBaseDatabase(unittest.TestCase):
         self.assertTrue(self.database.matchNodeToNode(entry1,entry1))
         self.assertFalse(self.database.matchNodeToNode(entry1,entry2))
 
+    def testNodeFilters(self):
+        """
+        Test that the precompiled node conditions reject structures that
+        cannot match a node and do not change the result of descending a tree.
+        """
+        top = Entry(label='C', item=Group().fromAdjacencyList("""
+        1 * C u0 {2,S}
+        2   H u0 {1,S}
+        """))
+        alcohol = Entry(label='C-OH', item=Group().fromAdjacencyList("""
+        1 * C u0 {2,S} {3,S}
+        2   H u0 {1,S}
+        3   O u0 {1,S}
+        """))
+        amine = Entry(label='C-NH2', item=Group().fromAdjacencyList("""
+        1 * C u0 {2,S} {3,S}
+        2   H u0 {1,S}
+        3   N u0 {1,S}
+        """))
+        top.children = [alcohol, amine]
+        alcohol.parent = top
+        amine.parent = top
+        for entry in [top, alcohol, amine]:
+            self.database.entries[entry.label] = entry
+        self.database.top = [top]
+
+        conditions, deltaConditions = self.database.getNodeFilter(amine)
+        self.assertEqual([len(neighbors) for label, numNeighbors, neighbors in conditions], [2])
+        # The hydrogen atom is already required by the parent
+        self.assertEqual([len(neighbors) for label, numNeighbors, neighbors in deltaConditions], [1])
+
+        molecule = Molecule(SMILES='CN')
+        carbon = molecule.atoms[0]
+        self.assertFalse(self.database.matchNodeFilter(alcohol, molecule, {'*': carbon}, matchedParent=top))
+        self.assertTrue(self.database.matchNodeFilter(amine, molecule, {'*': carbon}, matchedParent=top))
+        self.assertIs(self.database.descendTree(molecule, {'*': carbon}), amine)
+        self.assertIsNone(self.database.descendTree(molecule, {'*': molecule.atoms[1]}, root=alcohol))
+        molecule = Molecule(SMILES='CCO')
+        self.assertIs(self.database.descendTree(molecule, {'*': molecule.atoms[1]}), alcohol)
+
+    def testGetMoleculeEntryCandidates(self):
+        """
+        Test that the molecule index returns only the entries that may be
+        isomorphic to the given molecules, in order, and follows changes of
+        the entries.
+        """
+        for label, smiles in [('propene', 'C=CC'), ('allyl', '[CH2]C=C'), ('cyclopropane', 'C1CC1'),
+                              ('propane', 'CCC')]:
+            self.database.entries[label] = Entry(label=label, item=Molecule(SMILES=smiles))
+        self.database.entries['group'] = Entry(label='group', item=Group().fromAdjacencyList('1 *1 R!H u1'))
+
+        allyl = Molecule(SMILES='C=C[CH2]')
+        resonance = allyl.generate_resonance_structures()
+        candidates = self.database.getMoleculeEntryCandidates(resonance)
+        self.assertEqual([entry.label for entry in candidates], ['allyl'])
+        candidates = self.database.getMoleculeEntryCandidates([Molecule(SMILES='CCC'), Molecule(SMILES='CC=C')])
+        self.assertEqual([entry.label for entry in candidates], ['propene', 'propane'])
+
+        self.database.entries.pop('allyl')
+        self.assertEqual(self.database.getMoleculeEntryCandidates(resonance), [])
+
 
 class TestForbiddenStructures(unittest.TestCase):
 
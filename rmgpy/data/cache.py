@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+"""
+This module contains a binary cache of loaded RMG databases, which allows
+RMG, Arkane and the tools to restore the fully constructed database in
+seconds instead of parsing every database file again. The cache is
+invalidated automatically when any of the database files or RMG source files
+changes.
+"""
+
+import cPickle
+import hashlib
+import logging
+import os
+import os.path
+import tempfile
+import time
+
+import rmgpy
+
+################################################################################
+
+class DatabaseCache(object):
+    """
+    A binary cache of loaded databases in the directory `directory`. Each
+    cache file holds the database loaded from one path with one set of load
+    arguments, along with a manifest of the modification time, size and hash
+    of the source files the database depends on: the files of the database
+    and the source files of RMG. A cache file is only used if all of the
+    source files are still the same; files whose modification time changed
+    are compared by their hash, so they only invalidate the cache if their
+    contents changed.
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `directory`         The directory of the cache files
+    `hits`              The number of databases restored from the cache
+    `misses`            The number of databases not found in the cache
+    =================== ========================================================
+
+    """
+
+    # Increment this when the format of the cache files changes
+    version = 1
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def getPath(self, arguments):
+        """
+        Return the path of the cache file of the database loaded with the
+        given tuple of load `arguments`.
+        """
+        key = hashlib.sha1(repr((self.version, rmgpy.__version__, arguments))).hexdigest()
+        return os.path.join(self.directory, key + '.pkl')
+
+    def load(self, path, arguments):
+        """
+        Return the database components stored for the database at `path`
+        loaded with the tuple of load `arguments`, or ``None`` if they are not
+        in the cache or the cache file is out of date.
+        """
+        cachePath = self.getPath(arguments)
+        if not os.path.exists(cachePath):
+            self.misses += 1
+            return None
+        t0 = time.time()
+        try:
+            with open(cachePath, 'rb') as f:
+                header = cPickle.load(f)
+                if (header['version'] != self.version or header['arguments'] != arguments
+                        or not isManifestValid(header['files'], getSourceFiles(path))):
+                    logging.info('The RMG database cache {0} is out of date.'.format(cachePath))
+                    self.misses += 1
+                    return None
+                components = cPickle.load(f)
+        except Exception:
+            logging.warning('Could not read the RMG database cache {0}; '
+                            'loading the database from its files.'.format(cachePath))
+            logging.debug('Error while reading the RMG database cache:', exc_info=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        logging.info('Loaded RMG database from the cache {0} in {1:.1f} s.'.format(cachePath, time.time() - t0))
+        return components
+
+    def save(self, path, arguments, components):
+        """
+        Store the dictionary of database `components` loaded from the database
+        at `path` with the tuple of load `arguments`. The cache file is
+        written to a temporary file first, so other jobs never read a
+        partially written cache file.
+        """
+        cachePath = self.getPath(arguments)
+        header = {
+            'version': self.version,
+            'arguments': arguments,
+            'files': getManifest(getSourceFiles(path)),
+        }
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        fd, tempPath = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                cPickle.dump(header, f, cPickle.HIGHEST_PROTOCOL)
+                cPickle.dump(components, f, cPickle.HIGHEST_PROTOCOL)
+            os.rename(tempPath, cachePath)
+        except Exception:
+            logging.warning('Could not save the RMG database to the cache {0}.'.format(cachePath))
+            logging.debug('Error while saving the RMG database cache:', exc_info=True)
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            return False
+        logging.info('Saved RMG database to the cache {0}.'.format(cachePath))
+        return True
+
+    def clear(self):
+        """
+        Remove all cache files from the cache directory, and return the
+        number of files removed.
+        """
+        removed = 0
+        if os.path.exists(self.directory):
+            for filename in os.listdir(self.directory):
+                if filename.endswith('.pkl'):
+                    os.remove(os.path.join(self.directory, filename))
+                    removed += 1
+        return removed
+
+################################################################################
+
+def getSourceFiles(path):
+    """
+    Return the sorted list of the files a database loaded from `path`
+    depends on: all of the files in the database directory `path`, and the
+    Python and Cython source and extension files of RMG.
+    """
+    files = []
+    for root, dirs, filenames in os.walk(path):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        files.extend([os.path.join(root, f) for f in filenames if not f.startswith('.') and not f.endswith('.pyc')])
+    rmgpyPath = os.path.dirname(os.path.abspath(rmgpy.__file__))
+    for root, dirs, filenames in os.walk(rmgpyPath):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'test_data']
+        files.extend([os.path.join(root, f) for f in filenames if os.path.splitext(f)[1] in ('.py', '.pyx', '.pxd', '.so')])
+    return sorted(files)
+
+
+def getFileHash(path):
+    """
+    Return the SHA-1 hash of the contents of the file at `path`.
+    """
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), ''):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def getManifest(files):
+    """
+    Return a dictionary mapping each of the given `files` to a tuple of its
+    modification time, size and hash.
+    """
+    manifest = {}
+    for path in files:
+        stat = os.stat(path)
+        manifest[path] = (stat.st_mtime, stat.st_size, getFileHash(path))
+    return manifest
+
+
+def isManifestValid(manifest, files):
+    """
+    Return ``True`` if the given `files` are the files in `manifest` and
+    none of them changed, or ``False`` otherwise. The hash of a file is only
+    computed if its modification time differs from the one in the manifest.
+    """
+    if len(manifest) != len(files):
+        return False
+    for path in files:
+        if path not in manifest:
+            return False
+        mtime, size, digest = manifest[path]
+        stat = os.stat(path)
+        if stat.st_size != size:
+            return False
+        if stat.st_mtime != mtime and getFileHash(path) != digest:
+            return False
+    return True
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from rmgpy import settings
+from rmgpy.data.cache import DatabaseCache, getManifest, getSourceFiles, isManifestValid
+from rmgpy.data.rmg import RMGDatabase
+
+################################################################################
+
+class TestDatabaseCache(unittest.TestCase):
+    """
+    Contains unit tests of the binary cache of loaded databases.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.databasePath = os.path.join(self.directory, 'database')
+        os.makedirs(os.path.join(self.databasePath, 'thermo'))
+        self.filePath = os.path.join(self.databasePath, 'thermo', 'groups.py')
+        with open(self.filePath, 'w') as f:
+            f.write('name = "groups"\n')
+        self.cache = DatabaseCache(os.path.join(self.directory, 'cache'))
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        shutil.rmtree(self.directory)
+
+    def testManifest(self):
+        """
+        Test that a manifest only becomes invalid when the files change.
+        """
+        manifest = getManifest(getSourceFiles(self.databasePath))
+        self.assertIn(self.filePath, manifest)
+        self.assertTrue(isManifestValid(manifest, getSourceFiles(self.databasePath)))
+
+        # Changing the modification time but not the contents keeps the manifest valid
+        mtime = os.stat(self.filePath).st_mtime
+        os.utime(self.filePath, (mtime + 10, mtime + 10))
+        self.assertTrue(isManifestValid(manifest, getSourceFiles(self.databasePath)))
+
+        with open(self.filePath, 'w') as f:
+            f.write('name = "Groups"\n')
+        self.assertFalse(isManifestValid(manifest, getSourceFiles(self.databasePath)))
+
+        manifest = getManifest(getSourceFiles(self.databasePath))
+        with open(os.path.join(self.databasePath, 'thermo', 'libraries.py'), 'w') as f:
+            f.write('name = "libraries"\n')
+        self.assertFalse(isManifestValid(manifest, getSourceFiles(self.databasePath)))
+
+    def testSaveAndLoad(self):
+        """
+        Test that components are restored from the cache until a file changes.
+        """
+        arguments = (self.databasePath, ['library'], None)
+        components = {'thermo': {'groups': [1, 2, 3]}, 'kinetics': None}
+        self.assertIsNone(self.cache.load(self.databasePath, arguments))
+        self.assertTrue(self.cache.save(self.databasePath, arguments, components))
+        self.assertEqual(self.cache.load(self.databasePath, arguments), components)
+        self.assertIsNone(self.cache.load(self.databasePath, (self.databasePath, [], None)))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+        with open(self.filePath, 'a') as f:
+            f.write('shortDesc = ""\n')
+        self.assertIsNone(self.cache.load(self.databasePath, arguments))
+
+        self.assertEqual(self.cache.clear(), 1)
+        self.assertEqual(os.listdir(self.cache.directory), [])
+
+    def testLoadRMGDatabase(self):
+        """
+        Test that an RMG database restored from the cache has the same contents
+        as the loaded database.
+        """
+        path = os.path.join(settings['test_data.directory'], 'testing_database')
+        kwargs = dict(thermoLibraries=['primaryThermoLibrary'], reactionLibraries=[],
+                      kineticsFamilies=['H_Abstraction', 'R_Recombination'], depository=False,
+                      solvation=False, testing=True, cache=self.cache.directory)
+        database1 = RMGDatabase()
+        database1.load(path, **kwargs)
+        database2 = RMGDatabase()
+        database2.load(path, **kwargs)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+
+        self.assertEqual(database2.thermo.libraryOrder, database1.thermo.libraryOrder)
+        self.assertEqual(sorted(database2.thermo.groups.keys()), sorted(database1.thermo.groups.keys()))
+        for label, groups in database1.thermo.groups.iteritems():
+            self.assertEqual(database2.thermo.groups[label].entries.keys(), groups.entries.keys())
+        self.assertEqual(sorted(database2.kinetics.families.keys()), sorted(database1.kinetics.families.keys()))
+        for label, family in database1.kinetics.families.iteritems():
+            family2 = database2.kinetics.families[label]
+            self.assertEqual(family2.groups.entries.keys(), family.groups.entries.keys())
+            self.assertEqual(family2.rules.entries.keys(), family.rules.entries.keys())
+            self.assertEqual([group.label for group in family2.forwardTemplate.reactants],
+                             [group.label for group in family.forwardTemplate.reactants])
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
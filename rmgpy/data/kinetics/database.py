@@ -44,7 +44,7 @@ from rmgpy.species import Species
 from rmgpy.reaction import Reaction, same_species_lists
 from rmgpy.data.base import LogicNode
 
-from .family import  KineticsFamily
+from .family import  KineticsFamily, getMoleculeFeatures
 from .library import LibraryReaction, KineticsLibrary
 from .common import ensure_species, generate_molecule_combos, \
                     find_degenerate_reactions, ensure_independent_atom_ids
@@ -81,6 +81,8 @@ class KineticsDatabase(object):
             'R': constants.R,
         }
         self.global_context = {}
+        self.familiesChecked = 0
+        self.familiesPruned = 0
 
     def __reduce__(self):
         """
@@ -101,14 +103,17 @@ class KineticsDatabase(object):
         self.libraries = d['libraries']
         self.libraryOrder = d['libraryOrder']
 
-    def load(self, path, families=None, libraries=None, depositories=None):
+    def load(self, path, families=None, libraries=None, depositories=None, lazy=False):
         """
         Load the kinetics database from the given `path` on disk, where `path`
         points to the top-level folder of the families database.
+
+        If `lazy` is ``True``, the components of the families and libraries
+        are only loaded when they are first used.
         """
         self.loadRecommendedFamiliesList(os.path.join(path, 'families', 'recommended.py')),
-        self.loadFamilies(os.path.join(path, 'families'), families, depositories)
-        self.loadLibraries(os.path.join(path, 'libraries'), libraries)
+        self.loadFamilies(os.path.join(path, 'families'), families, depositories, lazy)
+        self.loadLibraries(os.path.join(path, 'libraries'), libraries, lazy)
 
     def loadRecommendedFamiliesList(self, filepath):
         """
@@ -143,7 +148,7 @@ class KineticsDatabase(object):
                                         for name, value in rec.__dict__.iteritems()
                                         if not name.startswith('_')}
 
-    def loadFamilies(self, path, families=None, depositories=None):
+    def loadFamilies(self, path, families=None, depositories=None, lazy=False):
         """
         Load the kinetics families from the given `path` on disk, where `path`
         points to the top-level folder of the kinetics families.
@@ -156,6 +161,9 @@ class KineticsDatabase(object):
 
         If all items begin with a `!` (e.g. ['!H_Abstraction']), then the
         selection will be inverted to families NOT in the list.
+
+        If `lazy` is ``True``, the groups, rules and depositories of each
+        family are only loaded when they are first used.
         """
         for (root, dirs, files) in os.walk(os.path.join(path)):
             if root == path:
@@ -213,19 +221,32 @@ class KineticsDatabase(object):
             familyPath = os.path.join(path, label)
             family = KineticsFamily(label=label)
             try:
-                family.load(familyPath, self.local_context, self.global_context, depositoryLabels=depositories)
+                family.load(familyPath, self.local_context, self.global_context, depositoryLabels=depositories,
+                            lazy=lazy)
             except:
                 logging.error("Error when loading reaction family {!r}".format(familyPath))
                 raise
             self.families[label] = family
 
-    def loadLibraries(self, path, libraries=None):
+        loadedDepositories = [depository for family in self.families.itervalues()
+                              if 'depositories' not in family.unloadedComponents
+                              for depository in family.depositories]
+        if loadedDepositories:
+            logging.info('Indexed {0:d} kinetics depository reactions in {1:.2f} s using {2:.1f} kB'.format(
+                sum([len(depository.entries) for depository in loadedDepositories]),
+                sum([depository.reactionIndexTime for depository in loadedDepositories]),
+                sum([depository.getReactionIndexMemory() for depository in loadedDepositories]) / 1024.))
+
+    def loadLibraries(self, path, libraries=None, lazy=False):
         """
         Load the listed kinetics libraries from the given `path` on disk.
         
         Loads them all if `libraries` list is not specified or `None`.
         The `path` points to the folder of kinetics libraries in the database,
         and the libraries should be in files like :file:`<path>/<library>.py`.
+
+        If `lazy` is ``True``, the files of the libraries are only read when
+        their entries are first used.
         """
         
         if libraries is not None:
@@ -234,7 +255,7 @@ class KineticsDatabase(object):
                 if os.path.exists(library_file):
                     logging.info('Loading kinetics library {0} from {1}...'.format(library_name, library_file))
                     library = KineticsLibrary(label=library_name)
-                    library.load(library_file, self.local_context, self.global_context)
+                    library.load(library_file, self.local_context, self.global_context, lazy=lazy)
                     self.libraries[library.label] = library
                 else:
                     if library_name == "KlippensteinH2O2":
@@ -254,7 +275,7 @@ library instead, depending on the main bath gas (N2 or Ar/He, respectively)\n"""
                         logging.info('Loading kinetics library {0} from {1}...'.format(label, library_file))
                         library = KineticsLibrary(label=label)
                         try:
-                            library.load(library_file, self.local_context, self.global_context)
+                            library.load(library_file, self.local_context, self.global_context, lazy=lazy)
                         except:
                             logging.error("Problem loading reaction library {0!r}".format(library_file))
                             raise
@@ -541,10 +562,21 @@ and immediately used in input files without any additional changes.
     def react_molecules(self, molecules, products=None, only_families=None, prod_resonance=True):
         """
         Generate reactions from all families for the input molecules.
+
+        Families whose templates the molecules cannot match, based on their
+        atom types, bond orders, radicals and rings, are skipped without
+        attempting the subgraph matching.
         """
         reaction_list = []
+        features = [getMoleculeFeatures(molecule) for molecule in molecules]
+        checked = 0
+        pruned = 0
         for label, family in self.families.iteritems():
             if only_families is None or label in only_families:
+                checked += 1
+                if not family.canReact(features):
+                    pruned += 1
+                    continue
                 try:
                     reaction_list.extend(family.generateReactions(molecules, products=products, prod_resonance=prod_resonance))
                 except:
@@ -555,6 +587,10 @@ and immediately used in input files without any additional changes.
         for reactant in molecules:
             reactant.clearLabeledAtoms()
 
+        self.familiesChecked += checked
+        self.familiesPruned += pruned
+        logging.debug('Skipped {0:d} of {1:d} families whose templates cannot match the reactants'.format(pruned, checked))
+
         return reaction_list
 
     def getForwardReactionForFamilyEntry(self, entry, family, thermoDatabase):
@@ -33,8 +33,12 @@ This module contains functionality for working with kinetics depositories.
 """
 
 from rmgpy.data.base import Database, Entry, DatabaseError
+import logging
 import re
+import sys
+import time
 
+from rmgpy.molecule import Molecule
 from rmgpy.reaction import Reaction
 from .common import saveEntry
 
@@ -106,6 +110,30 @@ class DepositoryReaction(Reaction):
 
 ################################################################################
 
+def getReactionKey(reactants, products):
+    """
+    Return a hashable key for a reaction with the given lists of `reactants`
+    and `products`, which can be :class:`Molecule` or :class:`Species`
+    objects. The key combines the sorted connectivity keys of each side,
+    so two reactions can only be isomorphic in the forward direction if
+    their keys are equal. Returns ``None`` if any of the reactants or
+    products has no molecule to compute a key from.
+    """
+    sides = []
+    for speciesList in (reactants, products):
+        keys = []
+        for species in speciesList:
+            if not isinstance(species, Molecule):
+                molecules = getattr(species, 'molecule', None)
+                if not molecules or not isinstance(molecules[0], Molecule):
+                    return None
+                species = molecules[0]
+            keys.append(species.get_connectivity_key())
+        sides.append(tuple(sorted(keys)))
+    return tuple(sides)
+
+################################################################################
+
 class KineticsDepository(Database):
     """
     A class for working with an RMG kinetics depository. Each depository 
@@ -116,6 +144,9 @@ class KineticsDepository(Database):
 
     def __init__(self, label='', name='', shortDesc='', longDesc=''):
         Database.__init__(self, label=label, name=name, shortDesc=shortDesc, longDesc=longDesc)
+        self.reactionIndex = None
+        self.reactionIndexSize = 0
+        self.reactionIndexTime = 0.0
         
     def __str__(self):
         return 'Kinetics Depository {0}'.format(self.label)
@@ -180,6 +211,61 @@ class KineticsDepository(Database):
             if not rxn.isBalanced():
                 raise DatabaseError('Reaction {0} in kinetics depository {1} was not balanced! Please reformulate.'.format(rxn, self.label))    
 
+        # Index the reactions now that their reactants and products are set
+        self.indexReactionEntries()
+        logging.debug('Indexed {0:d} reactions of {1} in {2:.3f} s ({3:.1f} kB)'.format(
+            len(self.entries), self, self.reactionIndexTime, self.getReactionIndexMemory() / 1024.))
+
+    def indexReactionEntries(self):
+        """
+        Index the reaction entries by the connectivity keys of their reactants
+        and products (see :meth:`Molecule.get_connectivity_key`). Each entry
+        is stored once, under the key of its forward direction. Entries with
+        reactants or products that cannot be keyed are stored under ``None``.
+        """
+        t0 = time.time()
+        self.reactionIndex = {}
+        for position, entry in enumerate(self.entries.itervalues()):
+            key = getReactionKey(entry.item.reactants, entry.item.products)
+            self.reactionIndex.setdefault(key, []).append((position, entry))
+        self.reactionIndexSize = len(self.entries)
+        self.reactionIndexTime = time.time() - t0
+
+    def getReactionEntryCandidates(self, reaction):
+        """
+        Return the list of entries that may be isomorphic to `reaction` in
+        either direction, in the order of the entries in the depository.
+        Entries not returned cannot be isomorphic to the reaction, so a search
+        for matching entries only needs to check the returned entries.
+        """
+        if self.reactionIndex is None or self.reactionIndexSize != len(self.entries):
+            # Entries were added or removed since the index was made
+            self.indexReactionEntries()
+        forwardKey = getReactionKey(reaction.reactants, reaction.products)
+        if forwardKey is None:
+            return self.entries.values()
+        reverseKey = (forwardKey[1], forwardKey[0])
+        candidates = self.reactionIndex.get(forwardKey, [])
+        if reverseKey != forwardKey:
+            candidates = candidates + self.reactionIndex.get(reverseKey, [])
+        candidates = candidates + self.reactionIndex.get(None, [])
+        candidates.sort(key=lambda candidate: candidate[0])
+        return [entry for position, entry in candidates]
+
+    def getReactionIndexMemory(self):
+        """
+        Return an estimate of the memory in bytes used by the reaction index,
+        not counting the entries and the connectivity keys it refers to.
+        """
+        if self.reactionIndex is None:
+            return 0
+        memory = sys.getsizeof(self.reactionIndex)
+        for key, candidates in self.reactionIndex.iteritems():
+            if key is not None:
+                memory += sys.getsizeof(key) + sys.getsizeof(key[0]) + sys.getsizeof(key[1])
+            memory += sys.getsizeof(candidates) + sum([sys.getsizeof(candidate) for candidate in candidates])
+        return memory
+
 
     def loadEntry(self,
                   index,
@@ -393,6 +393,12 @@ class KineticsFamily(Database):
     `ownReverse`        `Boolean`                       It's its own reverse?
     'boundaryAtoms'     list                            Labels which define the boundaries of end groups in backbone/end families
     `treeDistances`     dict                            The default distance from parent along each tree, if not set default is 1 for every tree
+    `matchCache`        :class:`OrderedDict`            Cached mappings of reactant structures to the template reactants, in LRU order
+    `matchCacheSize`    ``int``                         The maximum number of entries in `matchCache`
+    `matchCacheHits`    ``int``                         The number of template matches taken from `matchCache`
+    `matchCacheMisses`  ``int``                         The number of template matches that were not in `matchCache`
+    `splitTemplates`    ``dict``                        The separate groups of single-tree templates used for bimolecular reactants
+    `reactantFilters`   ``dict``                        The requirements a molecule must satisfy to match each template reactant
     ------------------- ------------------------------- ------------------------
     `groups`            :class:`KineticsGroups`         The set of kinetics group additivity values
     `rules`             :class:`KineticsRules`          The set of kinetics rate rules from RMG-Java
@@ -402,8 +408,17 @@ class KineticsFamily(Database):
     There are a few reaction families that are their own reverse (hydrogen
     abstraction and intramolecular hydrogen migration); for these
     `reverseTemplate` and `reverseRecipe` will both be ``None``.
+
+    A family loaded with ``lazy=True`` loads its groups, rules and
+    depositories when one of the attributes set by loading them (see
+    :attr:`lazyAttributes`) is first accessed.
     """
 
+    lazyAttributes = dict([(attribute, 'groups') for attribute in [
+        'groups', 'reverse', 'reversible', 'forwardTemplate', 'forwardRecipe', 'reverseTemplate', 'reverseRecipe',
+        'forbidden', 'ownReverse', 'boundaryAtoms', 'treeDistances', 'reverseMap', 'splitTemplates', 'reactantFilters',
+    ]] + [('rules', 'rules'), ('depositories', 'depositories')])
+
     def __init__(self,
                  entries=None,
                  top=None,
@@ -432,6 +447,14 @@ class KineticsFamily(Database):
         self.ownReverse = forwardTemplate is not None and reverseTemplate is None
         self.boundaryAtoms = boundaryAtoms
         self.treeDistances = treeDistances
+
+        # Cache of subgraph matches of reactant structures to the template
+        self.matchCache = OrderedDict()
+        self.matchCacheSize = 5000
+        self.matchCacheHits = 0
+        self.matchCacheMisses = 0
+        self.splitTemplates = {}
+        self.reactantFilters = {}
         
         # Kinetics depositories of training and test data
         self.groups = None
@@ -622,7 +645,7 @@ class KineticsFamily(Database):
                 if entry.nodalDistance is None:
                     entry.nodalDistance = treeDistances[topentry.label]
                 
-    def load(self, path, local_context=None, global_context=None, depositoryLabels=None):
+    def load(self, path, local_context=None, global_context=None, depositoryLabels=None, lazy=False):
         """
         Load a kinetics database from a file located at `path` on disk.
         
@@ -632,6 +655,32 @@ class KineticsFamily(Database):
         
         If depositoryLabels is None then load 'training' first then everything else.
         If depositoryLabels is not None then load in the order specified in depositoryLabels.
+
+        If `lazy` is ``True``, the groups (with the template, recipe and
+        forbidden structures), the rules and the depositories of the family
+        are each loaded when one of their attributes is first accessed.
+        """
+        if lazy:
+            # Copy the arguments, since the ones passed in may be modified before the components are loaded
+            local_context = dict(local_context or {})
+            global_context = dict(global_context or {})
+            if isinstance(depositoryLabels, list):
+                depositoryLabels = depositoryLabels[:]
+            self.name = self.label
+            self.deferLoading('groups', self.loadGroups, path, local_context, global_context)
+            self.deferLoading('rules', self.loadRules, path, local_context, global_context)
+            self.deferLoading('depositories', self.loadDepositories, path, local_context, global_context,
+                              depositoryLabels)
+            return
+        self.loadGroups(path, local_context, global_context)
+        self.loadRules(path, local_context, global_context)
+        self.loadDepositories(path, local_context, global_context, depositoryLabels)
+
+    def loadGroups(self, path, local_context, global_context):
+        """
+        Load the groups of the kinetics family, along with its template,
+        recipe and forbidden structures, from the :file:`groups.py` file in
+        the directory `path`.
         """
         local_context['recipe'] = self.loadRecipe
         local_context['template'] = self.loadTemplate
@@ -667,7 +716,21 @@ class KineticsFamily(Database):
                     self.reverse = '{0}_reverse'.format(self.label)
         
         self.groups.numReactants = len(self.forwardTemplate.reactants)
-            
+
+        toplabels = [i.label for i in self.groups.top]
+        if self.treeDistances is None:
+            self.treeDistances = {topentry:1 for topentry in toplabels}
+
+        self.distributeTreeDistances()
+
+        # Determine what reactants need to be able to match the templates
+        self.precomputeTemplateRequirements()
+
+    def loadRules(self, path, local_context, global_context):
+        """
+        Load the rate rules of the kinetics family from the :file:`rules.py`
+        file in the directory `path`.
+        """
         self.rules = KineticsRules(label='{0}/rules'.format(self.label))
         logging.debug("Loading kinetics family rules from {0}".format(os.path.join(path, 'rules.py')))
         self.rules.load(os.path.join(path, 'rules.py'), local_context, global_context)
@@ -679,14 +742,14 @@ class KineticsFamily(Database):
             reaction = Reaction(reactants=reactants, products=[])
             for entry in entries:
                 entry.item = reaction
+
+    def loadDepositories(self, path, local_context, global_context, depositoryLabels=None):
+        """
+        Load the depositories of the kinetics family from the subdirectories
+        of the directory `path`, as described in :meth:`load`.
+        """
         self.depositories = []
-        
-        toplabels = [i.label for i in self.groups.top]
-        if self.treeDistances is None:
-            self.treeDistances = {topentry:1 for topentry in toplabels}
 
-        self.distributeTreeDistances()
-            
         if depositoryLabels=='all':
             # Load everything. This option is generally used for working with the database
             # load all the remaining depositories, in order returned by os.walk
@@ -1204,6 +1267,8 @@ class KineticsFamily(Database):
             except KeyError:
                 self.rules.entries[new_entry.label] = [new_entry]
             index += 1
+
+        self.rules.clearKineticsCache()
     
     def getRootTemplate(self):
         """
@@ -1610,13 +1675,47 @@ class KineticsFamily(Database):
         """
         Return a complete list of the mappings if the provided reactant 
         matches the provided template reactant, or an empty list if not.
+
+        The mappings are cached by the structure of the reactant, so that
+        matching a copy of a reactant that was seen before (e.g. a core species
+        that is paired with a new partner) does not repeat the subgraph search.
         """
 
         if isinstance(templateReactant, list):
             templateReactant = templateReactant[0]
 
-        struct = templateReactant
-
+        # Look up the mappings from the atom indices of an identical structure
+        atoms = list(reactant.vertices)
+        key = (getTemplateMatchKey(reactant), id(templateReactant))
+        try:
+            template, cachedMappings = self.matchCache.pop(key)
+        except KeyError:
+            template = None
+        if template is templateReactant:
+            self.matchCacheHits += 1
+            self.matchCache[key] = (template, cachedMappings)
+            return [dict([(atoms[index], groupAtom) for index, groupAtom in mapping]) for mapping in cachedMappings]
+        self.matchCacheMisses += 1
+
+        mappings = self.__findTemplateMappings(reactant, templateReactant)
+
+        # Store the mappings by atom index, since the matching may reorder the atoms
+        indices = dict([(atom, index) for index, atom in enumerate(atoms)])
+        # The template is stored with the mappings so the key is never
+        # confused with another template that gets the same id later
+        self.matchCache[key] = (templateReactant,
+                                [tuple([(indices[atom], groupAtom) for atom, groupAtom in mapping.iteritems()])
+                                 for mapping in mappings])
+        if len(self.matchCache) > self.matchCacheSize:
+            self.matchCache.popitem(last=False)
+
+        return mappings
+
+    def __findTemplateMappings(self, reactant, struct):
+        """
+        Return a list of all subgraph isomorphisms between the reactant and
+        the template reactant `struct`, which is a group or a logic node.
+        """
         reactantContainsSurfaceSite = reactant.containsSurfaceSite()
 
         if isinstance(struct, LogicNode):
@@ -1635,6 +1734,125 @@ class KineticsFamily(Database):
         else:
             raise NotImplementedError("Not expecting template of type {}".format(type(struct)))
 
+    def clearMatchCache(self):
+        """
+        Remove all cached template matches, e.g. after the groups of the
+        family have been modified.
+        """
+        self.matchCache.clear()
+        self.splitTemplates.clear()
+        self.reactantFilters.clear()
+
+    def getMatchCacheHitRate(self):
+        """
+        Return the fraction of template matches that were taken from the
+        cache, or ``None`` if no matches have been made.
+        """
+        total = self.matchCacheHits + self.matchCacheMisses
+        if total == 0:
+            return None
+        return float(self.matchCacheHits) / total
+
+    def __getTemplateReactants(self, template, numReactants):
+        """
+        Return the list of template reactant structures to match
+        `numReactants` reactants against. If there are more reactants than
+        reactants in the template, the template is split into its
+        unconnected groups.
+        """
+        if numReactants > len(template.reactants): #if the family has one template and is bimolecular split template into multiple reactants
+            try:
+                # Reuse the split groups so that their template matches can be cached
+                item = template.reactants[0].item
+                try:
+                    splitItem, grps = self.splitTemplates[id(item)]
+                except KeyError:
+                    splitItem = None
+                if splitItem is not item:
+                    grps = item.split()
+                    self.splitTemplates[id(item)] = (item, grps)
+                template_reactants = []
+                for grp in grps:
+                    template_reactants.append(grp)
+            except AttributeError:
+                template_reactants = [x.item for x in template.reactants]
+        else:
+            template_reactants = [x.item for x in template.reactants]
+        return template_reactants
+
+    def getTemplateRequirements(self, templateReactant):
+        """
+        Return a list of the requirements (see :func:`getGroupRequirements`)
+        of each of the structures the template reactant can take. A molecule
+        can only match the template reactant if it satisfies one of them.
+        Returns ``None`` if the requirements cannot be determined.
+        """
+        if isinstance(templateReactant, list):
+            templateReactant = templateReactant[0]
+        try:
+            template, requirements = self.reactantFilters[id(templateReactant)]
+        except KeyError:
+            template = None
+        if template is templateReactant:
+            return requirements
+
+        if isinstance(templateReactant, LogicNode):
+            try:
+                structures = templateReactant.getPossibleStructures(self.groups.entries)
+            except NotImplementedError:
+                structures = None
+        elif isinstance(templateReactant, Group):
+            structures = [templateReactant]
+        else:
+            structures = None
+        requirements = [getGroupRequirements(struct) for struct in structures] if structures is not None else None
+        self.reactantFilters[id(templateReactant)] = (templateReactant, requirements)
+        return requirements
+
+    def precomputeTemplateRequirements(self):
+        """
+        Determine the requirements of all template reactants, including
+        those of split templates, so that :meth:`canReact` is cheap.
+        """
+        for template in [self.forwardTemplate, self.reverseTemplate]:
+            if template is None:
+                continue
+            for numReactants in xrange(1, 4):
+                for templateReactant in self.__getTemplateReactants(template, numReactants):
+                    self.getTemplateRequirements(templateReactant)
+
+    def canReact(self, features):
+        """
+        Return ``False`` if reactants with the given `features` (see
+        :func:`getMoleculeFeatures`) certainly cannot react in this family,
+        because they cannot match the reactants of the forward or reverse
+        template. Returns ``True`` otherwise.
+        """
+        templates = [self.forwardTemplate]
+        if not self.ownReverse and self.reversible and self.reverseTemplate is not None:
+            templates.append(self.reverseTemplate)
+
+        numReactants = len(features)
+        for template in templates:
+            template_reactants = self.__getTemplateReactants(template, numReactants)
+            if len(template_reactants) != numReactants:
+                if numReactants == 2 and len(template_reactants) == 3:
+                    # Reactions with surface sites that are used twice
+                    return True
+                # No reactions are generated for mismatched numbers of reactants
+                continue
+            allRequirements = [self.getTemplateRequirements(templateReactant) for templateReactant in template_reactants]
+            if any([requirements is None for requirements in allRequirements]):
+                return True
+            for order in itertools.permutations(xrange(numReactants)):
+                for feature, index in zip(features, order):
+                    if not any([satisfiesRequirements(feature, requirements)
+                                for requirements in allRequirements[index]]):
+                        break
+                else:
+                    return True
+        return False
+
     def generateReactions(self, reactants, products=None, prod_resonance=True):
         """
         Generate all reactions between the provided list of one, two, or three
@@ -1858,16 +2076,7 @@ class KineticsFamily(Database):
         else:
             template = self.reverseTemplate
 
-        if len(reactants) > len(template.reactants): #if the family has one template and is bimolecular split template into multiple reactants
-            try:
-                grps = template.reactants[0].item.split()
-                template_reactants = []
-                for grp in grps:
-                    template_reactants.append(grp)
-            except AttributeError:
-                template_reactants = [x.item for x in template.reactants]
-        else:
-            template_reactants = [x.item for x in template.reactants]
+        template_reactants = self.__getTemplateReactants(template, len(reactants))
 
         # Unimolecular reactants: A --> products
         if len(reactants) == 1 and len(template_reactants) == 1:
@@ -2380,7 +2589,8 @@ class KineticsFamily(Database):
         direction.
         """
         kineticsList = []
-        entries = depository.entries.values()
+        # Only check the entries that the index of the depository cannot rule out
+        entries = depository.getReactionEntryCandidates(reaction)
         for entry in entries:
             if entry.item.isIsomorphic(reaction):
                 kineticsList.append([deepcopy(entry.data), entry, entry.item.isIsomorphic(reaction, eitherDirection=False)])
@@ -2748,6 +2958,8 @@ class KineticsFamily(Database):
         entry = Entry(index=ind,label=name,item=grp,parent=parent)
         self.groups.entries[name] = entry
         self.rules.entries[name] = []
+        self.rules.clearKineticsCache()
+        self.groups.clearNodeFilters()
         if entry.parent:
             entry.parent.children.append(entry)
 
@@ -3124,6 +3336,9 @@ class KineticsFamily(Database):
             
             index += 1
 
+        self.rules.clearKineticsCache()
+        self.groups.clearNodeFilters()
+
 
 
     def crossValidate(self, folds=5, templateRxnMap=None, T=1000.0, iters=0, random_state=1):
@@ -3202,6 +3417,7 @@ class KineticsFamily(Database):
         for train_index, test_index in kf.split(rxns):
             
             self.rules.entries = {} #clear rules each iteration
+            self.rules.clearKineticsCache()
             
             self.addKineticsRulesFromTrainingSet(trainIndices=train_index,thermoDatabase=tdb)
             self.fillKineticsRulesByAveragingUp()
@@ -3321,6 +3537,8 @@ class KineticsFamily(Database):
                 regularization(self,child)
         else:
             regularization(self,self.getRootTemplate()[0])
+        # The groups are modified in place
+        self.groups.clearNodeFilters()
     
     def checkTree(self, entry=None):
         if entry is None:
@@ -3349,6 +3567,8 @@ class KineticsFamily(Database):
     def cleanTreeRules(self):
         self.rules.entries = OrderedDict()
         self.rules.entries['Root'] = []
+        self.rules.clearKineticsCache()
+        self.groups.clearNodeFilters()
 
     def cleanTreeGroups(self, thermoDatabase=None):
         """
@@ -3844,6 +4064,98 @@ class KineticsFamily(Database):
 
         return groupList
 
+def getCyclomaticNumber(graph):
+    """
+    Return the number of independent cycles in `graph`, i.e. the number of
+    edges minus the number of vertices plus the number of connected
+    components. A graph can only contain a subgraph with at most as many
+    independent cycles as itself.
+    """
+    numEdges = sum([len(vertex.edges) for vertex in graph.vertices]) // 2
+    numComponents = 0
+    visited = set()
+    for vertex in graph.vertices:
+        if vertex in visited:
+            continue
+        numComponents += 1
+        visited.add(vertex)
+        stack = [vertex]
+        while stack:
+            for neighbor in stack.pop().edges:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+    return numEdges - len(graph.vertices) + numComponents
+
+def getGroupRequirements(group):
+    """
+    Return a tuple of necessary conditions for a molecule to contain the
+    `group` as a subgraph: the allowed multiplicities, the minimum number of
+    radical electrons, the minimum element counts, a set of allowed atom
+    types for each atom, a set of allowed bond orders for each bond, and the
+    minimum number of independent cycles.
+    """
+    atomTypes = set()
+    radicals = 0
+    for atom in group.atoms:
+        atomTypes.add(frozenset([atomType.label for generic in atom.atomType
+                                 for atomType in [generic] + generic.specific]))
+        if atom.radicalElectrons:
+            radicals += min(atom.radicalElectrons)
+    bondOrders = set()
+    for bond in group.getAllEdges():
+        bondOrders.add(frozenset([round(order, 3) for order in bond.getOrderNum()]))
+    return (tuple(group.multiplicity), radicals, tuple(group.get_element_count().items()),
+            frozenset(atomTypes), frozenset(bondOrders), getCyclomaticNumber(group))
+
+def getMoleculeFeatures(molecule):
+    """
+    Return a tuple of the features of `molecule` that are compared with the
+    requirements returned by :func:`getGroupRequirements`.
+    """
+    atomTypes = frozenset([atom.atomType.label for atom in molecule.atoms if atom.atomType is not None])
+    bondOrders = frozenset([round(bond.getOrderNum(), 3) for bond in molecule.getAllEdges()])
+    return (molecule.multiplicity, molecule.getRadicalCount(), molecule.get_element_count(),
+            atomTypes, bondOrders, getCyclomaticNumber(molecule))
+
+def satisfiesRequirements(features, requirements):
+    """
+    Return ``True`` if a molecule with the given `features` satisfies the
+    `requirements` of a group, or ``False`` if it cannot contain the group.
+    """
+    multiplicity, radicals, elementCount, atomTypes, bondOrders, cycles = features
+    reqMultiplicity, reqRadicals, reqElementCount, reqAtomTypes, reqBondOrders, reqCycles = requirements
+    if reqMultiplicity and multiplicity not in reqMultiplicity:
+        return False
+    if radicals < reqRadicals or cycles < reqCycles:
+        return False
+    for element, count in reqElementCount:
+        if elementCount.get(element, 0) < count:
+            return False
+    for allowed in reqAtomTypes:
+        if allowed.isdisjoint(atomTypes):
+            return False
+    for allowed in reqBondOrders:
+        if allowed.isdisjoint(bondOrders):
+            return False
+    return True
+
+def getTemplateMatchKey(molecule):
+    """
+    Return a hashable key describing the structure of `molecule` in the
+    current order of its atoms, including everything that is compared when
+    matching it to a template group. Two molecules with the same key have
+    the same template matches, with atoms corresponding by index.
+    """
+    atoms = molecule.vertices
+    indices = dict([(atom, index) for index, atom in enumerate(atoms)])
+    atomKeys = tuple([(atom.atomType.label if atom.atomType is not None else None, atom.radicalElectrons,
+                       atom.charge, atom.lonePairs, atom.props.get('inRing')) for atom in atoms])
+    bondKeys = tuple(sorted([(indices[atom1], indices[atom2], bond.order)
+                             for atom1 in atoms for atom2, bond in atom1.edges.iteritems()
+                             if indices[atom1] < indices[atom2]]))
+    return molecule.multiplicity, atomKeys, bondKeys
+
 def informationGain(ks1,ks2):
     """
     calculates the information gain as the sum of the products of the standard deviations at each
@@ -39,9 +39,11 @@ import logging
 from rmgpy import settings
 from rmgpy.data.thermo import ThermoDatabase
 from rmgpy.data.kinetics.database import KineticsDatabase
-from rmgpy.data.kinetics.family import TemplateReaction
+from rmgpy.data.kinetics.depository import KineticsDepository
+from rmgpy.data.kinetics.family import TemplateReaction, getMoleculeFeatures, getCyclomaticNumber
 from rmgpy.data.rmg import RMGDatabase
 from rmgpy.molecule import Molecule
+from rmgpy.reaction import Reaction
 from rmgpy.species import Species
 from rmgpy.molecule.group import Group
 
@@ -617,6 +619,63 @@ multiplicity 2
             self.assertTrue(expected_products[0].isIsomorphic(products[0]))
 
 
+    def testEstimateKineticsCache(self):
+        """
+        Test that the kinetics estimated from the rate rules are cached per
+        template and that the degeneracy is applied to copies of them.
+        """
+        rules = self.family.rules
+        rules.clearKineticsCache()
+        template = [self.family.groups.entries[label] for label in ['R6H', 'C_rad_out_single', 'Cs_H_out']]
+        kinetics1, entry1 = rules.estimateKinetics(template)
+        self.assertEqual(rules.kineticsCache.keys(), [('R6H', 'C_rad_out_single', 'Cs_H_out')])
+        kinetics2, entry2 = rules.estimateKinetics(template, degeneracy=2)
+        self.assertIsNot(kinetics1, kinetics2)
+        self.assertIs(entry1, entry2)
+        self.assertAlmostEqual(kinetics2.A.value_si, 2 * kinetics1.A.value_si)
+        self.assertIn('Multiplied by reaction path degeneracy 2', kinetics2.comment)
+        self.assertNotIn('degeneracy', kinetics1.comment)
+
+        # The cached estimate is the same as a new one
+        rules.clearKineticsCache()
+        kinetics3, entry3 = rules.estimateKinetics(template)
+        self.assertIs(entry1, entry3)
+        self.assertEqual(kinetics1.comment, kinetics3.comment)
+        self.assertAlmostEqual(kinetics1.A.value_si, kinetics3.A.value_si)
+
+    def testReactionEntryCandidates(self):
+        """
+        Test that the index of a kinetics depository returns every entry that
+        matches a reaction in either direction, in order.
+        """
+        depository = KineticsDepository(label='test')
+        for index, (reactants, products) in enumerate([(['C', '[OH]'], ['[CH3]', 'O']),
+                                                       (['CC', '[OH]'], ['C[CH2]', 'O']),
+                                                       (['C', '[H]'], ['[CH3]', '[H][H]']),
+                                                       (['[CH3]', 'O'], ['C', '[OH]'])]):
+            entry = depository.loadEntry(index=index + 1, label=str(index + 1))
+            entry.item.reactants = [Species().fromSMILES(smiles) for smiles in reactants]
+            entry.item.products = [Species().fromSMILES(smiles) for smiles in products]
+        entries = depository.entries.values()
+
+        for entry in entries:
+            forward = Reaction(reactants=entry.item.reactants[:], products=entry.item.products[:])
+            reverse = Reaction(reactants=[spc.molecule[0] for spc in entry.item.products],
+                               products=[spc.molecule[0] for spc in entry.item.reactants])
+            for reaction in [forward, reverse]:
+                candidates = depository.getReactionEntryCandidates(reaction)
+                matches = [other for other in entries if other.item.isIsomorphic(reaction)]
+                self.assertEqual(candidates, matches)
+        self.assertEqual(len(depository.getReactionEntryCandidates(Reaction(
+            reactants=[Molecule(SMILES='[CH3]'), Molecule(SMILES='O')],
+            products=[Molecule(SMILES='C'), Molecule(SMILES='[OH]')]))), 2)
+
+        # The index follows entries added after it was made
+        entry = depository.loadEntry(index=5, label='5')
+        entry.item.reactants = [Species().fromSMILES('CC'), Species().fromSMILES('[H]')]
+        entry.item.products = [Species().fromSMILES('C[CH2]'), Species().fromSMILES('[H][H]')]
+        self.assertEqual(depository.getReactionEntryCandidates(entry.item), [entry])
+
     def testSaveFamily(self):
         """
 
@@ -834,6 +893,50 @@ class TestGenerateReactions(unittest.TestCase):
             mock.call('Error was fixed, the product is a forbidden structure when used as a reactant in the reverse direction.'),
         ])
 
+    def test_template_match_cache(self):
+        """Test that template matches of a reactant seen before are taken from the cache"""
+        family = self.database.kinetics.families['H_Abstraction']
+        family.clearMatchCache()
+        propane = Molecule().fromSMILES('CCC')
+
+        misses = family.matchCacheMisses
+        reactions = family.generateReactions([propane.copy(deep=True), Molecule().fromSMILES('[OH]')])
+        self.assertEqual(len(family.matchCache), family.matchCacheMisses - misses)
+        hits = family.matchCacheHits
+
+        # Only the new partner needs to be matched again
+        cached_reactions = family.generateReactions([propane.copy(deep=True), Molecule().fromSMILES('[CH3]')])
+        self.assertTrue(family.matchCacheHits > hits)
+        self.assertEqual(len(cached_reactions), len(reactions))
+
+        family.matchCacheSize = 1
+        family.generateReactions([Molecule().fromSMILES('CCCC'), Molecule().fromSMILES('[OH]')])
+        self.assertEqual(len(family.matchCache), 1)
+        family.matchCacheSize = 5000
+
+    def test_canReact(self):
+        """Test that families are only pruned for reactants that cannot match their templates"""
+        family = self.database.kinetics.families['H_Abstraction']
+        methane = getMoleculeFeatures(Molecule().fromSMILES('C'))
+        hydroxyl = getMoleculeFeatures(Molecule().fromSMILES('[OH]'))
+
+        self.assertTrue(family.canReact([methane, hydroxyl]))
+        self.assertTrue(family.canReact([hydroxyl, methane]))
+        # No radical to abstract the hydrogen
+        self.assertFalse(family.canReact([methane, methane]))
+        # Wrong number of reactants
+        self.assertFalse(family.canReact([methane]))
+
+        recombination = self.database.kinetics.families['R_Recombination']
+        self.assertFalse(recombination.canReact([methane, hydroxyl]))
+        self.assertTrue(recombination.canReact([hydroxyl, hydroxyl]))
+
+    def test_getCyclomaticNumber(self):
+        """Test that the number of independent cycles is counted"""
+        self.assertEqual(getCyclomaticNumber(Molecule().fromSMILES('CCC')), 0)
+        self.assertEqual(getCyclomaticNumber(Molecule().fromSMILES('c1ccccc1')), 1)
+        self.assertEqual(getCyclomaticNumber(Molecule().fromSMILES('C1CC2CCC1C2')), 2)
+
     def test_addAtomLabelsForReaction(self):
         """Test that we can add atom labels to an existing reaction"""
         reactants = [Species().fromSMILES('C=C'), Species().fromSMILES('[OH]')]
@@ -147,6 +147,40 @@ class TestKineticsDatabase(unittest.TestCase):
         except DatabaseError:
             self.fail("Unable to load families using list ['H_Abstraction', 'pah']")
 
+    def test_load_lazy(self):
+        """Test that lazy families and libraries load their components on first use."""
+        path = os.path.join(settings['test_data.directory'], 'testing_database', 'kinetics')
+        eager = KineticsDatabase()
+        eager.load(path, families=['H_Abstraction', 'Disproportionation'], libraries=['GRI-Mech3.0'])
+        lazy = KineticsDatabase()
+        lazy.load(path, families=['H_Abstraction', 'Disproportionation'], libraries=['GRI-Mech3.0'], lazy=True)
+
+        family = lazy.families['H_Abstraction']
+        self.assertEqual(sorted(family.unloadedComponents.keys()), ['depositories', 'groups', 'rules'])
+        self.assertEqual(family.name, 'H_Abstraction')
+        # Accessing the template loads the groups only
+        self.assertEqual([entry.label for entry in family.forwardTemplate.reactants],
+                         [entry.label for entry in eager.families['H_Abstraction'].forwardTemplate.reactants])
+        self.assertTrue(family.ownReverse)
+        self.assertEqual(sorted(family.unloadedComponents.keys()), ['depositories', 'rules'])
+        self.assertEqual(family.rules.entries.keys(), eager.families['H_Abstraction'].rules.entries.keys())
+        self.assertEqual([depository.label for depository in family.depositories],
+                         [depository.label for depository in eager.families['H_Abstraction'].depositories])
+        self.assertEqual(family.unloadedComponents, {})
+
+        library = lazy.libraries['GRI-Mech3.0']
+        self.assertIn('entries', library.unloadedComponents)
+        self.assertEqual(library.name, eager.libraries['GRI-Mech3.0'].name)
+        self.assertEqual(library.entries.keys(), eager.libraries['GRI-Mech3.0'].entries.keys())
+        self.assertEqual(library.unloadedComponents, {})
+
+        # Lazy families generate the same reactions
+        reactants = [Species().fromSMILES('CC'), Species().fromSMILES('[CH3]')]
+        self.assertEqual(
+            sorted([str(rxn) for rxn in lazy.generate_reactions_from_families([spc.copy(deep=True) for spc in reactants])]),
+            sorted([str(rxn) for rxn in eager.generate_reactions_from_families([spc.copy(deep=True) for spc in reactants])]))
+        self.assertIn('rules', lazy.families['Disproportionation'].unloadedComponents)
+
 
 class TestReactionDegeneracy(unittest.TestCase):
 
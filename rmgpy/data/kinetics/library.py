@@ -195,8 +195,15 @@ class LibraryReaction(Reaction):
 class KineticsLibrary(Database):
     """
     A class for working with an RMG kinetics library.
+
+    A library loaded with ``lazy=True`` reads its file when its entries or
+    metadata (see :attr:`lazyAttributes`) are first accessed.
     """
 
+    lazyAttributes = dict([(attribute, 'entries') for attribute in [
+        'entries', 'top', 'name', 'solvent', 'shortDesc', 'longDesc', 'autoGenerated',
+    ]])
+
     def __init__(self, label='', name='', solvent=None, shortDesc='', longDesc='', autoGenerated=False):
         Database.__init__(self, label=label, name=name, shortDesc=shortDesc, longDesc=longDesc)
         self.autoGenerated=autoGenerated
@@ -349,7 +356,11 @@ class KineticsLibrary(Database):
         logging.debug("NB. the entries have not been renumbered, so these indices are missing.")
         
         
-    def load(self, path, local_context=None, global_context=None):
+    def load(self, path, local_context=None, global_context=None, lazy=False):
+        if lazy:
+            # Copy the contexts, since the ones passed in may be modified before the library is loaded
+            self.deferLoading('entries', self.load, path, dict(local_context or {}), dict(global_context or {}))
+            return
         # Clear any previously-loaded data
         self.entries = OrderedDict()
         self.top = []
@@ -58,6 +58,8 @@ class KineticsRules(Database):
     
     def __init__(self, label='', name='', shortDesc='', longDesc=''):
         Database.__init__(self, label=label, name=name, shortDesc=shortDesc, longDesc=longDesc)
+        # The kinetics estimated for each template, keyed by the template labels
+        self.kineticsCache = {}
 
     def __repr__(self):
         return '<KineticsRules "{0}">'.format(self.label)
@@ -96,6 +98,7 @@ class KineticsRules(Database):
             self.entries[label].append(entry)
         except KeyError:
             self.entries[label] = [entry]
+        self.clearKineticsCache()
         return entry
 
     def saveEntry(self, f, entry):
@@ -464,6 +467,9 @@ class KineticsRules(Database):
         if rootLabel in alreadyDone:
             return alreadyDone[rootLabel]
 
+        # The averaged rules change the estimates of the templates below them
+        self.clearKineticsCache()
+
         # Generate the distance 1 pairings which must be averaged for this root template.
         # The distance 1 template is created by taking the parent node from one or more trees
         # and creating the combinations with children from a single remaining tree.  
@@ -602,6 +608,13 @@ class KineticsRules(Database):
         )
         return averagedKinetics
     
+    def clearKineticsCache(self):
+        """
+        Remove all kinetics estimated from the rate rules, e.g. after the
+        rules or the group tree have been modified.
+        """
+        self.kineticsCache.clear()
+
     def estimateKinetics(self, template, degeneracy=1):
         """
         Determine the appropriate kinetics for a reaction with the given
@@ -610,6 +623,34 @@ class KineticsRules(Database):
         Returns a tuple (kinetics, entry) where `entry` is the database
         entry used to determine the kinetics only if it is an exact match,
         and is None if some averaging or use of a parent node took place.
+
+        The kinetics estimated for a template are cached, so that reactions
+        with a template seen before only need a copy of the cached kinetics
+        multiplied by the reaction path `degeneracy`.
+        """
+        key = tuple([group.label for group in template])
+        try:
+            kinetics, entry = self.kineticsCache[key]
+        except KeyError:
+            kinetics, entry = self.kineticsCache[key] = self.__estimateKinetics(template)
+        kinetics = deepcopy(kinetics)
+
+        kinetics.A.value_si *= degeneracy
+        if degeneracy > 1:
+            kinetics.comment += "\n"
+            kinetics.comment += "Multiplied by reaction path degeneracy {0}".format(degeneracy)
+        
+        kinetics.comment += "\n"
+        kinetics.comment += "family: {0}".format(self.label.replace('/rules',''))
+        
+        return kinetics, entry
+
+    def __estimateKinetics(self, template):
+        """
+        Determine the kinetics for a reaction with the given `template` using
+        rate rules, without the reaction path degeneracy.
+
+        Returns a tuple (kinetics, entry) as :meth:`estimateKinetics` does.
         """
         entry = self.getRule(template)
         
@@ -718,13 +759,6 @@ class KineticsRules(Database):
                 
         kinetics.comment += ' for rate rule ' + originalLeaves
         kinetics.comment += '\nEuclidian distance = {}'.format(minNorm)
-        kinetics.A.value_si *= degeneracy
-        if degeneracy > 1:
-            kinetics.comment += "\n"
-            kinetics.comment += "Multiplied by reaction path degeneracy {0}".format(degeneracy)
-        
-        kinetics.comment += "\n"
-        kinetics.comment += "family: {0}".format(self.label.replace('/rules',''))
         
         return kinetics, (entry if 'Exact' in kinetics.comment else None)
 
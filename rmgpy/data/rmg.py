@@ -35,6 +35,7 @@ for working with the RMG database.
 
 import os.path
 import logging
+from copy import deepcopy
 
 from base import ForbiddenStructures
 from thermo import ThermoDatabase
@@ -42,6 +43,8 @@ from transport import TransportDatabase
 from rmgpy.data.kinetics.database import KineticsDatabase
 from statmech import StatmechDatabase
 from solvation import SolvationDatabase
+from rmgpy import settings
+from rmgpy.data.cache import DatabaseCache
 from rmgpy.exceptions import DatabaseError
 from rmgpy.scoop_framework.util import get, broadcast
 
@@ -81,7 +84,9 @@ class RMGDatabase(object):
              statmechLibraries=None,
              depository=True,
              solvation=True,
-             testing = False):
+             testing = False,
+             cache=None,
+             lazy=False):
         """
         Load the RMG database from the given `path` on disk, where `path`
         points to the top-level folder of the RMG database. If none of the
@@ -90,7 +95,31 @@ class RMGDatabase(object):
         components of the database be loaded.
 
         Argument testing will load a lighter version of the database used for unit-tests
+
+        The `cache` argument is the directory of a binary cache of loaded
+        databases (see :class:`DatabaseCache`). If the database was loaded
+        with the same arguments before and none of its files changed since,
+        it is restored from the cache; otherwise it is loaded from its files
+        and saved to the cache. If `cache` is ``None``, the ``database.cache``
+        setting is used if it is set, and ``False`` disables the cache.
+
+        If `lazy` is ``True``, the kinetics families and libraries are loaded
+        lazily (see :meth:`KineticsDatabase.load`). Lazy loads do not use the
+        cache, since saving the database to the cache would load everything.
         """
+        if cache is None:
+            cache = settings.get('database.cache', None)
+        databaseCache = DatabaseCache(cache) if cache and not lazy else None
+        if databaseCache is not None:
+            # Copy the arguments, since loading may modify the lists passed in
+            arguments = deepcopy((os.path.abspath(path), thermoLibraries, transportLibraries, reactionLibraries,
+                                  seedMechanisms, kineticsFamilies, kineticsDepositories, statmechLibraries,
+                                  depository, solvation, testing))
+            components = databaseCache.load(path, arguments)
+            if components is not None:
+                self.setComponents(components)
+                return
+
         self.loadThermo(os.path.join(path, 'thermo'), thermoLibraries, depository)
         if not testing:
             self.loadTransport(os.path.join(path, 'transport'), transportLibraries)
@@ -99,7 +128,8 @@ class RMGDatabase(object):
                           reactionLibraries,
                           seedMechanisms,
                           kineticsFamilies,
-                          kineticsDepositories
+                          kineticsDepositories,
+                          lazy
                           )
         if not testing:
             self.loadStatmech(os.path.join(path, 'statmech'), statmechLibraries, depository)
@@ -107,6 +137,40 @@ class RMGDatabase(object):
         if solvation:
             self.loadSolvation(os.path.join(path, 'solvation'))
 
+        if databaseCache is not None:
+            databaseCache.save(path, arguments, self.getComponents())
+
+    def getComponents(self):
+        """
+        Return a dictionary of the loaded components of the RMG database, as
+        stored in the database cache.
+        """
+        return {
+            'thermo': self.thermo,
+            'transport': self.transport,
+            'forbiddenStructures': self.forbiddenStructures,
+            'kinetics': self.kinetics,
+            'statmech': self.statmech,
+            'solvation': self.solvation,
+        }
+
+    def setComponents(self, components):
+        """
+        Set the components of the RMG database from the dictionary
+        `components` restored from the database cache.
+        """
+        self.thermo = components['thermo']
+        self.transport = components['transport']
+        self.forbiddenStructures = components['forbiddenStructures']
+        self.kinetics = components['kinetics']
+        self.statmech = components['statmech']
+        self.solvation = components['solvation']
+        for component, key in [(self.thermo, 'thermo'), (self.transport, 'transport'),
+                               (self.forbiddenStructures, 'forbidden'), (self.kinetics, 'kinetics'),
+                               (self.statmech, 'statmech'), (self.solvation, 'solvation')]:
+            if component is not None:
+                broadcast(component, key)
+
     def loadThermo(self, path, thermoLibraries=None, depository=True):
         """
         Load the RMG thermo database from the given `path` on disk, where
@@ -142,11 +206,14 @@ class RMGDatabase(object):
                      reactionLibraries=None,
                      seedMechanisms=None,
                      kineticsFamilies=None,
-                     kineticsDepositories=None
+                     kineticsDepositories=None,
+                     lazy=False
                      ):
         """
         Load the RMG kinetics database from the given `path` on disk, where
         `path` points to the top-level folder of the RMG kinetics database.
+        If `lazy` is ``True``, the components of the families and libraries
+        are only loaded when they are first used.
         """
         kineticsLibraries = []
         libraryOrder = []
@@ -166,7 +233,8 @@ class RMGDatabase(object):
         self.kinetics.load(path,
                            families=kineticsFamilies,
                            libraries=kineticsLibraries,
-                           depositories=kineticsDepositories
+                           depositories=kineticsDepositories,
+                           lazy=lazy
                            )
 
         broadcast(self.kinetics, 'kinetics')
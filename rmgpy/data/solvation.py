@@ -456,6 +456,8 @@ class SolvationDatabase(object):
         self.libraries['solvent'] = SolventLibrary()
         self.libraries['solute'] = SoluteLibrary()
         self.groups = {}
+        self.libraryFiles = []
+        self.groupFiles = []
         self.local_context = {
             'SoluteData': SoluteData,
             'SolventData': SolventData
@@ -469,6 +471,8 @@ class SolvationDatabase(object):
         d = {
             'libraries': self.libraries,
             'groups': self.groups,
+            'libraryFiles': self.libraryFiles,
+            'groupFiles': self.groupFiles,
             }
         return (SolvationDatabase, (), d)
 
@@ -478,6 +482,8 @@ class SolvationDatabase(object):
         """
         self.libraries = d['libraries']
         self.groups = d['groups']
+        self.libraryFiles = d.get('libraryFiles', [])
+        self.groupFiles = d.get('groupFiles', [])
 
     def load(self, path, libraries=None, depository=True):
         """
@@ -489,6 +495,7 @@ class SolvationDatabase(object):
         
         self.libraries['solvent'].load(os.path.join(path,'libraries','solvent.py'))
         self.libraries['solute'].load(os.path.join(path,'libraries','solute.py'))
+        self.libraryFiles = [os.path.join(path, 'libraries', 'solvent.py'), os.path.join(path, 'libraries', 'solute.py')]
          
         self.loadGroups(os.path.join(path, 'groups'))
         
@@ -519,6 +526,7 @@ class SolvationDatabase(object):
         self.groups['abraham']   =   SoluteGroups(label='abraham').load(os.path.join(path, 'abraham.py'  ), self.local_context, self.global_context)
         self.groups['nonacentered']  =  SoluteGroups(label='nonacentered').load(os.path.join(path, 'nonacentered.py' ), self.local_context, self.global_context)
         self.groups['radical']  =  SoluteGroups(label='radical').load(os.path.join(path, 'radical.py' ), self.local_context, self.global_context)
+        self.groupFiles = [os.path.join(path, category + '.py') for category in ['abraham', 'nonacentered', 'radical']]
    
     def save(self, path):
         """
@@ -659,7 +667,7 @@ class SolvationDatabase(object):
         ``None`` is returned. If no corresponding library is found, a
         :class:`DatabaseError` is raised.
         """
-        for label, entry in library.entries.iteritems():
+        for entry in library.getMoleculeEntryCandidates(species.molecule):
             if species.isIsomorphic(entry.item) and entry.data is not None:
                 return (deepcopy(entry.data), library, entry)
         return None
@@ -653,7 +653,7 @@ class StatmechDatabase(object):
         """
         items = []
         for name, depository in self.depository.iteritems():
-            for label, entry in depository.entries.iteritems():
+            for entry in depository.getMoleculeEntryCandidates([molecule]):
                 if molecule.isIsomorphic(entry.item):
                     items.append((entry.data, self.depository[name], entry))
         return items
@@ -664,7 +664,7 @@ class StatmechDatabase(object):
         by searching the entries in the specified :class:`StatmechLibrary` object
         `library`. Returns ``None`` if no data was found.
         """
-        for label, entry in library.entries.iteritems():
+        for entry in library.getMoleculeEntryCandidates([molecule]):
             if molecule.isIsomorphic(entry.item):
                 return (entry.data, library, entry)
         return None
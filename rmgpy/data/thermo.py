@@ -40,8 +40,9 @@ import numpy
 import time
 import itertools
 from copy import deepcopy
+from collections import OrderedDict
 
-from base import Database, Entry, makeLogicNode, DatabaseError
+from base import Database, Entry, LogicNode, makeLogicNode, DatabaseError
 
 import rmgpy.constants as constants
 from rmgpy.thermo import NASAPolynomial, NASA, ThermoData, Wilhoit
@@ -548,6 +549,69 @@ def saturate_ring_bonds(ring_submol):
     mol0.updateConnectivityValues()
     return mol0, alreadySaturated
 
+def getGroupRadius(group):
+    """
+    Return the largest number of bonds between the atom labeled ``*`` and any
+    other atom of the :class:`Group` object `group`, or ``None`` if the group
+    has no single atom labeled ``*`` or is not connected, in which case it
+    can match atoms outside the neighborhood of the labeled atom.
+    """
+    center = group.getLabeledAtoms().get('*')
+    if center is None or isinstance(center, list):
+        return None
+    distances = {center: 0}
+    shell = [center]
+    while shell:
+        nextShell = []
+        for atom in shell:
+            for neighbor in atom.edges:
+                if neighbor not in distances:
+                    distances[neighbor] = distances[atom] + 1
+                    nextShell.append(neighbor)
+        shell = nextShell
+    if len(distances) != len(group.vertices):
+        return None
+    return max(distances.itervalues())
+
+def getLocalEnvironmentKey(molecule, atom, radius):
+    """
+    Return a hashable key describing the atoms and bonds of `molecule` that
+    are at most `radius` bonds away from `atom`, including everything that is
+    compared when matching the atom to a group. Two atoms with the same key
+    match the same groups of radius `radius` or less centered on them.
+
+    The key is only made if this neighborhood contains no rings, which makes
+    it exact; ``None`` is returned otherwise.
+    """
+    distances = {atom: 0}
+    shell = [atom]
+    for distance in xrange(radius):
+        nextShell = []
+        for atom1 in shell:
+            for atom2 in atom1.edges:
+                if atom2 not in distances:
+                    distances[atom2] = distance + 1
+                    nextShell.append(atom2)
+        shell = nextShell
+    # The neighborhood is a tree if it has one bond less than it has atoms
+    numBonds = 0
+    for atom1 in distances:
+        for atom2 in atom1.edges:
+            if atom2 in distances:
+                numBonds += 1
+    if numBonds != 2 * (len(distances) - 1):
+        return None
+
+    def getKey(atom1, parent, depth):
+        key = (atom1.atomType.label if atom1.atomType is not None else None, atom1.radicalElectrons,
+               atom1.charge, atom1.lonePairs, atom1.props.get('inRing'), atom1.label)
+        if depth == radius:
+            return key
+        return key, tuple(sorted([(bond.order, getKey(atom2, atom1, depth + 1))
+                                  for atom2, bond in atom1.edges.iteritems() if atom2 is not parent]))
+
+    return molecule.multiplicity, molecule.getRadicalCount(), getKey(atom, None, 0)
+
 ################################################################################
 
 class ThermoDepository(Database):
@@ -649,10 +713,33 @@ class ThermoLibrary(Database):
 class ThermoGroups(Database):
     """
     A class for working with an RMG thermodynamics group additivity database.
+
+    The result of descending the tree for a single atom labeled ``*`` is
+    cached by the local environment of the atom, up to the radius of the
+    largest group in the tree, so that atoms in the same environment (e.g.
+    every methyl group in an alkane) do not need to be matched to the groups
+    again.
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `descentCache`      Cached tree descents, keyed by the local environment
+    `descentCacheSize`  The maximum number of entries in `descentCache`
+    `descentRadius`     The radius of the largest group in the tree, -1 if the
+                        tree cannot be cached, or ``None`` if not yet known
+    `nodesVisited`      The number of nodes matched to structures
+    `nodesSkipped`      The number of node matches avoided by `descentCache`
+    =================== ========================================================
+
     """
 
     def __init__(self, label='', name='', shortDesc='', longDesc=''):
         Database.__init__(self, label=label, name=name, shortDesc=shortDesc, longDesc=longDesc)
+        self.descentCache = OrderedDict()
+        self.descentCacheSize = 10000
+        self.descentRadius = None
+        self.nodesVisited = 0
+        self.nodesSkipped = 0
 
     def loadEntry(self,
                   index,
@@ -722,6 +809,71 @@ class ThermoGroups(Database):
         destination.referenceType = source.referenceType    
 
 
+    def matchNodeToStructure(self, node, structure, atoms, strict=False):
+        """
+        Return :data:`True` if the `structure` centered at `atoms` matches the
+        structure at `node` in the dictionary, counting the visited nodes.
+        See :meth:`Database.matchNodeToStructure`.
+        """
+        self.nodesVisited += 1
+        return Database.matchNodeToStructure(self, node, structure, atoms, strict)
+
+    def descendTree(self, structure, atoms, root=None, strict=False):
+        """
+        Descend the tree in search of the functional group node that best
+        matches the local structure around `atoms` in `structure`. See
+        :meth:`Database.descendTree`. Descents from the top of the tree for
+        a single atom labeled ``*`` in a :class:`Molecule` are cached.
+        """
+        if root is not None or len(atoms) != 1 or '*' not in atoms or not isinstance(structure, Molecule):
+            return Database.descendTree(self, structure, atoms, root, strict)
+        if self.descentRadius is None:
+            self.descentRadius = self.getDescentRadius()
+        if self.descentRadius < 0:
+            return Database.descendTree(self, structure, atoms, root, strict)
+        key = getLocalEnvironmentKey(structure, atoms['*'], self.descentRadius)
+        if key is None:
+            return Database.descendTree(self, structure, atoms, root, strict)
+        key = (key, strict)
+
+        try:
+            node, visits = self.descentCache.pop(key)
+        except KeyError:
+            visits = self.nodesVisited
+            node = Database.descendTree(self, structure, atoms, root, strict)
+            visits = self.nodesVisited - visits
+        else:
+            self.nodesSkipped += visits
+        self.descentCache[key] = (node, visits)
+        if len(self.descentCache) > self.descentCacheSize:
+            self.descentCache.popitem(last=False)
+        return node
+
+    def getDescentRadius(self):
+        """
+        Return the radius of the largest group in the tree (see
+        :func:`getGroupRadius`), or -1 if any group can match atoms that are
+        not near its atom labeled ``*``, in which case descents of the tree
+        cannot be cached by the local environment of the atom.
+        """
+        radius = 0
+        for entry in self.entries.itervalues():
+            if isinstance(entry.item, Group):
+                groupRadius = getGroupRadius(entry.item)
+                if groupRadius is None:
+                    return -1
+                radius = max(radius, groupRadius)
+            elif not isinstance(entry.item, LogicNode):
+                return -1
+        return radius
+
+    def clearDescentCache(self):
+        """
+        Remove all cached tree descents, e.g. after the tree has been modified.
+        """
+        self.descentCache.clear()
+        self.descentRadius = None
+
     def removeGroup(self, groupToRemove):
         """
         Removes a group that is in a tree from the database. For thermo
@@ -733,6 +885,8 @@ class ThermoGroups(Database):
 
         #First call base class method
         Database.removeGroup(self, groupToRemove)
+        self.clearDescentCache()
+        self.clearNodeFilters()
 
         parentR = groupToRemove.parent
 
@@ -764,6 +918,8 @@ class ThermoDatabase(object):
         self.libraries = {}
         self.groups = {}
         self.libraryOrder = []
+        self.libraryFiles = []
+        self.groupFiles = []
         self.local_context = {
             'ThermoData': ThermoData,
             'Wilhoit': Wilhoit,
@@ -781,6 +937,8 @@ class ThermoDatabase(object):
             'libraries': self.libraries,
             'groups': self.groups,
             'libraryOrder': self.libraryOrder,
+            'libraryFiles': self.libraryFiles,
+            'groupFiles': self.groupFiles,
         }
         return (ThermoDatabase, (), d)
 
@@ -792,6 +950,8 @@ class ThermoDatabase(object):
         self.libraries = d['libraries']
         self.groups = d['groups']
         self.libraryOrder = d['libraryOrder']
+        self.libraryFiles = d.get('libraryFiles', [])
+        self.groupFiles = d.get('groupFiles', [])
 
     def load(self, path, libraries=None, depository=True):
         """
@@ -821,7 +981,7 @@ class ThermoDatabase(object):
         
         If no libraries are given, all are loaded.
         """
-        self.libraries = {}; self.libraryOrder = []
+        self.libraries = {}; self.libraryOrder = []; self.libraryFiles = []
         if libraries is None:
             for (root, dirs, files) in os.walk(os.path.join(path)):
                 for f in files:
@@ -833,6 +993,7 @@ class ThermoDatabase(object):
                         library.label = os.path.splitext(f)[0]
                         self.libraries[library.label] = library
                         self.libraryOrder.append(library.label)
+                        self.libraryFiles.append(os.path.join(root, f))
 
         else:
             for libraryName in libraries:
@@ -844,6 +1005,7 @@ class ThermoDatabase(object):
                     library.label = os.path.splitext(f)[0]
                     self.libraries[library.label] = library
                     self.libraryOrder.append(library.label)
+                    self.libraryFiles.append(os.path.join(path, f))
                 else:
                     if libraryName == "KlippensteinH2O2":
                         logging.info("""\n** Note: The thermo library KlippensteinH2O2 was replaced and is no longer available in RMG.
@@ -870,6 +1032,7 @@ class ThermoDatabase(object):
             category: ThermoGroups(label=category).load(os.path.join(path, category + '.py'), self.local_context, self.global_context)
             for category in categories
         }
+        self.groupFiles = [os.path.join(path, category + '.py') for category in categories]
 
         self.recordRingGenericNodes()
         self.recordPolycylicGenericNodes()
@@ -1439,7 +1602,7 @@ class ThermoDatabase(object):
         thermoData = None
         
         #chatelak 11/15/14: modification to introduce liquid phase thermo libraries
-        libraryList=deepcopy(self.libraryOrder) #copy the value to not affect initial object
+        libraryList = self.libraryOrder
 
         if rmgpy.rmg.main.solvent is not None:
             liqLibraries=[]
@@ -1458,9 +1621,9 @@ class ThermoDatabase(object):
                         thermoData[0].comment += 'Liquid thermo library: ' + label
                         return thermoData
             #Remove liqLibraries from libraryList if: called by training set (trainingSet=True) or if no thermo found in liqLibrairies
-            #if no liquid library found this does nothing.   
-            for libIter in liqLibraries:
-                libraryList.remove(libIter)
+            #if no liquid library found this does nothing (a new list is made so the initial object is not affected)
+            if liqLibraries:
+                libraryList = [label for label in libraryList if label not in liqLibraries]
 
         # Condition to execute this part: gas phase simulation or training set or liquid phase simulation with : noliquid libraries found or no matching species found in liquid libraries       
         # If gas phase simulation libraryList = self.libraryOrder (just like before modifications) and they are all gas phase, already checked by checkLibrairies function in database.load()
@@ -1521,12 +1684,12 @@ class ThermoDatabase(object):
         Returns: a list of tuples (thermoData, depository, entry) without any Cp0 or CpInf data.
         """
         items = []
-        for entry in self.depository['stable'].entries.itervalues():
+        for entry in self.depository['stable'].getMoleculeEntryCandidates(species.molecule):
             for molecule in species.molecule:
                 if molecule.isIsomorphic(entry.item):
                     items.append((deepcopy(entry.data), self.depository['stable'], entry))
                     break
-        for entry in self.depository['radical'].entries.itervalues():
+        for entry in self.depository['radical'].getMoleculeEntryCandidates(species.molecule):
             for molecule in species.molecule:
                 if molecule.isIsomorphic(entry.item):
                     items.append((deepcopy(entry.data), self.depository['radical'], entry))
@@ -1545,7 +1708,7 @@ class ThermoDatabase(object):
         Returns a tuple: (ThermoData, library, entry)  or None.
         """
         match = None
-        for entry in library.entries.itervalues():
+        for entry in library.getMoleculeEntryCandidates(species.molecule):
             for molecule in species.molecule:
                 if molecule.isIsomorphic(entry.item) and entry.data is not None:
                     thermoData = deepcopy(entry.data)
@@ -1828,6 +1991,10 @@ class ThermoDatabase(object):
             S298 = (0.0,"J/(mol*K)"),
         )
 
+        # Count the tree nodes matched for this molecule
+        nodesVisited = sum([groups.nodesVisited for groups in self.groups.itervalues()])
+        nodesSkipped = sum([groups.nodesSkipped for groups in self.groups.itervalues()])
+
         cyclic = molecule.isCyclic()
         # Generate estimate of thermodynamics
         for atom in molecule.atoms:
@@ -1905,6 +2072,12 @@ class ThermoDatabase(object):
                     logging.error(molecule.toAdjacencyList())
                     raise
 
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            nodesVisited = sum([groups.nodesVisited for groups in self.groups.itervalues()]) - nodesVisited
+            nodesSkipped = sum([groups.nodesSkipped for groups in self.groups.itervalues()]) - nodesSkipped
+            logging.debug('Matched {0:d} group tree nodes for {1} ({2:d} without cached descents)'.format(
+                nodesVisited, molecule.toSMILES(), nodesVisited + nodesSkipped))
+
         return thermoData
 
     def __addPolycyclicCorrectionThermoData(self, thermoData, molecule, polyring):
@@ -469,6 +469,39 @@ multiplicity 2
         self.assertTrue(thermo_gav2.getEnthalpy(298) > thermo_gav1.getEnthalpy(298),
                         msg="Did not select the reactive molecule for thermo")
 
+    def testCachedDescentMatchesTree(self):
+        """Test that cached descents of the group trees give the same nodes as new descents"""
+        groups = self.database.groups['group']
+        groups.clearDescentCache()
+        self.assertGreater(groups.getDescentRadius(), 0)
+
+        molecule = Molecule(SMILES='CCCCC(C)C')
+        expected = [Database.descendTree(groups, molecule, {'*': atom}) for atom in molecule.atoms
+                    if atom.isNonHydrogen()]
+        nodesSkipped = groups.nodesSkipped
+        for i in range(2):
+            nodes = [groups.descendTree(molecule, {'*': atom}) for atom in molecule.atoms if atom.isNonHydrogen()]
+            self.assertEqual(nodes, expected)
+        # The terminal methyl groups and the second pass are taken from the cache
+        self.assertGreater(groups.nodesSkipped, nodesSkipped)
+
+        thermo_cached = self.database.computeGroupAdditivityThermo(molecule)
+        groups.clearDescentCache()
+        thermo = self.database.computeGroupAdditivityThermo(molecule)
+        self.assertAlmostEqual(thermo_cached.H298.value_si, thermo.H298.value_si)
+        self.assertAlmostEqual(thermo_cached.S298.value_si, thermo.S298.value_si)
+
+    def testGetLocalEnvironmentKey(self):
+        """Test that local environment keys are made only for acyclic neighborhoods"""
+        molecule = Molecule(SMILES='CC(C)CC1CC1')
+        carbons = [atom for atom in molecule.atoms if atom.isCarbon()]
+        # The two methyl groups have the same environment
+        self.assertEqual(getLocalEnvironmentKey(molecule, carbons[0], 2),
+                         getLocalEnvironmentKey(molecule, carbons[2], 2))
+        self.assertNotEqual(getLocalEnvironmentKey(molecule, carbons[0], 2),
+                            getLocalEnvironmentKey(molecule, carbons[1], 2))
+        self.assertIsNone(getLocalEnvironmentKey(molecule, carbons[5], 2))
+
 class TestThermoAccuracy(unittest.TestCase):
     """
     Contains tests for accuracy of thermo estimates and symmetry calculations.
@@ -696,8 +729,13 @@ class TestCyclicThermo(unittest.TestCase):
         groupToRemove = radGroup.entries['RJ']
         children = groupToRemove.children
 
+        #compile the neighbor conditions of a node, which are dropped when the tree is modified
+        radGroup.getNodeFilter(children[0])
+        self.assertTrue(radGroup.nodeFilters)
+
         #remove the group
         radGroup.removeGroup(groupToRemove)
+        self.assertEqual(radGroup.nodeFilters, {})
 
         #afterwards groupToRemove should not be in the database or root's children
         self.assertFalse(groupToRemove in radGroup.entries.values())
@@ -383,7 +383,7 @@ class TransportDatabase(object):
         ``None`` is returned. If no corresponding library is found, a
         :class:`DatabaseError` is raised.
         """
-        for label, entry in library.entries.iteritems():
+        for entry in library.getMoleculeEntryCandidates(species.molecule):
             for molecule in species.molecule:
                 if molecule.isIsomorphic(entry.item) and entry.data is not None:
                     return (deepcopy(entry.data), library, entry)
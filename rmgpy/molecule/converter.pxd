@@ -30,8 +30,12 @@ cimport rmgpy.molecule.molecule as mm
 
 cpdef toRDKitMol(mm.Molecule mol, bint removeHs=*, bint returnMapping=*, bint sanitize=*)
 
+cpdef list toRDKitMol_many(list mols, bint removeHs=*, bint sanitize=*)
+
 cpdef mm.Molecule fromRDKitMol(mm.Molecule mol, object rdkitmol)
 
+cpdef list fromRDKitMol_many(list rdkitmols)
+
 cpdef toOBMol(mm.Molecule mol, bint returnMapping=*)
 
 cpdef mm.Molecule fromOBMol(mm.Molecule mol, object obmol)
@@ -51,6 +51,13 @@ import rmgpy.molecule.molecule as mm
 from rmgpy.exceptions import DependencyError
 
 
+# RDKit bond types for the RMG bond order strings, and bond orders for the RDKit bond type names
+_RDKIT_BOND_TYPES = {'S': Chem.rdchem.BondType.SINGLE, 'D': Chem.rdchem.BondType.DOUBLE,
+                     'T': Chem.rdchem.BondType.TRIPLE, 'B': Chem.rdchem.BondType.AROMATIC,
+                     'Q': Chem.rdchem.BondType.QUADRUPLE}
+_RDKIT_BOND_ORDERS = {'SINGLE': 1, 'DOUBLE': 2, 'TRIPLE': 3, 'QUADRUPLE': 4, 'AROMATIC': 1.5}
+
+
 def toRDKitMol(mol, removeHs=True, returnMapping=False, sanitize=True):
     """
     Convert a molecular structure to a RDKit rdmol object. Uses
@@ -60,42 +67,70 @@ def toRDKitMol(mol, removeHs=True, returnMapping=False, sanitize=True):
     If returnMapping==True then it also returns a dictionary mapping the
     atoms to RDKit's atom indices.
     """
+    return _toRDKitMol(mol, removeHs, returnMapping, sanitize, {})
+
+
+def toRDKitMol_many(mols, removeHs=True, sanitize=True):
+    """
+    Convert a list of molecular structures `mols` to a list of RDKit rdmol
+    objects, as done by :func:`toRDKitMol`. The RDKit atoms are copied from
+    templates that are shared by all of the molecules, so that each kind of
+    atom is only built once for the whole list.
+    """
+    cython.declare(atomTemplates=dict)
+    atomTemplates = {}
+    return [_toRDKitMol(mol, removeHs, False, sanitize, atomTemplates) for mol in mols]
+
+
+def _toRDKitMol(mol, removeHs, returnMapping, sanitize, atomTemplates):
+    """
+    Convert `mol` to a RDKit rdmol object. The RDKit atoms are copied from the
+    template atoms in `atomTemplates`, a dictionary keyed by the element
+    symbol, isotope, number of radical electrons and charge, which is extended
+    with any kind of atom not yet in it.
+    """
+    cython.declare(index=cython.int,
+                   index1=cython.int,
+                   index2=cython.int,
+                   radicalElectrons=cython.int,
+                   atomIndices=dict,
+                   rdAtomIndices=dict,
+                   atom=mm.Atom,
+                   atom1=mm.Atom,
+                   atom2=mm.Atom,
+                   bond=mm.Bond)
 
     # Sort the atoms before converting to ensure output is consistent
     # between different runs
     mol.sortAtoms()
-    atoms = mol.vertices
-    rdAtomIndices = {} # dictionary of RDKit atom indices
+    atomIndices = {}  # dictionary of the indices of all atoms
+    rdAtomIndices = {}  # dictionary of RDKit atom indices
     rdkitmol = Chem.rdchem.EditableMol(Chem.rdchem.Mol())
     for index, atom in enumerate(mol.vertices):
-        if atom.element.symbol == 'X':
-            rdAtom = Chem.rdchem.Atom('Pt')  # not sure how to do this with linear scaling when this might not be Pt
-        else:
-            rdAtom = Chem.rdchem.Atom(atom.element.symbol)
-        if atom.element.isotope != -1:
-            rdAtom.SetIsotope(atom.element.isotope)
-        rdAtom.SetNumRadicalElectrons(atom.radicalElectrons)
-        rdAtom.SetFormalCharge(atom.charge)
-        if atom.element.symbol == 'C' and atom.lonePairs == 1 and mol.multiplicity == 1: rdAtom.SetNumRadicalElectrons(2)
+        radicalElectrons = atom.radicalElectrons
+        if atom.element.symbol == 'C' and atom.lonePairs == 1 and mol.multiplicity == 1: radicalElectrons = 2
+        key = (atom.element.symbol, atom.element.isotope, radicalElectrons, atom.charge)
+        try:
+            rdAtom = atomTemplates[key]
+        except KeyError:
+            rdAtom = atomTemplates[key] = _makeRDKitAtom(*key)
+        # RDKit adds a copy of the atom, so the template can be reused
         rdkitmol.AddAtom(rdAtom)
+        atomIndices[atom] = index
         if removeHs and atom.symbol == 'H':
             pass
         else:
             rdAtomIndices[atom] = index
 
-    rdBonds = Chem.rdchem.BondType
-    orders = {'S': rdBonds.SINGLE, 'D': rdBonds.DOUBLE, 'T': rdBonds.TRIPLE, 'B': rdBonds.AROMATIC, 'Q': rdBonds.QUADRUPLE}
     # Add the bonds
     for atom1 in mol.vertices:
+        index1 = atomIndices[atom1]
         for atom2, bond in atom1.edges.iteritems():
             if bond.isHydrogenBond():
                 continue
-            index1 = atoms.index(atom1)
-            index2 = atoms.index(atom2)
+            index2 = atomIndices[atom2]
             if index1 < index2:
-                order_string = bond.getOrderStr()
-                order = orders[order_string]
-                rdkitmol.AddBond(index1, index2, order)
+                rdkitmol.AddBond(index1, index2, _RDKIT_BOND_TYPES[bond.getOrderStr()])
 
     # Make editable mol into a mol and rectify the molecule
     rdkitmol = rdkitmol.GetMol()
@@ -108,21 +143,56 @@ def toRDKitMol(mol, removeHs=True, returnMapping=False, sanitize=True):
     return rdkitmol
 
 
+def _makeRDKitAtom(symbol, isotope, radicalElectrons, charge):
+    """
+    Return a new RDKit atom with the given element `symbol`, `isotope`,
+    number of `radicalElectrons` and `charge`.
+    """
+    if symbol == 'X':
+        rdAtom = Chem.rdchem.Atom('Pt')  # not sure how to do this with linear scaling when this might not be Pt
+    else:
+        rdAtom = Chem.rdchem.Atom(symbol)
+    if isotope != -1:
+        rdAtom.SetIsotope(isotope)
+    rdAtom.SetNumRadicalElectrons(radicalElectrons)
+    rdAtom.SetFormalCharge(charge)
+    return rdAtom
+
+
 def fromRDKitMol(mol, rdkitmol):
     """
     Convert a RDKit Mol object `rdkitmol` to a molecular structure. Uses
     `RDKit <http://rdkit.org/>`_ to perform the conversion.
     This Kekulizes everything, removing all aromatic atom types.
     """
+    return _fromRDKitMol(mol, rdkitmol, {})
+
+
+def fromRDKitMol_many(rdkitmols):
+    """
+    Convert a list of RDKit Mol objects `rdkitmols` to a list of new molecular
+    structures, as done by :func:`fromRDKitMol`. The elements are looked up
+    only once for each atomic number and isotope in the whole list.
+    """
+    cython.declare(elementTable=dict)
+    elementTable = {}
+    return [_fromRDKitMol(mm.Molecule(), rdkitmol, elementTable) for rdkitmol in rdkitmols]
+
+
+def _fromRDKitMol(mol, rdkitmol, elementTable):
+    """
+    Convert the RDKit Mol object `rdkitmol` to the molecular structure `mol`.
+    The elements are taken from `elementTable`, a dictionary keyed by the
+    atomic number and isotope, which is extended with any element not yet in it.
+    """
     cython.declare(i=cython.int,
+                   j=cython.int,
                    radicalElectrons=cython.int,
                    charge=cython.int,
-                   lonePairs=cython.int,
                    number=cython.int,
+                   isotope=cython.int,
                    order=cython.float,
                    atom=mm.Atom,
-                   atom1=mm.Atom,
-                   atom2=mm.Atom,
                    bond=mm.Bond)
 
     mol.vertices = []
@@ -138,8 +208,11 @@ def fromRDKitMol(mol, rdkitmol):
 
         # Use atomic number as key for element
         number = rdkitatom.GetAtomicNum()
-        isotope = rdkitatom.GetIsotope()
-        element = elements.getElement(number, isotope or -1)
+        isotope = rdkitatom.GetIsotope() or -1
+        try:
+            element = elementTable[number, isotope]
+        except KeyError:
+            element = elementTable[number, isotope] = elements.getElement(number, isotope)
 
         # Process charge
         charge = rdkitatom.GetFormalCharge()
@@ -148,22 +221,15 @@ def fromRDKitMol(mol, rdkitmol):
         atom = mm.Atom(element, radicalElectrons, charge, '', 0)
         mol.vertices.append(atom)
 
-        # Add bonds by iterating again through atoms
-        for j in xrange(0, i):
-            rdkitbond = rdkitmol.GetBondBetweenAtoms(i, j)
-            if rdkitbond is not None:
-                order = 0
-
-                # Process bond type
-                rdbondtype = rdkitbond.GetBondType()
-                if rdbondtype.name == 'SINGLE': order = 1
-                elif rdbondtype.name == 'DOUBLE': order = 2
-                elif rdbondtype.name == 'TRIPLE': order = 3
-                elif rdbondtype.name == 'QUADRUPLE': order = 4
-                elif rdbondtype.name == 'AROMATIC': order = 1.5
-
-                bond = mm.Bond(mol.vertices[i], mol.vertices[j], order)
-                mol.addBond(bond)
+    # Add the bonds, with the atom with the higher index first
+    for rdkitbond in rdkitmol.GetBonds():
+        i = rdkitbond.GetBeginAtomIdx()
+        j = rdkitbond.GetEndAtomIdx()
+        if i < j:
+            i, j = j, i
+        order = _RDKIT_BOND_ORDERS.get(rdkitbond.GetBondType().name, 0)
+        bond = mm.Bond(mol.vertices[i], mol.vertices[j], order)
+        mol.addBond(bond)
 
     # We need to update lone pairs first because the charge was set by RDKit
     mol.updateLonePairs()
@@ -34,8 +34,11 @@ This module contains unit test for the converter module.
 
 import unittest
 
+from rdkit import Chem
+
 from rmgpy.exceptions import AtomTypeError
-from rmgpy.molecule.converter import debugRDKitMol, toRDKitMol, fromRDKitMol, toOBMol, fromOBMol
+from rmgpy.molecule.converter import debugRDKitMol, toRDKitMol, fromRDKitMol, toRDKitMol_many, fromRDKitMol_many, \
+    toOBMol, fromOBMol
 from rmgpy.molecule.molecule import Molecule
 
 
@@ -151,6 +154,18 @@ class ConverterTest(unittest.TestCase):
             self.assertTrue(mol.isIsomorphic(new_mol) or self.test_Hbond_free_mol.isIsomorphic(new_mol))
             self.assertEqual(mol.get_element_count(), new_mol.get_element_count())
 
+    def test_rdkit_round_trip_many(self):
+        """Test bulk conversion to and from RDKitMol"""
+        rdkit_mols = toRDKitMol_many(self.test_mols)
+        self.assertEqual(len(rdkit_mols), len(self.test_mols))
+        for mol, rdkit_mol in zip(self.test_mols, rdkit_mols):
+            self.assertEqual(Chem.MolToSmiles(rdkit_mol), Chem.MolToSmiles(toRDKitMol(mol)))
+        new_mols = fromRDKitMol_many(rdkit_mols)
+        for mol, new_mol in zip(self.test_mols, new_mols):
+            self.assertTrue(mol.isIsomorphic(new_mol) or self.test_Hbond_free_mol.isIsomorphic(new_mol))
+            self.assertEqual(mol.get_element_count(), new_mol.get_element_count())
+            self.assertEqual(mol.multiplicity, new_mol.multiplicity)
+
     def test_ob_round_trip(self):
         """Test conversion to and from OBMol"""
         for mol in self.test_mols:
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+"""
+This module provides an immutable, array-backed representation of a
+:class:`Molecule`, intended for storing and transferring large numbers of
+molecules (e.g. when sending species to worker processes) at a fraction of the
+memory and pickling cost of the object graph.
+"""
+
+import numpy
+
+from .molecule import Atom, Bond, Molecule
+from .atomtype import atomTypes
+from .element import elementList
+
+# Tables used to store elements and atom types as small integers
+_atomTypeLabels = sorted(atomTypes.keys())
+_atomTypeIndices = dict([(label, i) for i, label in enumerate(_atomTypeLabels)])
+_elementIndices = dict([((element.symbol, element.isotope), i) for i, element in enumerate(elementList)])
+
+################################################################################
+
+class FrozenMolecule(object):
+    """
+    An immutable representation of a molecule as a set of arrays. The bonds
+    are stored as a compressed sparse row (CSR) adjacency: the neighbors of
+    atom `i` are ``indices[indptr[i]:indptr[i+1]]``, with the corresponding
+    bond orders in ``orders``. Each bond is stored once for each of its atoms.
+    The attributes are:
+
+    =================== =========================== ============================
+    Attribute           Type                        Description
+    =================== =========================== ============================
+    `elements`          ``numpy.ndarray``           The index of the element of each atom in `elementList`
+    `radicals`          ``numpy.ndarray``           The number of radical electrons on each atom
+    `charges`           ``numpy.ndarray``           The formal charge of each atom
+    `lonePairs`         ``numpy.ndarray``           The number of lone pairs on each atom
+    `atomTypes`         ``numpy.ndarray``           The index of the atom type of each atom, or -1 if unknown
+    `rings`             ``numpy.ndarray``           1 if each atom is in a ring, 0 if not, or -1 if unknown
+    `labels`            ``tuple``                   The labels of the atoms, or ``None`` if no atom is labeled
+    `indptr`            ``numpy.ndarray``           The offset of the neighbors of each atom in `indices`
+    `indices`           ``numpy.ndarray``           The indices of the neighbors of each atom
+    `orders`            ``numpy.ndarray``           The order of the bond to each neighbor in `indices`
+    `multiplicity`      ``int``                     The multiplicity of the molecule
+    `symmetryNumber`    ``float``                   The symmetry number of the molecule
+    `reactive`          ``bool``                    ``True`` if the molecule participates in reaction families
+    `fingerprint`       ``str``                     The fingerprint of the molecule, used for fast comparison
+    =================== =========================== ============================
+
+    Atom coordinates, ids and properties are not stored, except for the ring
+    membership of the atoms, which is needed to match groups with ring
+    constraints.
+    """
+
+    __slots__ = ('elements', 'radicals', 'charges', 'lonePairs', 'atomTypes', 'labels',
+                 'indptr', 'indices', 'orders', 'multiplicity', 'symmetryNumber', 'reactive', 'fingerprint',
+                 'rings')
+
+    def __init__(self, elements, radicals, charges, lonePairs, atomTypes, labels, indptr, indices, orders,
+                 multiplicity=-187, symmetryNumber=-1, reactive=True, fingerprint=None, rings=None):
+        self.elements = elements
+        self.radicals = radicals
+        self.charges = charges
+        self.lonePairs = lonePairs
+        self.atomTypes = atomTypes
+        self.labels = labels
+        self.indptr = indptr
+        self.indices = indices
+        self.orders = orders
+        self.multiplicity = multiplicity
+        self.symmetryNumber = symmetryNumber
+        self.reactive = reactive
+        self.fingerprint = fingerprint
+        self.rings = rings
+
+    def __reduce__(self):
+        """
+        A helper function used when pickling an object.
+        """
+        return (FrozenMolecule, (self.elements, self.radicals, self.charges, self.lonePairs, self.atomTypes,
+                                 self.labels, self.indptr, self.indices, self.orders, self.multiplicity,
+                                 self.symmetryNumber, self.reactive, self.fingerprint, self.rings))
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __repr__(self):
+        return '<FrozenMolecule "{0}">'.format(self.fingerprint)
+
+    @classmethod
+    def fromMolecule(cls, molecule):
+        """
+        Return a new :class:`FrozenMolecule` with the structure of the
+        :class:`Molecule` object `molecule`.
+        """
+        atoms = molecule.atoms
+        numAtoms = len(atoms)
+        atomIndices = dict([(atom, i) for i, atom in enumerate(atoms)])
+        elements = numpy.empty(numAtoms, numpy.int16)
+        radicals = numpy.empty(numAtoms, numpy.int8)
+        charges = numpy.empty(numAtoms, numpy.int8)
+        lonePairs = numpy.empty(numAtoms, numpy.int8)
+        types = numpy.empty(numAtoms, numpy.int16)
+        rings = numpy.empty(numAtoms, numpy.int8)
+        indptr = numpy.empty(numAtoms + 1, numpy.int32)
+        neighbors = []
+        orders = []
+        labeled = False
+        indptr[0] = 0
+        for i, atom in enumerate(atoms):
+            try:
+                elements[i] = _elementIndices[atom.element.symbol, atom.element.isotope]
+            except KeyError:
+                raise ValueError('Unable to freeze molecule with unknown element {0!r}.'.format(atom.element))
+            radicals[i] = atom.radicalElectrons
+            charges[i] = atom.charge
+            lonePairs[i] = atom.lonePairs
+            types[i] = _atomTypeIndices[atom.atomType.label] if atom.atomType is not None else -1
+            rings[i] = int(atom.props['inRing']) if 'inRing' in atom.props else -1
+            labeled = labeled or bool(atom.label)
+            for neighbor, bond in atom.edges.iteritems():
+                neighbors.append(atomIndices[neighbor])
+                orders.append(bond.order)
+            indptr[i + 1] = len(neighbors)
+        return cls(elements, radicals, charges, lonePairs, types,
+                   tuple([atom.label for atom in atoms]) if labeled else None,
+                   indptr, numpy.array(neighbors, numpy.int32), numpy.array(orders, numpy.float32),
+                   multiplicity=molecule.multiplicity, symmetryNumber=molecule.symmetryNumber,
+                   reactive=molecule.reactive, fingerprint=molecule.fingerprint, rings=rings)
+
+    def toMolecule(self, atoms=None):
+        """
+        Return a new :class:`Molecule` object with the structure of this
+        molecule. Atom types and ring membership are restored from the stored
+        values rather than perceived again. If a list of :class:`Atom` objects `atoms` is given,
+        e.g. the corresponding atoms of an isomorphic molecule, copies of them
+        are used, keeping their labels, ids, coordinates and properties.
+        """
+        if atoms is not None:
+            atoms = [atom.copy() for atom in atoms]
+            for i, atom in enumerate(atoms):
+                atom.element = elementList[self.elements[i]]
+                atom.radicalElectrons = int(self.radicals[i])
+                atom.charge = int(self.charges[i])
+                atom.lonePairs = int(self.lonePairs[i])
+                atom.atomType = atomTypes[_atomTypeLabels[self.atomTypes[i]]] if self.atomTypes[i] >= 0 else None
+                if self.rings is not None and self.rings[i] >= 0:
+                    atom.props['inRing'] = bool(self.rings[i])
+        else:
+            atoms = [self._getAtom(i) for i in xrange(len(self.elements))]
+        molecule = Molecule(atoms=atoms, symmetry=self.symmetryNumber, multiplicity=self.multiplicity,
+                            reactive=self.reactive)
+        indptr, indices, orders = self.indptr, self.indices, self.orders
+        for i in xrange(len(atoms)):
+            for k in xrange(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                if j > i:
+                    molecule.addBond(Bond(atoms[i], atoms[j], order=float(orders[k])))
+        return molecule
+
+    def _getAtom(self, i):
+        """
+        Return a new :class:`Atom` object for atom `i` of this molecule.
+        """
+        atom = Atom(element=elementList[self.elements[i]], radicalElectrons=int(self.radicals[i]),
+                    charge=int(self.charges[i]), label=self.labels[i] if self.labels is not None else '',
+                    lonePairs=int(self.lonePairs[i]))
+        if self.atomTypes[i] >= 0:
+            atom.atomType = atomTypes[_atomTypeLabels[self.atomTypes[i]]]
+        if self.rings is not None and self.rings[i] >= 0:
+            atom.props['inRing'] = bool(self.rings[i])
+        return atom
+
+    def hasSameSkeleton(self, other):
+        """
+        Return ``True`` if the :class:`FrozenMolecule` `other` has the same
+        elements as this molecule and the same atoms bonded to each other,
+        with the atoms in the same order, or ``False`` otherwise.
+        """
+        if not numpy.array_equal(self.elements, other.elements) or not numpy.array_equal(self.indptr, other.indptr):
+            return False
+        for i in xrange(len(self.elements)):
+            start, end = self.indptr[i], self.indptr[i + 1]
+            if set(self.indices[start:end]) != set(other.indices[start:end]):
+                return False
+        return True
+
+    def getDegrees(self):
+        """
+        Return an array of the number of bonds of each atom.
+        """
+        return numpy.diff(self.indptr)
+
+    def isIsomorphic(self, other, strict=True):
+        """
+        Returns :data:`True` if `other`, a :class:`FrozenMolecule` or
+        :class:`Molecule` object, is isomorphic to this molecule and
+        :data:`False` otherwise. Molecules that differ in their fingerprint,
+        multiplicity, atoms or degree sequence are rejected using the arrays
+        alone; otherwise the full isomorphism check is made on the
+        corresponding :class:`Molecule` objects.
+        """
+        if isinstance(other, Molecule):
+            other = FrozenMolecule.fromMolecule(other)
+        elif not isinstance(other, FrozenMolecule):
+            raise TypeError('Got a {0} object for parameter "other", when a FrozenMolecule or Molecule object '
+                            'is required.'.format(other.__class__))
+        if self.fingerprint != other.fingerprint or self.multiplicity != other.multiplicity:
+            return False
+        if len(self.indices) != len(other.indices):
+            return False
+        if not numpy.array_equal(numpy.sort(self.getDegrees()), numpy.sort(other.getDegrees())):
+            return False
+        if strict and not numpy.array_equal(numpy.sort(self._getAtomKeys()), numpy.sort(other._getAtomKeys())):
+            return False
+        return self.toMolecule().isIsomorphic(other.toMolecule(), strict=strict)
+
+    def _getAtomKeys(self):
+        """
+        Return an array combining the element, radical electrons, lone pairs,
+        charge and atom type of each atom into a single integer, such that
+        equivalent atoms have equal keys.
+        """
+        keys = self.elements.astype(numpy.int64)
+        for values, size in [(self.radicals, 16), (self.lonePairs, 16), (self.charges + 8, 16),
+                             (self.atomTypes + 1, 1024)]:
+            keys = keys * size + values
+        return keys
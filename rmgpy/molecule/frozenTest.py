@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+import cPickle
+import unittest
+
+from rmgpy.molecule.frozen import FrozenMolecule
+from rmgpy.molecule.molecule import Molecule
+
+################################################################################
+
+class TestFrozenMolecule(unittest.TestCase):
+    """
+    Contains unit tests of the FrozenMolecule class.
+    """
+
+    def setUp(self):
+        self.molecule = Molecule().fromAdjacencyList("""
+multiplicity 2
+1 *1 C u1 p0 c0 {2,S} {4,S} {5,S}
+2    C u0 p0 c0 {1,S} {3,D} {6,S}
+3    O u0 p2 c0 {2,D}
+4    H u0 p0 c0 {1,S}
+5    H u0 p0 c0 {1,S}
+6    H u0 p0 c0 {2,S}
+""")
+        self.frozen = self.molecule.freeze()
+
+    def test_arrays(self):
+        """Test that the atoms and bonds are stored in the arrays"""
+        self.assertEqual(len(self.frozen), 6)
+        self.assertEqual(list(self.frozen.radicals), [1, 0, 0, 0, 0, 0])
+        self.assertEqual(list(self.frozen.lonePairs), [0, 0, 2, 0, 0, 0])
+        self.assertEqual(list(self.frozen.getDegrees()), [3, 3, 1, 1, 1, 1])
+        self.assertEqual(self.frozen.labels, ('*1', '', '', '', '', ''))
+        self.assertEqual(len(self.frozen.indices), 10)
+
+    def test_to_molecule(self):
+        """Test that a frozen molecule is converted back to an identical molecule"""
+        molecule = self.frozen.toMolecule()
+        self.assertTrue(molecule.isIsomorphic(self.molecule))
+        self.assertEqual(molecule.multiplicity, 2)
+        self.assertEqual(molecule.toAdjacencyList(), self.molecule.toAdjacencyList())
+        for atom1, atom2 in zip(molecule.atoms, self.molecule.atoms):
+            self.assertIs(atom1.element, atom2.element)
+            self.assertIs(atom1.atomType, atom2.atomType)
+
+    def test_ring_membership(self):
+        """Test that the ring membership of the atoms is kept by a frozen molecule"""
+        molecule = Molecule().fromSMILES('C1CC1C')
+        molecule.identifyRingMembership()
+        expected = [atom.props['inRing'] for atom in molecule.atoms]
+        self.assertEqual(sorted(expected).count(True), 3)
+
+        frozen = cPickle.loads(cPickle.dumps(molecule.freeze(), -1))
+        self.assertEqual([atom.props['inRing'] for atom in frozen.toMolecule().atoms], expected)
+        self.assertEqual([atom.props['inRing'] for atom in frozen.toMolecule(atoms=molecule.atoms).atoms], expected)
+
+        # Ring membership that was never perceived is not made up
+        molecule = Molecule().fromSMILES('C1CC1C')
+        for atom in molecule.atoms:
+            atom.props.pop('inRing', None)
+        self.assertTrue(all(['inRing' not in atom.props for atom in molecule.freeze().toMolecule().atoms]))
+
+    def test_pickle(self):
+        """Test that a frozen molecule can be pickled and unpickled"""
+        frozen = cPickle.loads(cPickle.dumps(self.frozen, -1))
+        self.assertTrue(frozen.toMolecule().isIsomorphic(self.molecule))
+        self.assertEqual(frozen.fingerprint, self.frozen.fingerprint)
+
+    def test_is_isomorphic(self):
+        """Test the isomorphism check of frozen molecules"""
+        copy = self.molecule.copy(deep=True)
+        copy.atoms.reverse()
+        self.assertTrue(self.frozen.isIsomorphic(copy.freeze()))
+        self.assertTrue(self.frozen.isIsomorphic(copy))
+        self.assertTrue(copy.isIsomorphic(self.frozen))
+        other = Molecule(SMILES='[O]C=C')
+        self.assertFalse(self.frozen.isIsomorphic(other.freeze()))
+        self.assertTrue(self.frozen.isIsomorphic(other.freeze(), strict=False))
+        self.assertFalse(self.frozen.isIsomorphic(Molecule(SMILES='CC=O').freeze()))
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -37,6 +37,7 @@ cdef class Vertex(object):
     cdef public bint terminal
     cdef public Vertex mapping
     cdef public bint ignore
+    cdef public long invariant
     
     cpdef Vertex copy(self)
 
@@ -44,6 +45,8 @@ cdef class Vertex(object):
 
     cpdef bint isSpecificCaseOf(self, Vertex other) except -2
 
+    cpdef long getInvariant(self, bint strict=?)
+
     cpdef resetConnectivityValues(self)
 
 cpdef short getVertexConnectivityValue(Vertex vertex) except 1 # all values should be negative
@@ -76,6 +79,9 @@ cdef class Graph(object):
     
     cdef public list ordered_vertices
 
+    cdef tuple _rings
+    cdef object _ringState
+
     cpdef Vertex addVertex(self, Vertex vertex)
 
     cpdef Edge addEdge(self, Edge edge)
@@ -150,6 +156,10 @@ cdef class Graph(object):
 
     cpdef list getRelevantCycles(self)
 
+    cpdef tuple _getRings(self)
+
+    cpdef tuple _perceiveRings(self)
+
     cpdef list _sortCyclicVertices(self, list vertices)
 
     cpdef int getMaxCycleOverlap(self)
@@ -53,6 +53,7 @@ cdef class Vertex(object):
     `connectivity3`     ``int``         The sum of the neighbors' `connectivity2` values
     `edges`             ``dict``        Dictionary of edges with keys being neighboring vertices
     `sortingLabel`      ``int``         An integer label used to sort the vertices
+    `invariant`         ``int``         An integer used to reject candidate pairs in isomorphism searches
     =================== =============== ========================================
     
     """
@@ -111,6 +112,16 @@ cdef class Vertex(object):
         """
         return True
 
+    cpdef long getInvariant(self, bint strict=True):
+        """
+        Return an integer describing the vertex, which must be the same for
+        any two vertices for which :meth:`equivalent` with the given `strict`
+        setting returns ``True`` and which have the same connectivity values.
+        You should reimplement this function in a derived class if your
+        vertices have semantic information.
+        """
+        return hash((self.connectivity1, self.connectivity2, self.connectivity3))
+
     cpdef resetConnectivityValues(self):
         """
         Reset the cached structure information for this vertex.
@@ -951,7 +962,8 @@ cdef class Graph(object):
     cpdef list getSmallestSetOfSmallestRings(self):
         """
         Returns the smallest set of smallest rings as a list of lists.
-        Uses RingDecomposerLib for ring perception.
+        Uses RingDecomposerLib for ring perception of polycyclic graphs.
+        The rings are cached on the graph (see :meth:`_getRings`).
 
         Kolodzik, A.; Urbaczek, S.; Rarey, M.
         Unique Ring Families: A Chemically Meaningful Description
@@ -963,28 +975,14 @@ cdef class Graph(object):
         Unique Ring Families and Other Cycle Bases.
         J. Chem. Inf. Model., 2017, 57 (2), pp 122-126
         """
-        cdef list sssr
-        cdef object graph, data, cycle
-
-        graph = py_rdl.Graph.from_edges(
-            self.getAllEdges(),
-            _getEdgeVertex1,
-            _getEdgeVertex2,
-        )
-
-        data = py_rdl.wrapper.DataInternal(graph.get_nof_nodes(), graph.get_edges().iterkeys())
-        data.calculate()
-
-        sssr = []
-        for cycle in data.get_sssr():
-            sssr.append(self._sortCyclicVertices([graph.get_node_for_index(i) for i in cycle.nodes]))
-
-        return sssr
+        cdef list cycle
+        return [list(cycle) for cycle in self._getRings()[0]]
 
     cpdef list getRelevantCycles(self):
         """
         Returns the set of relevant cycles as a list of lists.
-        Uses RingDecomposerLib for ring perception.
+        Uses RingDecomposerLib for ring perception of polycyclic graphs.
+        The rings are cached on the graph (see :meth:`_getRings`).
 
         Kolodzik, A.; Urbaczek, S.; Rarey, M.
         Unique Ring Families: A Chemically Meaningful Description
@@ -996,23 +994,115 @@ cdef class Graph(object):
         Unique Ring Families and Other Cycle Bases.
         J. Chem. Inf. Model., 2017, 57 (2), pp 122-126
         """
-        cdef list rc
-        cdef object graph, data, cycle
+        cdef list cycle
+        return [list(cycle) for cycle in self._getRings()[1]]
 
-        graph = py_rdl.Graph.from_edges(
-            self.getAllEdges(),
-            _getEdgeVertex1,
-            _getEdgeVertex2,
-        )
+    cpdef tuple _getRings(self):
+        """
+        Return a tuple of the smallest set of smallest rings and the relevant
+        cycles of the graph. The rings are perceived once and cached on the
+        graph along with the set of its edges, and perceived again whenever
+        the edges of the graph have changed. The returned lists must not be
+        modified.
+        """
+        cdef set edges
+        cdef object state
+        cdef Vertex vertex
 
-        data = py_rdl.wrapper.DataInternal(graph.get_nof_nodes(), graph.get_edges().iterkeys())
-        data.calculate()
+        edges = set()
+        for vertex in self.vertices:
+            edges.update(vertex.edges.itervalues())
+        state = frozenset(edges)
+        if self._rings is None or state != self._ringState:
+            self._rings = self._perceiveRings()
+            self._ringState = state
+        return self._rings
+
+    cpdef tuple _perceiveRings(self):
+        """
+        Perceive the smallest set of smallest rings and the relevant cycles of
+        the graph, and return them as a tuple of two lists of lists.
+
+        All cycles lie in the cyclic core of the graph, which is found by
+        repeatedly removing vertices with fewer than two edges. A connected
+        part of the core with as many edges as vertices is a single ring,
+        which is its only smallest and relevant ring. Only the other parts of
+        the core, i.e. the polycyclic ones, are converted for RingDecomposerLib.
+        """
+        cdef dict degrees
+        cdef list stack, component, polycyclicEdges, sssr, rc, ring
+        cdef set core, visited, edges
+        cdef Vertex vertex, vertex2, vertex3
+        cdef Edge edge
+        cdef int i, numEdges
+        cdef object graph, data, cycle
 
-        rc = []
-        for cycle in data.get_rcs():
-            rc.append(self._sortCyclicVertices([graph.get_node_for_index(i) for i in cycle.nodes]))
+        # Find the cyclic core of the graph
+        degrees = {}
+        for vertex in self.vertices:
+            degrees[vertex] = len(vertex.edges)
+        core = set(self.vertices)
+        stack = [vertex for vertex in self.vertices if degrees[vertex] < 2]
+        while stack:
+            vertex = stack.pop()
+            if vertex not in core:
+                continue
+            core.remove(vertex)
+            for vertex2 in vertex.edges:
+                if vertex2 in core:
+                    degrees[vertex2] -= 1
+                    if degrees[vertex2] < 2:
+                        stack.append(vertex2)
 
-        return rc
+        sssr = []
+        rc = []
+        polycyclicEdges = []
+        visited = set()
+        for vertex in self.vertices:
+            if vertex not in core or vertex in visited:
+                continue
+            # Collect the connected part of the core containing this vertex
+            component = [vertex]
+            visited.add(vertex)
+            numEdges = 0
+            i = 0
+            while i < len(component):
+                for vertex2 in component[i].edges:
+                    if vertex2 in core:
+                        numEdges += 1
+                        if vertex2 not in visited:
+                            visited.add(vertex2)
+                            component.append(vertex2)
+                i += 1
+            numEdges //= 2
+            if numEdges == len(component):
+                ring = self._sortCyclicVertices(component)
+                sssr.append(ring)
+                rc.append(list(ring))
+            else:
+                edges = set()
+                for vertex2 in component:
+                    for vertex3, edge in vertex2.edges.iteritems():
+                        if vertex3 in core:
+                            edges.add(edge)
+                polycyclicEdges.extend(edges)
+
+        if polycyclicEdges:
+            graph = py_rdl.Graph.from_edges(
+                polycyclicEdges,
+                _getEdgeVertex1,
+                _getEdgeVertex2,
+            )
+
+            data = py_rdl.wrapper.DataInternal(graph.get_nof_nodes(), graph.get_edges().iterkeys())
+            data.calculate()
+
+            for cycle in data.get_sssr():
+                sssr.append(self._sortCyclicVertices([graph.get_node_for_index(i) for i in cycle.nodes]))
+            for cycle in data.get_rcs():
+                rc.append(self._sortCyclicVertices([graph.get_node_for_index(i) for i in cycle.nodes]))
+
+        return sssr, rc
 
     cpdef list _sortCyclicVertices(self, list vertices):
         """
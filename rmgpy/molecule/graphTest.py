@@ -719,6 +719,37 @@ class TestGraph(unittest.TestCase):
         for i in range(5):
             self.assertTrue(self.graph.hasEdge(rc[0][i], rc[0][i - 1]))
 
+    def test_ringCache(self):
+        """
+        Test that the cached rings are updated when the edges of the graph
+        change and are not affected by changes to the returned lists.
+        """
+        vertices = self.graph.vertices
+        self.graph.addEdge(Edge(vertices[0], vertices[4]))
+        sssr = self.graph.getSmallestSetOfSmallestRings()
+        self.assertEqual([len(cycle) for cycle in sssr], [5])
+        sssr[0].pop()
+        sssr.pop()
+        self.assertEqual([len(cycle) for cycle in self.graph.getSmallestSetOfSmallestRings()], [5])
+
+        # Fuse a second ring onto the first one
+        edge = self.graph.addEdge(Edge(vertices[1], vertices[3]))
+        sssr = self.graph.getSmallestSetOfSmallestRings()
+        self.assertEqual(sorted([len(cycle) for cycle in sssr]), [3, 4])
+        self.assertEqual(sorted([len(cycle) for cycle in self.graph.getRelevantCycles()]), [3, 4])
+        for cycle in sssr:
+            for i in range(len(cycle)):
+                self.assertTrue(self.graph.hasEdge(cycle[i], cycle[i - 1]))
+
+        self.graph.removeEdge(edge)
+        self.assertEqual([len(cycle) for cycle in self.graph.getSmallestSetOfSmallestRings()], [5])
+
+        # Edges changed without using the graph methods are also detected
+        del vertices[0].edges[vertices[4]]
+        del vertices[4].edges[vertices[0]]
+        self.assertEqual(self.graph.getSmallestSetOfSmallestRings(), [])
+        self.assertEqual(self.graph.getRelevantCycles(), [])
+
     def test_getPolycyclicRings(self):
         """
         Test that the Graph.getPolycyclicRings() method returns only polycyclic rings.
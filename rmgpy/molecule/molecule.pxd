@@ -51,6 +51,8 @@ cdef class Atom(Vertex):
 
     cpdef bint isSpecificCaseOf(self, Vertex other) except -2
 
+    cpdef long getInvariant(self, bint strict=?)
+
     cpdef Vertex copy(self)
 
     cpdef bint isHydrogen(self)
@@ -143,6 +145,8 @@ cdef class Molecule(Graph):
     cdef str _fingerprint
     cdef str _inchi
     cdef str _smiles
+    cdef dict _identifiers
+    cdef object _identifierState
 
     cpdef addAtom(self, Atom atom)
 
@@ -267,6 +267,19 @@ class Atom(Vertex):
                 return False
             return True
 
+    def getInvariant(self, strict=True):
+        """
+        Return an integer describing the atom, which is the same for any two
+        atoms that are :meth:`equivalent` with the given `strict` setting and
+        have the same connectivity values. It is used to quickly reject
+        candidate pairs of atoms in isomorphism searches.
+        """
+        if strict:
+            return hash((self.connectivity1, self.connectivity2, self.connectivity3, id(self.element),
+                         self.radicalElectrons, self.lonePairs, self.charge, id(self.atomType)))
+        else:
+            return hash((self.connectivity1, self.connectivity2, self.connectivity3, id(self.element)))
+
     def copy(self):
         """
         Generate a deep copy of the current atom. Modifying the
@@ -809,6 +822,8 @@ class Molecule(Graph):
         self._fingerprint = None
         self._inchi = None
         self._smiles = None
+        self._identifiers = None
+        self._identifierState = None
         self.props = props or {}
 
         if InChI and SMILES:
@@ -908,22 +923,74 @@ class Molecule(Graph):
     @property
     def InChI(self):
         """InChI string for this molecule. Read-only."""
-        if self._inchi is None:
-            self._inchi = self.toInChI()
-        return self._inchi
+        if self._inchi is not None:
+            return self._inchi
+        return self.toInChI()
 
     @property
     def SMILES(self):
         """SMILES string for this molecule. Read-only."""
-        if self._smiles is None:
-            self._smiles = self.toSMILES()
-        return self._smiles
+        if self._smiles is not None:
+            return self._smiles
+        return self.toSMILES()
+
+    def _getIdentifierState(self):
+        """
+        Return an object describing the elements, electrons and bonds of the
+        molecule, which is used to check that the cached identifiers are
+        still valid, even if the atoms or bonds were modified directly (e.g.
+        by :meth:`Atom.applyAction`).
+        """
+        cython.declare(atom=Atom, neighbor=Atom, bond=Bond, atoms=list, bonds=list)
+        atoms = []
+        bonds = []
+        for atom in self.vertices:
+            atoms.append((id(atom), atom.element.number, atom.element.isotope, atom.radicalElectrons, atom.charge,
+                          atom.lonePairs))
+            for neighbor, bond in atom.edges.iteritems():
+                if id(atom) < id(neighbor):
+                    bonds.append((id(atom), id(neighbor), bond.order))
+        return self.multiplicity, frozenset(atoms), frozenset(bonds)
+
+    def _getIdentifier(self, identifierType, function, *args):
+        """
+        Return the string identifier `identifierType` of the molecule. The
+        identifier is generated by calling `function` with the molecule and
+        `args` the first time, and cached until the structure of the
+        molecule changes.
+        """
+        cython.declare(identifier=str)
+        state = self._getIdentifierState()
+        if self._identifiers is None or self._identifierState != state:
+            self._identifiers = {}
+            self._identifierState = state
+        try:
+            return self._identifiers[identifierType]
+        except KeyError:
+            identifier = function(self, *args)
+            self._identifiers[identifierType] = identifier
+            return identifier
+
+    def _hasIdentifier(self, identifierType):
+        """
+        Return ``True`` if the string identifier `identifierType` of the
+        molecule is cached and still valid, or ``False`` otherwise.
+        """
+        return (self._identifiers is not None and identifierType in self._identifiers
+                and self._identifierState == self._getIdentifierState())
+
+    def clearIdentifiers(self):
+        """
+        Discard the cached SMILES, InChI and InChI key identifiers of the
+        molecule.
+        """
+        self._inchi = self._smiles = self._identifiers = None
 
     def addAtom(self, atom):
         """
         Add an `atom` to the graph. The atom is initialized with no bonds.
         """
-        self._fingerprint = self._inchi = self._smiles = None
+        self._fingerprint = self._inchi = self._smiles = self._identifiers = None
         return self.addVertex(atom)
     
     def addBond(self, bond):
@@ -931,7 +998,7 @@ class Molecule(Graph):
         Add a `bond` to the graph as an edge connecting the two atoms `atom1`
         and `atom2`.
         """
-        self._fingerprint = self._inchi = self._smiles = None
+        self._fingerprint = self._inchi = self._smiles = self._identifiers = None
         return self.addEdge(bond)
 
     def getBonds(self, atom):
@@ -980,7 +1047,7 @@ class Molecule(Graph):
         not remove atoms that no longer have any bonds as a result of this
         removal.
         """
-        self._fingerprint = self._inchi = self._smiles = None
+        self._fingerprint = self._inchi = self._smiles = self._identifiers = None
         return self.removeVertex(atom)
 
     def removeBond(self, bond):
@@ -989,7 +1056,7 @@ class Molecule(Graph):
         Does not remove atoms that no longer have any bonds as a result of
         this removal.
         """
-        self._fingerprint = self._inchi = self._smiles = None
+        self._fingerprint = self._inchi = self._smiles = self._identifiers = None
         return self.removeEdge(bond)
 
     def removeVanDerWaalsBonds(self):
@@ -1027,6 +1094,7 @@ class Molecule(Graph):
         Update multiplicity, and sort atoms using the new
         connectivity values.
         """
+        self._identifiers = None
 
         for atom in self.atoms:
             atom.updateCharge()
@@ -1144,6 +1212,15 @@ class Molecule(Graph):
         other.reactive = self.reactive
         return other
 
+    def freeze(self):
+        """
+        Return an immutable, array-backed :class:`FrozenMolecule` copy of the
+        molecule, which is much cheaper to store and pickle. Use
+        :meth:`FrozenMolecule.toMolecule` to recreate a :class:`Molecule`.
+        """
+        from .frozen import FrozenMolecule
+        return FrozenMolecule.fromMolecule(self)
+
     def merge(self, other):
         """
         Merge two molecules so as to store them in a single :class:`Molecule`
@@ -1324,14 +1401,45 @@ class Molecule(Graph):
 
         return element_count
 
+    def get_connectivity_key(self):
+        """
+        Return a hashable key describing the connectivity of the molecule
+        without regard to the placement of electrons, i.e. ignoring bond
+        orders, radicals, lone pairs and charges.
+
+        The key combines the fingerprint, the multiplicity and the sorted atom
+        labels obtained by iteratively refining the atomic numbers over the
+        bonded neighbors (in the spirit of the Morgan algorithm). All resonance
+        structures of a species therefore share the same key. Two keys
+        matching is a necessary (but not sufficient) condition for the
+        associated molecules to be isomorphic with ``strict=False``.
+        """
+        cython.declare(atom=Atom, neighbor=Atom, labels=dict, newLabels=dict,
+                       numClasses=cython.int, newNumClasses=cython.int, i=cython.int)
+        labels = {}
+        for atom in self.vertices:
+            labels[atom] = atom.element.number
+        numClasses = len(set(labels.itervalues()))
+        for i in xrange(len(self.vertices)):
+            newLabels = {}
+            for atom in self.vertices:
+                newLabels[atom] = hash((labels[atom], tuple(sorted([labels[neighbor] for neighbor in atom.edges]))))
+            labels = newLabels
+            newNumClasses = len(set(labels.itervalues()))
+            if newNumClasses == numClasses:
+                # The partition of the atoms is stable, so further refinement would add no information
+                break
+            numClasses = newNumClasses
+        return self.fingerprint, self.multiplicity, tuple(sorted(labels.itervalues()))
+
     def isIsomorphic(self, other, initialMap=None, generateInitialMap=False, saveOrder=False, strict=True):
         """
         Returns :data:`True` if two graphs are isomorphic and :data:`False`
         otherwise. The `initialMap` attribute can be used to specify a required
         mapping from `self` to `other` (i.e. the atoms of `self` are the keys,
         while the atoms of `other` are the values). The `other` parameter must
-        be a :class:`Molecule` object, or a :class:`TypeError` is raised.
-        Also ensures multiplicities are also equal.
+        be a :class:`Molecule` or :class:`FrozenMolecule` object, or a
+        :class:`TypeError` is raised. Also ensures multiplicities are also equal.
 
         Args:
             initialMap (dict, optional):         initial atom mapping to use
@@ -1342,6 +1450,9 @@ class Molecule(Graph):
         # It only makes sense to compare a Molecule to a Molecule for full
         # isomorphism, so raise an exception if this is not what was requested
         if not isinstance(other, Molecule):
+            from .frozen import FrozenMolecule
+            if isinstance(other, FrozenMolecule):
+                return self.isIsomorphic(other.toMolecule(), initialMap, generateInitialMap, saveOrder, strict)
             raise TypeError('Got a {0} object for parameter "other", when a Molecule object is required.'.format(other.__class__))
         # Do the quick isomorphism comparison using the fingerprint
         # Two fingerprint strings matching is a necessary (but not
@@ -1627,8 +1738,10 @@ class Molecule(Graph):
         
         Convert a molecular structure to an InChI string. Uses
         `OpenBabel <http://openbabel.org/>`_ to perform the conversion.
+
+        The InChI is cached until the structure of the molecule changes.
         """
-        return translator.toInChI(self)
+        return self._getIdentifier('InChI', translator.toInChI)
         
     def toAugmentedInChI(self):
         """
@@ -1637,7 +1750,7 @@ class Molecule(Graph):
         
         Separate layer with a forward slash character.
         """
-        return translator.toInChI(self, aug_level=2)
+        return self._getIdentifier('AugmentedInChI', translator.toInChI, 'rdkit-first', 2)
         
     
     def toInChIKey(self):
@@ -1650,7 +1763,7 @@ class Molecule(Graph):
         Convert a molecular structure to an InChI Key string. Uses
         `RDKit <http://rdkit.org/>`_ to perform the conversion.
         """
-        return translator.toInChIKey(self)
+        return self._getIdentifier('InChIKey', translator.toInChIKey)
     
     def toAugmentedInChIKey(self):
         """
@@ -1660,7 +1773,7 @@ class Molecule(Graph):
         Simply append the multiplicity string, do not separate by a
         character like forward slash.
         """
-        return translator.toInChIKey(self, aug_level=2)
+        return self._getIdentifier('AugmentedInChIKey', translator.toInChIKey, 'rdkit-first', 2)
     
 
     def toSMARTS(self):
@@ -1684,9 +1797,10 @@ class Molecule(Graph):
         conversion, so it will be canonical SMILES.
         While converting to an RDMolecule it will perceive aromaticity
         and removes Hydrogen atoms.
+
+        The SMILES is cached until the structure of the molecule changes.
         """
-        
-        return translator.toSMILES(self)
+        return self._getIdentifier('SMILES', translator.toSMILES)
 
     def toRDKitMol(self, *args, **kwargs):
         """
@@ -1451,6 +1451,38 @@ multiplicity 2
         
         self.assertEqual(mol.toAugmentedInChIKey(), 'VGGSQFUCUMXWEO-UHFFFAOYSA-N-u1,2')
 
+    def testCachedIdentifiers(self):
+        """
+        Test that identifiers are cached and regenerated when the structure changes
+        """
+        mol = Molecule().fromAdjacencyList("""
+            1 C u0 p0 c0 {2,D} {3,S} {4,S}
+            2 C u0 p0 c0 {1,D} {5,S} {6,S}
+            3 H u0 p0 c0 {1,S}
+            4 H u0 p0 c0 {1,S}
+            5 H u0 p0 c0 {2,S}
+            6 H u0 p0 c0 {2,S}
+        """)
+        smiles = mol.toSMILES()
+        self.assertEqual(smiles, 'C=C')
+        self.assertIs(mol.toSMILES(), smiles)
+        self.assertIs(mol.SMILES, smiles)
+        self.assertEqual(mol.toInChI(), 'InChI=1S/C2H4/c1-2/h1-2H2')
+
+        # Modify the atoms and bonds directly, without calling methods of the molecule
+        atom1, atom2 = mol.atoms[0], mol.atoms[1]
+        mol.getBond(atom1, atom2).decrementOrder()
+        atom1.incrementRadical()
+        atom2.incrementRadical()
+        mol.multiplicity = 3
+        self.assertEqual(mol.toSMILES(), '[CH2][CH2]')
+        self.assertEqual(mol.toAugmentedInChI(), 'InChI=1S/C2H4/c1-2/h1-2H2/u1,2')
+
+        smiles = mol.toSMILES()
+        mol.clearIdentifiers()
+        self.assertEqual(mol.toSMILES(), smiles)
+        self.assertIsNot(mol.toSMILES(), smiles)
+
     def testLinearMethane(self):
         """
         Test the Molecule.isLinear() method.
@@ -2444,6 +2476,22 @@ multiplicity 2
         result3 = mol3.get_element_count()
         self.assertEqual(expected3, result3)
 
+    def test_get_connectivity_key(self):
+        """Test that the connectivity key ignores electrons but not connectivity."""
+        mol1 = Molecule(SMILES='C=C[CH2]')
+        mol2 = Molecule(SMILES='[CH2]C=C')
+        mol3 = Molecule(SMILES='[CH]1CC1')
+        self.assertEqual(mol1.get_connectivity_key(), mol2.get_connectivity_key())
+        self.assertNotEqual(mol1.get_connectivity_key(), mol3.get_connectivity_key())
+
+        # Resonance structures share the same key
+        for mol in Molecule(SMILES='C=CC=C[CH]C').generate_resonance_structures():
+            self.assertEqual(mol.get_connectivity_key(), Molecule(SMILES='C=CC=C[CH]C').get_connectivity_key())
+
+        # Isomers with the same formula have different keys
+        self.assertNotEqual(Molecule(SMILES='CCCC').get_connectivity_key(),
+                            Molecule(SMILES='CC(C)C').get_connectivity_key())
+
     def testRingPerception(self):
         """Test that identifying ring membership of atoms works properly."""
         mol = Molecule(SMILES='c12ccccc1cccc2')
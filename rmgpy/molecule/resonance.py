@@ -55,6 +55,7 @@ Currently supported resonance types:
 import cython
 import logging
 import itertools
+from collections import OrderedDict
 
 from .graph import Vertex, Edge, Graph, getVertexConnectivityValue
 from .molecule import Atom, Bond, Molecule
@@ -64,6 +65,17 @@ from rmgpy.exceptions import ILPSolutionError, KekulizationError, AtomTypeError,
 import rmgpy.molecule.filtration as filtration
 from rmgpy.molecule.adjlist import Saturator
 
+# A process-wide cache of the resonance structures of cyclic molecules, whose
+# generation involves aromaticity perception and the Clar optimization. The
+# keys are computed by _get_resonance_cache_key() and the values are lists of
+# (reference, structures, input index) tuples of FrozenMolecule objects, in
+# order of least recent use. The cache of the master process is copied to the
+# worker processes when they are created.
+_resonance_cache = OrderedDict()
+_resonance_cache_size = 10000
+_resonance_cache_hits = 0
+_resonance_cache_misses = 0
+
 
 def populate_resonance_algorithms(features=None):
     """
@@ -170,8 +182,11 @@ def generate_resonance_structures(mol, clar_structures=True, keep_isomorphic=Fal
       All are kept regardless of aromaticity because the radical is more likely to delocalize into the ring.
     - Stable polycyclic aromatic species: Clar structures are generated
     - Stable monocyclic aromatic species: Kekule structures are generated
+
+    The structures generated for cyclic molecules are cached, so the structures of a molecule that is isomorphic to
+    a cached one are obtained by mapping the cached structures onto its atoms (see :func:`set_resonance_cache_size`).
     """
-    cython.declare(mol_list=list, new_mol_list=list, features=dict, method_list=list)
+    cython.declare(mol_list=list, new_mol_list=list, features=dict, method_list=list, cache_key=tuple)
 
     # Check that mol is a valid structure in terms of atomTypes and net charge. Since SMILES with hypervalance
     # heteroatoms are not always read correctly, print a suggestion to input the structure using an adjList.
@@ -192,6 +207,13 @@ def generate_resonance_structures(mol, clar_structures=True, keep_isomorphic=Fal
         raise ResonanceError('Can only generate resonance structures for reactive molecules! Got the following unreactive'
                          ' structure:\n{0}Reactive = {1}'.format(mol.toAdjacencyList(),mol.reactive))
 
+    cache_key = None
+    if _resonance_cache_size > 0 and mol.isCyclic():
+        cache_key = _get_resonance_cache_key(mol, clar_structures, keep_isomorphic, filter_structures)
+        mol_list = _get_cached_resonance_structures(mol, cache_key)
+        if mol_list is not None:
+            return mol_list
+
     mol_list = [mol]
 
     # Analyze molecule
@@ -237,11 +259,162 @@ def generate_resonance_structures(mol, clar_structures=True, keep_isomorphic=Fal
                                    filter_structures=filter_structures)
 
     if filter_structures:
-        return filtration.filter_structures(mol_list, features=features)
+        mol_list = filtration.filter_structures(mol_list, features=features)
+
+    if cache_key is not None:
+        _cache_resonance_structures(mol, cache_key, mol_list)
 
     return mol_list
 
 
+def _get_resonance_cache_key(mol, clar_structures, keep_isomorphic, filter_structures):
+    """
+    Return a key of the resonance structure cache for the molecule `mol` and
+    the given options of :func:`generate_resonance_structures`. The key does
+    not depend on the order of the atoms. It combines the multiplicity and the
+    sorted atom labels obtained by iteratively refining the atom invariants
+    (element, radical electrons, lone pairs and charge) over the bonds, such
+    that isomorphic molecules have equal keys.
+    """
+    cython.declare(atom=Atom, labels=dict, new_labels=dict, num_classes=cython.int, new_num_classes=cython.int,
+                   i=cython.int)
+    labels = {}
+    for atom in mol.vertices:
+        labels[atom] = hash((atom.element.number, atom.element.isotope, atom.radicalElectrons, atom.lonePairs,
+                             atom.charge))
+    num_classes = len(set(labels.itervalues()))
+    for i in xrange(len(mol.vertices)):
+        new_labels = {}
+        for atom in mol.vertices:
+            new_labels[atom] = hash((labels[atom], tuple(sorted([(bond.order, labels[neighbor])
+                                                                 for neighbor, bond in atom.edges.iteritems()]))))
+        labels = new_labels
+        new_num_classes = len(set(labels.itervalues()))
+        if new_num_classes == num_classes:
+            break
+        num_classes = new_num_classes
+    return (clar_structures, keep_isomorphic, filter_structures, mol.multiplicity,
+            tuple(sorted(labels.itervalues())))
+
+
+def _get_cached_resonance_structures(mol, key):
+    """
+    Return the cached resonance structures of the molecule `mol` with the
+    cache key `key`, or ``None`` if they are not cached. The cached structures
+    are mapped onto copies of the atoms of `mol`, and `mol` itself is returned
+    in place of the cached input structure, as if the structures had been
+    generated from `mol`.
+    """
+    global _resonance_cache_hits, _resonance_cache_misses
+    cython.declare(mol_list=list, index=dict, order=list, atoms=list)
+    try:
+        entries = _resonance_cache.pop(key)
+    except KeyError:
+        _resonance_cache_misses += 1
+        return None
+    # Mark the entries as the most recently used
+    _resonance_cache[key] = entries
+
+    for reference, structures, input_index in entries:
+        reference_mol = reference.toMolecule()
+        mappings = reference_mol.findIsomorphism(mol, saveOrder=True)
+        if not mappings:
+            continue
+        # The index in `mol` of each atom of the reference structure
+        index = dict([(atom, i) for i, atom in enumerate(mol.vertices)])
+        order = [index[mappings[0][atom]] for atom in reference_mol.vertices]
+        mol_list = []
+        for i, structure in enumerate(structures):
+            if i == input_index:
+                mol.reactive = structure.reactive
+                mol_list.append(mol)
+                continue
+            new_mol = structure.toMolecule([mol.vertices[j] for j in order])
+            atoms = [None] * len(order)
+            for k, j in enumerate(order):
+                atoms[j] = new_mol.vertices[k]
+            new_mol.vertices = atoms
+            mol_list.append(new_mol)
+        _resonance_cache_hits += 1
+        return mol_list
+
+    _resonance_cache_misses += 1
+    return None
+
+
+def _cache_resonance_structures(mol, key, mol_list):
+    """
+    Store the resonance structures `mol_list` generated from the molecule
+    `mol` in the cache with the key `key`. Nothing is stored if the atoms of
+    the structures do not correspond one to one to the atoms of `mol`.
+    """
+    from .frozen import FrozenMolecule
+    cython.declare(structures=list, input_index=cython.int, i=cython.int)
+    reference = FrozenMolecule.fromMolecule(mol)
+    structures = []
+    input_index = -1
+    for i, new_mol in enumerate(mol_list):
+        if new_mol is mol:
+            input_index = i
+        structure = FrozenMolecule.fromMolecule(new_mol)
+        if not reference.hasSameSkeleton(structure):
+            return
+        structures.append(structure)
+    _resonance_cache.setdefault(key, []).append((reference, structures, input_index))
+    while len(_resonance_cache) > _resonance_cache_size:
+        _resonance_cache.popitem(last=False)
+
+
+def set_resonance_cache_size(size):
+    """
+    Set the maximum number of keys held in the cache of resonance structures
+    of cyclic molecules, discarding the least recently used entries if
+    needed. A `size` of zero disables the cache.
+    """
+    global _resonance_cache_size
+    _resonance_cache_size = size
+    while len(_resonance_cache) > max(size, 0):
+        _resonance_cache.popitem(last=False)
+
+
+def clear_resonance_cache():
+    """
+    Remove all entries from the cache of resonance structures and reset its
+    statistics.
+    """
+    global _resonance_cache_hits, _resonance_cache_misses
+    _resonance_cache.clear()
+    _resonance_cache_hits = 0
+    _resonance_cache_misses = 0
+
+
+def get_resonance_cache_statistics():
+    """
+    Return the number of keys in the cache of resonance structures and the
+    numbers of cache hits and misses.
+    """
+    return len(_resonance_cache), _resonance_cache_hits, _resonance_cache_misses
+
+
+def get_resonance_cache():
+    """
+    Return the entries of the cache of resonance structures as a picklable
+    list of (key, entries) tuples, e.g. to hand them to worker processes.
+    """
+    return list(_resonance_cache.iteritems())
+
+
+def update_resonance_cache(items):
+    """
+    Add the (key, entries) tuples `items`, as returned by
+    :func:`get_resonance_cache`, to the cache of resonance structures.
+    """
+    for key, entries in items:
+        _resonance_cache[key] = entries
+    while len(_resonance_cache) > _resonance_cache_size:
+        _resonance_cache.popitem(last=False)
+
+
 def _generate_resonance_structures(mol_list, method_list, keep_isomorphic=False, copy=False, filter_structures=True):
     """
     Iteratively generate all resonance structures for a list of starting molecules using the specified methods.
@@ -1419,3 +1419,47 @@ class ClarTest(unittest.TestCase):
 1 X u0 p0 c0 {2,D}
 2 O u0 p2 c0 {1,D}"""))
         self.assertEquals(len(mol_list), 1)
+
+
+class ResonanceCacheTest(unittest.TestCase):
+    """
+    Contains unit tests for the cache of resonance structures.
+    """
+
+    def setUp(self):
+        clear_resonance_cache()
+
+    def tearDown(self):
+        set_resonance_cache_size(10000)
+        clear_resonance_cache()
+
+    def testCachedStructures(self):
+        """Test that cached resonance structures are mapped onto the atoms of an isomorphic molecule"""
+        smiles = 'C1=CC=C2C(C=CC3=CC=CC=C32)=C1'  # Phenanthrene
+        set_resonance_cache_size(0)
+        expected_input = Molecule(SMILES=smiles)
+        expected = generate_resonance_structures(expected_input)
+        self.assertEquals(get_resonance_cache_statistics(), (0, 0, 0))
+
+        set_resonance_cache_size(10000)
+        generate_resonance_structures(Molecule(SMILES=smiles))
+        self.assertEquals(get_resonance_cache_statistics(), (1, 0, 1))
+
+        mol = Molecule(SMILES=smiles)
+        mol.atoms.reverse()
+        mol.assignAtomIDs()
+        ids = [atom.id for atom in mol.atoms]
+        mol_list = generate_resonance_structures(mol)
+        self.assertEquals(get_resonance_cache_statistics(), (1, 1, 1))
+
+        self.assertEquals(len(mol_list), len(expected))
+        for new_mol, expected_mol in zip(mol_list, expected):
+            self.assertTrue(new_mol.isIsomorphic(expected_mol))
+            self.assertEquals(new_mol.reactive, expected_mol.reactive)
+            self.assertEquals([atom.id for atom in new_mol.atoms], ids)
+        self.assertEquals([new_mol is mol for new_mol in mol_list], [new_mol is expected_input for new_mol in expected])
+
+    def testAcyclicNotCached(self):
+        """Test that the resonance structures of acyclic molecules are not cached"""
+        generate_resonance_structures(Molecule(SMILES='C=C[CH2]'))
+        self.assertEquals(get_resonance_cache_statistics(), (0, 0, 0))
@@ -33,6 +33,16 @@ import rmgpy.molecule
 This module provides functionality for estimating the symmetry number of a
 molecule from its chemical graph representation.
 """
+from collections import OrderedDict
+
+# A process-wide cache of symmetry numbers. The keys are computed by
+# _get_symmetry_cache_key() and the values are lists of (structure, symmetry
+# number) tuples, with the structures stored as FrozenMolecule objects, in
+# order of least recent use.
+_symmetry_cache = OrderedDict()
+_symmetry_cache_size = 10000
+_symmetry_cache_hits = 0
+_symmetry_cache_misses = 0
 
 def calculateAtomSymmetryNumber(molecule, atom):
     """
@@ -489,21 +499,125 @@ def calculateSymmetryNumber(molecule):
     """
     Return the symmetry number for the structure. The symmetry number
     includes both external and internal modes.
+
+    The symmetry numbers are cached per structure, so that the symmetry
+    number of a molecule isomorphic to one seen before is not recalculated
+    (see :func:`set_symmetry_cache_size`).
     """
+    if _symmetry_cache_size > 0:
+        key = _get_symmetry_cache_key(molecule)
+        symmetryNumber = _get_cached_symmetry_number(molecule, key)
+        if symmetryNumber > 0:
+            return symmetryNumber
+
     symmetryNumber = 1
 
+    # Each atom and bond of the molecule is checked, so find the cyclic ones only once
+    cyclicAtoms = set(molecule.getAllCyclicVertices())
+    indices = dict([(atom, i) for i, atom in enumerate(molecule.vertices)])
+
     for atom in molecule.vertices:
-        if not molecule.isAtomInCycle(atom):
+        if atom not in cyclicAtoms:
             symmetryNumber *= calculateAtomSymmetryNumber(molecule, atom)
 
     for atom1 in molecule.vertices:
         for atom2 in atom1.edges:
-            if molecule.vertices.index(atom1) < molecule.vertices.index(atom2) and not molecule.isBondInCycle(atom1.edges[atom2]):
+            if indices[atom1] < indices[atom2] and not (atom1 in cyclicAtoms and atom2 in cyclicAtoms
+                                                        and molecule.isBondInCycle(atom1.edges[atom2])):
                 symmetryNumber *= calculateBondSymmetryNumber(molecule, atom1, atom2)
 
     symmetryNumber *= calculateAxisSymmetryNumber(molecule)
 
-    if molecule.isCyclic():
+    if cyclicAtoms:
        symmetryNumber *= calculateCyclicSymmetryNumber(molecule)
 
+    if _symmetry_cache_size > 0:
+        _cache_symmetry_number(molecule, key, symmetryNumber)
+
     return symmetryNumber
+
+
+def _get_symmetry_cache_key(molecule):
+    """
+    Return a key of the symmetry number cache for `molecule` that does not
+    depend on the order of its atoms. It combines the multiplicity and the
+    sorted environments of the atoms, each made of the atom type, radical
+    electrons, lone pairs and charge of the atom and the bond orders to and
+    invariants of its neighbors, such that isomorphic molecules have equal keys.
+    """
+    invariants = {}
+    for atom in molecule.vertices:
+        invariants[atom] = (atom.element.number, atom.element.isotope,
+                            atom.atomType.label if atom.atomType is not None else '',
+                            atom.radicalElectrons, atom.lonePairs, atom.charge)
+    environments = []
+    for atom in molecule.vertices:
+        environments.append(hash((invariants[atom], tuple(sorted([(bond.order, invariants[neighbor])
+                                                                  for neighbor, bond in atom.edges.iteritems()])))))
+    environments.sort()
+    return molecule.multiplicity, tuple(environments)
+
+
+def _get_cached_symmetry_number(molecule, key):
+    """
+    Return the cached symmetry number of a structure isomorphic to `molecule`
+    with the cache key `key`, or zero if there is none.
+    """
+    global _symmetry_cache_hits, _symmetry_cache_misses
+    try:
+        entries = _symmetry_cache.pop(key)
+    except KeyError:
+        _symmetry_cache_misses += 1
+        return 0
+    # Mark the entries as the most recently used
+    _symmetry_cache[key] = entries
+
+    for structure, symmetryNumber in entries:
+        if structure.toMolecule().isIsomorphic(molecule):
+            _symmetry_cache_hits += 1
+            return symmetryNumber
+
+    _symmetry_cache_misses += 1
+    return 0
+
+
+def _cache_symmetry_number(molecule, key, symmetryNumber):
+    """
+    Store the symmetry number `symmetryNumber` of `molecule` in the cache with
+    the key `key`.
+    """
+    from .frozen import FrozenMolecule
+    _symmetry_cache.setdefault(key, []).append((FrozenMolecule.fromMolecule(molecule), symmetryNumber))
+    while len(_symmetry_cache) > _symmetry_cache_size:
+        _symmetry_cache.popitem(last=False)
+
+
+def set_symmetry_cache_size(size):
+    """
+    Set the maximum number of keys held in the cache of symmetry numbers,
+    discarding the least recently used entries if needed. A `size` of zero
+    disables the cache.
+    """
+    global _symmetry_cache_size
+    _symmetry_cache_size = size
+    while len(_symmetry_cache) > max(size, 0):
+        _symmetry_cache.popitem(last=False)
+
+
+def clear_symmetry_cache():
+    """
+    Remove all entries from the cache of symmetry numbers and reset its
+    statistics.
+    """
+    global _symmetry_cache_hits, _symmetry_cache_misses
+    _symmetry_cache.clear()
+    _symmetry_cache_hits = 0
+    _symmetry_cache_misses = 0
+
+
+def get_symmetry_cache_statistics():
+    """
+    Return the number of keys in the cache of symmetry numbers and the numbers
+    of cache hits and misses.
+    """
+    return len(_symmetry_cache), _symmetry_cache_hits, _symmetry_cache_misses
@@ -33,6 +33,8 @@ from external.wip import work_in_progress
 
 from rmgpy.molecule.molecule import Molecule
 from rmgpy.molecule.symmetry import calculateAtomSymmetryNumber, calculateAxisSymmetryNumber, calculateBondSymmetryNumber, calculateCyclicSymmetryNumber, _indistinguishable
+from rmgpy.molecule.symmetry import calculateSymmetryNumber, set_symmetry_cache_size, clear_symmetry_cache, \
+    get_symmetry_cache_statistics
 from rmgpy.species import Species
 from rmgpy.molecule.resonance import generate_optimal_aromatic_resonance_structures
 ################################################################################
@@ -734,6 +736,27 @@ multiplicity 3
         # O is different from H
         self.assertFalse(_indistinguishable(mol.atoms[6], mol.atoms[7]))
 
+    def testSymmetryNumberCache(self):
+        """
+        Test that cached symmetry numbers are only reused for isomorphic
+        structures and equal the calculated ones.
+        """
+        smiles = ['CC', 'C=C=C', 'CC(C)(C)C', 'C1CC1', 'C1=CC=CC=C1', '[CH2]C=C', 'CC(C)O', 'CCCO', 'C[C](C)C']
+        set_symmetry_cache_size(0)
+        expected = [calculateSymmetryNumber(Molecule().fromSMILES(s)) for s in smiles]
+        set_symmetry_cache_size(10000)
+        try:
+            clear_symmetry_cache()
+            self.assertEqual([calculateSymmetryNumber(Molecule().fromSMILES(s)) for s in smiles], expected)
+            self.assertEqual(get_symmetry_cache_statistics(), (len(smiles), 0, len(smiles)))
+            for s, symmetryNumber in zip(smiles, expected):
+                mol = Molecule().fromSMILES(s)
+                mol.atoms.reverse()
+                self.assertEqual(calculateSymmetryNumber(mol), symmetryNumber)
+            self.assertEqual(get_symmetry_cache_statistics()[1], len(smiles))
+        finally:
+            clear_symmetry_cache()
+
 
 ################################################################################
 
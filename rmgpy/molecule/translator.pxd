@@ -43,6 +43,8 @@ cpdef str toSMARTS(mm.Molecule mol, backend=?)
 
 cpdef str toSMILES(mm.Molecule mol, backend=?)
 
+cpdef list toInChI_many(list mols, int aug_level=?)
+
 cpdef mm.Molecule fromInChI(mm.Molecule mol, str inchistr, backend=?)
 
 cpdef mm.Molecule fromSMILES(mm.Molecule mol, str smilesstr, str backend=?)
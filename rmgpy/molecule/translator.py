@@ -52,7 +52,7 @@ import rmgpy.molecule.molecule as mm
 import rmgpy.molecule.util as util
 
 from rmgpy.exceptions import DependencyError
-from rmgpy.molecule.converter import toRDKitMol, fromRDKitMol, toOBMol, fromOBMol
+from rmgpy.molecule.converter import toRDKitMol, toRDKitMol_many, fromRDKitMol, toOBMol, fromOBMol
 
 # constants
 
@@ -254,6 +254,89 @@ def toSMILES(mol, backend='default'):
         return output
 
 
+def toInChI_many(mols, aug_level=0):
+    """
+    Return a list of the InChI strings of the molecules in `mols`, as given
+    by :meth:`Molecule.toInChI` (for `aug_level` 0) or
+    :meth:`Molecule.toAugmentedInChI` (for `aug_level` 2), which cache them
+    on the molecules.
+
+    The molecules without a cached InChI are converted to RDKit molecules
+    together by :func:`toRDKitMol_many`, which shares the RDKit atoms among
+    them. The molecules that RDKit cannot convert are converted one at a time
+    with the other backends, as by :func:`toInChI`.
+    """
+    cython.declare(pending=list, seen=set, inchis=dict, output=list)
+    if aug_level == 0:
+        identifierTypes = ('InChI',)
+    elif aug_level == 2:
+        identifierTypes = ('InChI', 'AugmentedInChI')
+    else:
+        raise ValueError("Implemented values for aug_level are 0 or 2.")
+
+    pending = []
+    seen = set()
+    for mol in mols:
+        if id(mol) not in seen and mol.atoms and not any([mol._hasIdentifier(t) for t in identifierTypes]):
+            pending.append(mol)
+        seen.add(id(mol))
+    inchis = _rdkit_inchi_many(pending)
+
+    if aug_level == 0:
+        output = [mol._getIdentifier('InChI', _batched_inchi, inchis) for mol in mols]
+    else:
+        output = [mol._getIdentifier('AugmentedInChI', _batched_augmented_inchi, inchis) for mol in mols]
+    return output
+
+
+def _rdkit_inchi_many(mols):
+    """
+    Return a dictionary of the InChI strings of the molecules in `mols`
+    that RDKit could convert, keyed by the id of the molecule.
+    """
+    cython.declare(inchis=dict)
+    inchis = {}
+    if not mols or not Chem.inchi.INCHI_AVAILABLE:
+        return inchis
+    try:
+        rdkitmols = toRDKitMol_many(mols, sanitize=True)
+    except ValueError:
+        # Leave all of the molecules to the per-molecule conversion
+        return inchis
+    for mol, rdkitmol in zip(mols, rdkitmols):
+        try:
+            output = Chem.inchi.MolToInchi(rdkitmol, options='-SNon')
+        except ValueError:
+            continue
+        if _check_output(mol, output):
+            inchis[id(mol)] = output
+    return inchis
+
+
+def _batched_inchi(mol, inchis):
+    """
+    Return the InChI of `mol` from the batch results `inchis`, or generate
+    it with :func:`toInChI` if RDKit could not convert the molecule.
+    """
+    try:
+        return inchis[id(mol)]
+    except KeyError:
+        return toInChI(mol)
+
+
+def _batched_augmented_inchi(mol, inchis):
+    """
+    Return the augmented InChI of `mol`, as :func:`toInChI` does for
+    `aug_level` 2, using the InChI from the batch results `inchis`.
+    """
+    cython.declare(inchi=str, ulayer=str, player=str)
+    inchi = mol._getIdentifier('InChI', _batched_inchi, inchis)
+
+    ulayer, player = inchiutil.create_augmented_layers(mol)
+
+    return inchiutil.compose_aug_inchi(inchi, ulayer, player)
+
+
 def fromInChI(mol, inchistr, backend='try-all'):
     """
     Convert an InChI string `inchistr` to a molecular structure. Uses
@@ -356,7 +439,7 @@ def _rdkit_translator(input_object, identifier_type, mol=None):
         if identifier_type == 'inchi':
             output = Chem.inchi.MolToInchi(rdkitmol, options='-SNon')
         elif identifier_type == 'inchikey':
-            inchi = toInChI(input_object)
+            inchi = input_object.toInChI()
             output = Chem.inchi.InchiToInchiKey(inchi)
         elif identifier_type == 'sma':
             output = Chem.MolToSmarts(rdkitmol)
@@ -53,6 +53,23 @@ class TranslatorTest(unittest.TestCase):
         self.assertEqual(mol.toSMILES(), '')
         self.assertEqual(mol.toInChI(), '')
 
+    def test_many(self):
+        """Test that InChIs can be generated for a list of molecules at once."""
+        smiles = ['CCO', 'C=C[CH2]', 'CN', 'C=CC=C[CH2]']
+        expected = [toInChI(Molecule(SMILES=smi)) for smi in smiles]
+        expectedAug = [toInChI(Molecule(SMILES=smi), aug_level=2) for smi in smiles]
+
+        mols = [Molecule(SMILES=smi) for smi in smiles]
+        mols[0].toInChI()
+        self.assertFalse(mols[1]._hasIdentifier('InChI'))
+        self.assertEqual(toInChI_many(mols + [mols[1], Molecule()]), expected + [expected[1], ''])
+        self.assertTrue(all([mol._hasIdentifier('InChI') for mol in mols]))
+
+        mols = [Molecule(SMILES=smi) for smi in smiles]
+        self.assertEqual(toInChI_many(mols, aug_level=2), expectedAug)
+        self.assertEqual([mol.toAugmentedInChI() for mol in mols], expectedAug)
+        self.assertRaises(ValueError, toInChI_many, mols, aug_level=1)
+
 
 class InChIGenerationTest(unittest.TestCase):
     def compare(self, adjlist, aug_inchi):
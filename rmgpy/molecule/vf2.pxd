@@ -40,6 +40,10 @@ cdef class VF2:
     
     cdef bint isMatch
     cdef list mappingList
+
+    cdef public bint pruneCandidates
+    cdef public long pairsExplored
+    cdef public long pairsPruned
     
     cpdef bint isIsomorphic(self, Graph graph1, Graph graph2, dict initialMapping, bint saveOrder=?, bint strict=?) except -2
         
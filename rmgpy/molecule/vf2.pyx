@@ -40,10 +40,20 @@ cdef class VF2:
     """
     An implementation of the second version of the Vento-Foggia (VF2) algorithm
     for graph and subgraph isomorphism.
+
+    Before checking the feasibility of a candidate pair of vertices, pairs
+    that cannot match are rejected using the vertex invariants (see
+    :meth:`Vertex.getInvariant`) for isomorphism, or the vertex degrees for
+    subgraph isomorphism, if `pruneCandidates` is ``True``. The numbers of
+    candidate pairs checked for feasibility and of rejected candidate pairs
+    are counted in `pairsExplored` and `pairsPruned`.
     """
     def __init__(self, graphA = None, graphB = None):
         self.graph1 = graphA
         self.graph2 = graphB
+        self.pruneCandidates = True
+        self.pairsExplored = 0
+        self.pairsPruned = 0
 
     @property
     def graphA(self):
@@ -109,6 +119,7 @@ cdef class VF2:
         the first is found.
         """
         cdef int callDepth, index1, index2
+        cdef Vertex vertex1, vertex2
         
         if self.graph1 is not graph1:
             self.graph1 = graph1
@@ -155,6 +166,12 @@ cdef class VF2:
         for vertex2 in graph2.vertices:
             vertex2.mapping = None
             vertex2.terminal = False
+        # Compute the invariants used to reject candidate pairs
+        if self.pruneCandidates and not self.subgraph:
+            for vertex1 in graph1.vertices:
+                vertex1.invariant = vertex1.getInvariant(strict)
+            for vertex2 in graph2.vertices:
+                vertex2.invariant = vertex2.getInvariant(strict)
         # Set the initial mapping if provided
         if self.initialMapping is not None:
             for vertex1, vertex2 in self.initialMapping.items():
@@ -250,6 +267,16 @@ cdef class VF2:
             # Otherwise take any node that is not already matched
             if vertex1.mapping is not None:
                 continue
+            # Reject pairs that cannot match without checking feasibility
+            if self.pruneCandidates:
+                if self.subgraph:
+                    if len(vertex1.edges) < len(vertex2.edges):
+                        self.pairsPruned += 1
+                        continue
+                elif vertex1.invariant != vertex2.invariant:
+                    self.pairsPruned += 1
+                    continue
+            self.pairsExplored += 1
             # Propose a pairing
             if self.feasible(vertex1, vertex2):
                 # Add proposed match to mapping
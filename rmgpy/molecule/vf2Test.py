@@ -31,6 +31,7 @@
 import unittest
 from numpy import testing
 
+from rmgpy.molecule.group import Group
 from rmgpy.molecule.molecule import Molecule
 from rmgpy.molecule.vf2 import VF2
 from rmgpy.molecule.graph import getVertexConnectivityValue
@@ -90,6 +91,35 @@ class TestVF2(unittest.TestCase):
             self.assertIsNone(atom.mapping)
             self.assertFalse(atom.terminal)
 
+    def test_candidate_pruning(self):
+        """Test that rejecting candidate pairs by vertex invariants does not change the results"""
+        mol1 = Molecule().fromSMILES('CCC(C)(C)CC(=O)OCC=C')
+        mol2 = mol1.copy(deep=True)
+        mol2.atoms.reverse()
+        mol3 = Molecule().fromSMILES('CCC(C)(C)CC(=O)OC=CC')
+        group = Group().fromAdjacencyList("""
+        1 C u0 {2,D}
+        2 O u0 {1,D}
+        """)
+
+        results = {}
+        for prune in [False, True]:
+            self.vf2.pruneCandidates = prune
+            self.vf2.pairsExplored = self.vf2.pairsPruned = 0
+            results[prune] = [self.vf2.isIsomorphic(mol1, mol2, None),
+                              self.vf2.isIsomorphic(mol1, mol3, None),
+                              self.vf2.isIsomorphic(mol1, mol3, None, strict=False),
+                              self.vf2.isSubgraphIsomorphic(mol1, group, None),
+                              len(self.vf2.findIsomorphism(mol1, mol2, None))]
+            if prune:
+                self.assertGreater(self.vf2.pairsPruned, 0)
+                self.assertLess(self.vf2.pairsExplored, pairsExplored)
+            else:
+                self.assertEqual(self.vf2.pairsPruned, 0)
+                pairsExplored = self.vf2.pairsExplored
+        self.assertEqual(results[True], results[False])
+        self.assertEqual(results[True][:4], [True, False, True, True])
+
 ################################################################################
 
 if __name__ == '__main__':
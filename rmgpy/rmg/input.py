@@ -620,7 +620,8 @@ def pressureDependence(
 
 def options(name='Seed', generateSeedEachIteration=False, saveSeedToDatabase=False, units='si', saveRestartPeriod=None, 
             generateOutputHTML=False, generatePlots=False, saveSimulationProfiles=False, verboseComments=False, 
-            saveEdgeSpecies=False, keepIrreversible=False, trimolecularProductReversible=True, wallTime='00:00:00:00'):
+            saveEdgeSpecies=False, keepIrreversible=False, trimolecularProductReversible=True, wallTime='00:00:00:00',
+            thermoCache=None, lazyResonance=False):
     rmg.name = name
     rmg.generateSeedEachIteration=generateSeedEachIteration
     rmg.saveSeedToDatabase=saveSeedToDatabase
@@ -638,6 +639,8 @@ def options(name='Seed', generateSeedEachIteration=False, saveSeedToDatabase=Fal
     rmg.keepIrreversible = keepIrreversible
     rmg.trimolecularProductReversible = trimolecularProductReversible
     rmg.wallTime = wallTime
+    rmg.thermoCache = os.path.expandvars(os.path.expanduser(thermoCache)) if thermoCache else None
+    rmg.lazyResonance = lazyResonance
 
 def generatedSpeciesConstraints(**kwargs):
 
@@ -987,6 +990,10 @@ def saveInputFile(path, rmg):
     f.write('    trimolecularProductReversible = {0},\n'.format(rmg.trimolecularProductReversible))
     f.write('    verboseComments = {0},\n'.format(rmg.verboseComments))
     f.write('    wallTime = {0},\n'.format(rmg.wallTime))
+    if rmg.thermoCache:
+        f.write('    thermoCache = {0!r},\n'.format(rmg.thermoCache))
+    if rmg.lazyResonance:
+        f.write('    lazyResonance = True,\n')
     f.write(')\n\n')
     
     f.close()
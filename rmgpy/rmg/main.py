@@ -66,6 +66,12 @@ from rmgpy import settings
 from rmgpy.kinetics.diffusionLimited import diffusionLimiter
 
 from model import Species, CoreEdgeReactionModel
+from rmgpy.rmg.react import close_pool
+from rmgpy.molecule.resonance import get_resonance_cache_statistics
+from rmgpy.molecule.symmetry import get_symmetry_cache_statistics
+from rmgpy.thermo import thermoengine
+from rmgpy.thermo.thermoengine import setThermoCache
+from rmgpy.thermo.thermocache import ThermoCache, getThermoDatabaseFingerprint
 from rmgpy.reaction import Reaction
 from pdep import PDepNetwork
 import rmgpy.util as util
@@ -138,6 +144,8 @@ class RMG(util.Subject):
     `ml_settings`                       Settings for ML estimation
     `wallTime`                          The maximum amount of CPU time in the form DD:HH:MM:SS to expend on this job; used to stop gracefully so we can still get profiling information
     `kineticsdatastore`                 ``True`` if storing details of each kinetic database entry in text file, ``False`` otherwise
+    `thermoCache`                       The path of a persistent cache of thermo estimates shared between jobs, or ``None`` for no cache
+    `lazyResonance`                     ``True`` to keep only the representative resonance structure of edge species, ``False`` otherwise
     ----------------------------------- ------------------------------------------------
     `initializationTime`                The time at which the job was initiated, in seconds since the epoch (i.e. from time.time())
     `done`                              Whether the job has completed (there is nothing new to add)
@@ -214,6 +222,8 @@ class RMG(util.Subject):
         self.wallTime = '00:00:00:00'
         self.initializationTime = 0
         self.kineticsdatastore = None
+        self.thermoCache = None
+        self.lazyResonance = None
         
         self.name = 'Seed'
         self.generateSeedEachIteration = True
@@ -247,6 +257,7 @@ class RMG(util.Subject):
 
         self.reactionModel.verboseComments = self.verboseComments
         self.reactionModel.saveEdgeSpecies = self.saveEdgeSpecies
+        self.reactionModel.lazyResonance = bool(self.lazyResonance)
         
         if self.quantumMechanics:
             self.reactionModel.quantumMechanics = self.quantumMechanics
@@ -409,6 +420,23 @@ class RMG(util.Subject):
             for family in self.database.kinetics.families.values():
                 family.fillKineticsRulesByAveragingUp(verbose=self.verboseComments)
     
+    def initializeThermoCache(self):
+        """
+        Open the persistent thermo cache at `thermoCache` for the loaded thermo
+        database. The cache is not used when thermo is calculated with quantum
+        mechanics, estimated with machine learning or shared through the thermo
+        central database, since those estimates do not depend only on the
+        thermo database.
+        """
+        if self.quantumMechanics or self.ml_estimator or self.thermoCentralDatabase:
+            logging.warning('The thermo cache cannot be used with quantum mechanics, machine learning or the thermo '
+                            'central database; not using the thermo cache.')
+            return
+        fingerprint = getThermoDatabaseFingerprint(self.database.thermo,
+                                                   self.database.solvation if self.solvent else None)
+        setThermoCache(ThermoCache(self.thermoCache, fingerprint))
+        logging.info('Using the thermo cache {0} for thermo database {1}'.format(self.thermoCache, fingerprint))
+
     def initialize(self, **kwargs):
         """
         Initialize an RMG job using the command-line arguments `args` as returned
@@ -469,6 +497,10 @@ class RMG(util.Subject):
         # Load databases
         self.loadDatabase()
 
+        # Reuse the thermo estimated by earlier jobs with the same database
+        if self.thermoCache:
+            self.initializeThermoCache()
+
         # Set trimolecular reactant flags of reaction systems
         if self.trimolecular:
             for reactionSystem in self.reactionSystems:
@@ -1397,6 +1429,25 @@ class RMG(util.Subject):
         """
         Complete the model generation.
         """
+        # Shut down the worker processes used for reaction generation
+        close_pool()
+
+        # Close the thermo cache
+        if thermoengine.thermoCache is not None:
+            cache = thermoengine.thermoCache
+            logging.info('Found the thermo of {0:d} of {1:d} species in the thermo cache'.format(
+                cache.hits, cache.hits + cache.misses))
+            setThermoCache(None)
+
+        size, hits, misses = get_resonance_cache_statistics()
+        if hits + misses:
+            logging.info('Found the resonance structures of {0:d} of {1:d} cyclic molecules in the resonance '
+                         'structure cache of {2:d} molecules'.format(hits, hits + misses, size))
+        size, hits, misses = get_symmetry_cache_statistics()
+        if hits + misses:
+            logging.info('Found the symmetry numbers of {0:d} of {1:d} molecules in the symmetry number cache of '
+                         '{2:d} molecules'.format(hits, hits + misses, size))
+
         # Print neural network-generated quote
         import datetime
         import textwrap
@@ -1520,20 +1571,18 @@ class RMG(util.Subject):
             # Update each affected reaction to point to that new family
             # Also use that new family in a duplicate reactionDict
             reactionDict[family_label] = {}
-            for reactant1 in self.reactionModel.reactionDict[family0_label]:
-                reactionDict[family_label][reactant1] = {}
-                for reactant2 in self.reactionModel.reactionDict[family0_label][reactant1]:
-                    reactionDict[family_label][reactant1][reactant2] = []
-                    if isinstance(family0_obj, KineticsLibrary):
-                        for rxn in self.reactionModel.reactionDict[family0_label][reactant1][reactant2]:
-                            assert isinstance(rxn, LibraryReaction)
-                            rxn.library = family_label
-                            reactionDict[family_label][reactant1][reactant2].append(rxn)
-                    elif isinstance(family0_obj, KineticsFamily):
-                        for rxn in self.reactionModel.reactionDict[family0_label][reactant1][reactant2]:
-                            assert isinstance(rxn, TemplateReaction)
-                            rxn.family_label = family_label
-                            reactionDict[family_label][reactant1][reactant2].append(rxn)
+            for key, rxnList in self.reactionModel.reactionDict[family0_label].iteritems():
+                reactionDict[family_label][key] = []
+                if isinstance(family0_obj, KineticsLibrary):
+                    for rxn in rxnList:
+                        assert isinstance(rxn, LibraryReaction)
+                        rxn.library = family_label
+                        reactionDict[family_label][key].append(rxn)
+                elif isinstance(family0_obj, KineticsFamily):
+                    for rxn in rxnList:
+                        assert isinstance(rxn, TemplateReaction)
+                        rxn.family_label = family_label
+                        reactionDict[family_label][key].append(rxn)
         
         self.reactionModel.reactionDict = reactionDict
     
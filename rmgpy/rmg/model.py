@@ -50,7 +50,7 @@ from rmgpy.constraints import failsSpeciesConstraints
 from rmgpy.quantity import Quantity
 from rmgpy.species import Species
 from rmgpy.molecule.molecule import Molecule
-from rmgpy.thermo.thermoengine import submit
+from rmgpy.thermo.thermoengine import submit, submit_many
 from rmgpy.reaction import Reaction
 from rmgpy.exceptions import ForbiddenStructureException
 from rmgpy.data.kinetics.depository import DepositoryReaction
@@ -62,7 +62,7 @@ from rmgpy.kinetics import KineticsData, Arrhenius
 from rmgpy.data.rmg import getDB
         
 import rmgpy.data.rmg
-from .react import react_all
+from .react import react_all, ReactedCombinations
 from rmgpy.data.kinetics.common import ensure_independent_atom_ids, find_degenerate_reactions
 
 from pdep import PDepReaction, PDepNetwork
@@ -181,6 +181,13 @@ class CoreEdgeReactionModel:
     `networkList`              A list of pressure-dependent reaction networks (:class:`Network` objects)
     `networkCount`             A counter for the number of pressure-dependent networks created
     `indexSpeciesDict`         A dictionary with a unique index pointing to the species objects
+    `speciesDict`              A dictionary of all species generated so far, indexed by formula
+    `speciesKeyDict`           A dictionary of all species generated so far, indexed by connectivity key
+    `reactionDict`             A dictionary of all reactions generated so far, indexed by family and reactant/product keys
+    `reactionIndexHits`        The number of lookups in `reactionDict` which found registered reactions
+    `reactionIndexMisses`      The number of lookups in `reactionDict` which found no registered reaction
+    `reactedCombinations`      The combinations of core species that have already been reacted to form the edge
+    `lazyResonance`            ``True`` to keep only the representative resonance structure of edge species once the kinetics of their reactions are known
     `solventName`              String describing solvent name for liquid reactions. Empty for non-liquid estimation
     `surfaceSiteDensity`       The surface site density (a SurfaceConcentration quantity) or None if no heterogeneous catalyst.
     =========================  ==============================================================
@@ -209,8 +216,12 @@ class CoreEdgeReactionModel:
         self.networkList = []
         self.networkCount = 0
         self.speciesDict = {}
+        self.speciesKeyDict = {}
         self.reactionDict = {}
-        self.speciesCache = [None for i in range(4)]
+        self.reactionIndexHits = 0
+        self.reactionIndexMisses = 0
+        self.reactedCombinations = ReactedCombinations()
+        self.lazyResonance = False
         self.speciesCounter = 0
         self.reactionCounter = 0
         self.newSpeciesList = []
@@ -246,32 +257,44 @@ class CoreEdgeReactionModel:
         isomorphism without consideration of electrons. Therefore, resonance
         structures of a species will all match each other.
 
+        Candidates are retrieved from :attr:`speciesKeyDict` using the
+        connectivity key of `molecule`, so that the isomorphism check is only
+        needed to discriminate between species sharing the same key.
+
         Returns the matched species if found and `None` otherwise.
         """
-
-        # First check cache and return if species is found
-        for i, spec in enumerate(self.speciesCache):
-            if spec is not None and spec.isIsomorphic(molecule, strict=False):
-                self.speciesCache.pop(i)
-                self.speciesCache.insert(0, spec)
-                return spec
-
-        # If not found in cache, check all species with matching formula
-        formula = molecule.getFormula()
         try:
-            species_list = self.speciesDict[formula]
+            species_list = self.speciesKeyDict[molecule.get_connectivity_key()]
         except KeyError:
             pass
         else:
             for spec in species_list:
                 if spec.isIsomorphic(molecule, strict=False):
-                    self.speciesCache.pop()
-                    self.speciesCache.insert(0, spec)
                     return spec
 
         # At this point we can conclude that the species is new
         return None
 
+    def registerSpecies(self, spec):
+        """
+        Add the species `spec` to the species dictionaries used to check for
+        existing species, which are indexed by formula and by the connectivity
+        key of the species, respectively.
+        """
+        molecule = spec.molecule[0]
+
+        formula = molecule.getFormula()
+        if formula in self.speciesDict:
+            self.speciesDict[formula].append(spec)
+        else:
+            self.speciesDict[formula] = [spec]
+
+        key = molecule.get_connectivity_key()
+        if key in self.speciesKeyDict:
+            self.speciesKeyDict[key].append(spec)
+        else:
+            self.speciesKeyDict[key] = [spec]
+
     def makeNewSpecies(self, object, label='', reactive=True, checkForExisting=True, generateThermo=True):
         """
         Formally create a new species from the specified `object`, which can be
@@ -321,12 +344,7 @@ class CoreEdgeReactionModel:
             spec.label = spec.SMILES
         logging.debug('Creating new species {0}'.format(spec.label))
 
-        formula = molecule.getFormula()
-        if formula in self.speciesDict:
-            self.speciesDict[formula].append(spec)
-        else:
-            self.speciesDict[formula] = [spec]
-
+        self.registerSpecies(spec)
 
         # Since the species is new, add it to the list of new species
         self.newSpeciesList.append(spec)
@@ -342,12 +360,11 @@ class CoreEdgeReactionModel:
         family as `rxn`. Returns :data:`True` or :data:`False` and the matched
         reaction (if found).
 
-        First, a shortlist of reaction is retrieved that have the same reaction keys
-        as the parameter reaction.
-
-        Next, the reaction ID containing an identifier (e.g. label) of the reactants
-        and products is compared between the parameter reaction and the each of the
-        reactions in the shortlist. If a match is found, the discovered reaction is 
+        First, the reactions with the same family, reactant keys and product
+        keys as the parameter reaction are retrieved from the reaction index.
+        For reaction families, the reactions registered in the opposite
+        direction are retrieved as well. If one of them refers to the same
+        species objects as the parameter reaction, the discovered reaction is
         returned.
 
         If a match is not yet found, the Library (seed mechs, reaction libs)
@@ -367,52 +384,36 @@ class CoreEdgeReactionModel:
             return True, None
         
         familyObj = getFamilyLibraryObject(rxn.family)
-        shortlist = self.searchRetrieveReactions(rxn)
-
-        # Now use short-list to check for matches. All should be in same forward direction.
-
-        # Make sure the reactant and product lists are sorted before performing the check
-        rxn_id = generateReactionId(rxn)
-
-        for rxn0 in shortlist:
-            rxn_id0 = generateReactionId(rxn0)
+        family_label, reactantKeys, productKeys = generateReactionKey(rxn)
 
-            if rxn_id == rxn_id0 and areIdenticalSpeciesReferences(rxn, rxn0):
+        # Now use the index to check for matches in the same direction
+        for rxn0 in self.retrieve(family_label, reactantKeys, productKeys):
+            if areIdenticalSpeciesReferences(rxn, rxn0):
                 if isinstance(familyObj, KineticsLibrary) or isinstance(familyObj, KineticsFamily):
                     if not rxn.duplicate:
                         return True, rxn0
                 else:
                     return True, rxn0
-            elif (isinstance(familyObj, KineticsFamily)
-                  and rxn_id == rxn_id0[::-1]
-                  and areIdenticalSpeciesReferences(rxn, rxn0)):
-                if not rxn.duplicate:
+
+        # Families are checked in the opposite direction as well
+        if isinstance(familyObj, KineticsFamily) and not rxn.duplicate:
+            for rxn0 in self.retrieve(family_label, productKeys, reactantKeys):
+                if areIdenticalSpeciesReferences(rxn, rxn0):
                     return True, rxn0
 
         # Now check seed mechanisms
         # We want to check for duplicates in *other* seed mechanisms, but allow
         # duplicated *within* the same seed mechanism
-        _, r1_fwd, r2_fwd = generateReactionKey(rxn)
-        _, r1_rev, r2_rev = generateReactionKey(rxn, useProducts=True)
-
         for library in self.reactionDict:
             libObj = getFamilyLibraryObject(library)
             if isinstance(libObj, KineticsLibrary) and library != rxn.family:
 
-                # First check seed short-list in forward direction                
-                shortlist = self.retrieve(library, r1_fwd, r2_fwd)
-                
-                for rxn0 in shortlist:
-                    rxn_id0 = generateReactionId(rxn0)
-                    if (rxn_id == rxn_id0) or (rxn_id == rxn_id0[::-1]):
-                        if areIdenticalSpeciesReferences(rxn, rxn0):
-                            return True, rxn0
-                
-                # Now get the seed short-list of the reverse reaction
+                # First check the library in the forward direction, then in the reverse direction
+                for rxn0 in self.retrieve(library, reactantKeys, productKeys):
+                    if areIdenticalSpeciesReferences(rxn, rxn0):
+                        return True, rxn0
 
-                shortlist = self.retrieve(library, r1_rev, r2_rev)
-                
-                for rxn0 in shortlist:
+                for rxn0 in self.retrieve(library, productKeys, reactantKeys):
                     if areIdenticalSpeciesReferences(rxn, rxn0):
                         return True, rxn0
 
@@ -601,7 +602,8 @@ class CoreEdgeReactionModel:
         else:
             # We are reacting the edge
             rxns = react_all(self.core.species, numOldCoreSpecies,
-                             unimolecularReact, bimolecularReact, trimolecularReact=trimolecularReact, procnum=procnum)
+                             unimolecularReact, bimolecularReact, trimolecularReact=trimolecularReact, procnum=procnum,
+                             reacted=self.reactedCombinations)
 
             spcs = [self.retrieve_species(rxn) for rxn in rxns]
 
@@ -620,14 +622,18 @@ class CoreEdgeReactionModel:
         if not numpy.isinf(self.toleranceThermoKeepSpeciesInEdge) and self.newSpeciesList != []:
             self.thermoFilterSpecies(self.newSpeciesList)
 
+        # Restore the resonance structures of the edge species reduced in
+        # earlier iterations that take part in the new reactions
+        if self.lazyResonance:
+            self.restoreNewResonanceStructures()
+
         # Generate kinetics of new reactions
         if self.newReactionList:
             logging.info('Generating kinetics for new reactions...')
-        for reaction in self.newReactionList:
-            # If the reaction already has kinetics (e.g. from a library),
-            # assume the kinetics are satisfactory
-            if reaction.kinetics is None:
-                self.applyKineticsToReaction(reaction)
+        # If the reaction already has kinetics (e.g. from a library),
+        # assume the kinetics are satisfactory
+        self.applyKineticsToReactions([reaction for reaction in self.newReactionList if reaction.kinetics is None],
+                                      procnum)
                     
         # For new reactions, convert ArrheniusEP to Arrhenius, and fix barrier heights.
         # self.newReactionList only contains *actually* new reactions, all in the forward direction.
@@ -649,6 +655,11 @@ class CoreEdgeReactionModel:
             # Recalculate k(T,P) values for modified networks
             self.updateUnimolecularReactionNetworks()
             logging.info('')
+
+        # Drop the extra resonance structures of the edge species of the new
+        # reactions now that the kinetics of these reactions are known
+        if self.lazyResonance:
+            self.reduceNewResonanceStructures()
             
         # Check new core and edge reactions for Chemkin duplicates
         # The same duplicate reaction gets brought into the core
@@ -804,7 +815,8 @@ class CoreEdgeReactionModel:
 
     def applyThermoToSpecies(self, procnum):
         """
-        Generate thermo for species. QM calculations are parallelized if requested.
+        Generate thermo for species. QM calculations and the thermo estimates
+        are parallelized if requested.
         """
         from rmgpy.rmg.input import getInput
         quantumMechanics = getInput('quantumMechanics')
@@ -812,9 +824,86 @@ class CoreEdgeReactionModel:
         if quantumMechanics:
             quantumMechanics.runJobs(self.newSpeciesList, procnum=procnum)
 
-        # Serial thermo calculation for other methods
+        # Estimate the thermo of all species at once, which uses the worker pool
+        spcs = [spc for spc in self.newSpeciesList if not spc.thermo]
+        if procnum > 1:
+            submit_many(spcs, self.solventName, procnum)
+
         for spc in self.newSpeciesList:
-            self.generateThermo(spc, rename=True)
+            self.generateThermo(spc)
+
+        # Rename the species found in the thermo libraries, whether their
+        # thermo was estimated serially or on the worker pool
+        for spc in spcs:
+            self.renameFromThermoLibrary(spc)
+
+    def getNewEdgeSpecies(self):
+        """
+        Return the species that are not in the core among the new species and
+        the reactants and products of the new reactions, each of them once.
+        """
+        coreSpecies = set(self.core.species)
+        edgeSpecies = []
+        seen = set()
+        spcs = list(self.newSpeciesList)
+        for rxn in self.newReactionList:
+            spcs.extend(rxn.reactants)
+            spcs.extend(rxn.products)
+        for spc in spcs:
+            if spc not in coreSpecies and spc not in seen:
+                seen.add(spc)
+                edgeSpecies.append(spc)
+        return edgeSpecies
+
+    def restoreNewResonanceStructures(self):
+        """
+        Restore the resonance structures of each species returned by
+        :meth:`getNewEdgeSpecies`, using :meth:`restoreResonanceStructures`.
+        The edge species reduced in earlier iterations are found again when
+        reacting the core, and this must be done before the kinetics of the
+        new reactions are generated for their reactions to match those of the
+        kinetics depositories and training sets.
+        """
+        for spc in self.getNewEdgeSpecies():
+            self.restoreResonanceStructures(spc)
+
+    def reduceNewResonanceStructures(self):
+        """
+        Keep only the representative resonance structure of each species
+        returned by :meth:`getNewEdgeSpecies`, using
+        :meth:`reduceResonanceStructures`.
+        This must not be done before the kinetics of the new reactions are
+        generated and the pressure dependent networks are updated, as the
+        reactions of the kinetics depositories and training sets are only
+        matched if all resonance structures of their species are present.
+        """
+        for spc in self.getNewEdgeSpecies():
+            self.reduceResonanceStructures(spc)
+
+    def reduceResonanceStructures(self, spc):
+        """
+        Keep only the first resonance structure of the edge species `spc`,
+        which is the representative structure chosen when estimating its
+        thermo. The other structures are only needed to generate reactions,
+        and are regenerated by :meth:`restoreResonanceStructures` when the
+        species is added to the core, or by
+        :meth:`Species.generate_resonance_structures` when it is reacted.
+        """
+        if len(spc.molecule) > 1:
+            spc.molecule = spc.molecule[:1]
+
+    def restoreResonanceStructures(self, spc):
+        """
+        Regenerate the full set of resonance structures of the species `spc`
+        if only one structure is stored, keeping the stored structure first.
+        """
+        if len(spc.molecule) == 1:
+            representative = spc.molecule[0]
+            spc.generate_resonance_structures()
+            for index, molecule in enumerate(spc.molecule):
+                if molecule is representative or molecule.isIsomorphic(representative):
+                    spc.molecule.insert(0, spc.molecule.pop(index))
+                    break
 
     def generateThermo(self, spc, rename=False):
         """
@@ -823,20 +912,98 @@ class CoreEdgeReactionModel:
         if not spc.thermo:
             submit(spc, self.solventName)
 
-            if rename and spc.thermo and spc.thermo.label != '':  # check if thermo libraries have a name for it
-                logging.info('Species {0} renamed {1} based on thermo library name'.format(spc.label, spc.thermo.label))
-                spc.label = spc.thermo.label
+            if rename:
+                self.renameFromThermoLibrary(spc)
 
         spc.generateEnergyTransferModel()
 
+    def renameFromThermoLibrary(self, spc):
+        """
+        Rename the species `spc` after the label of its thermo, if the thermo
+        came from a thermo library that has a name for it.
+        """
+        if spc.thermo and spc.thermo.label != '':  # check if thermo libraries have a name for it
+            logging.info('Species {0} renamed {1} based on thermo library name'.format(spc.label, spc.thermo.label))
+            spc.label = spc.thermo.label
+
     def applyKineticsToReaction(self, reaction):
         """
         retrieve the best kinetics for the reaction and apply it towards the forward 
         or reverse direction (if reverse, flip the direaction).
         """
-        from rmgpy.data.rmg import getDB
         # Find the reaction kinetics
         kinetics, source, entry, isForward = self.generateKinetics(reaction)
+        self.setReactionKinetics(reaction, kinetics, isForward)
+
+    def applyKineticsToReactions(self, reactions, procnum=1):
+        """
+        Apply the best kinetics to each of the `reactions`, as
+        :meth:`applyKineticsToReaction` does, using `procnum` processes.
+
+        In parallel, the reactions are grouped by family and template, and
+        each group is handled by a single worker process, so that the rate
+        rule estimate of each template is resolved once per group. The
+        reactions are sent to the workers in compact form, along with their
+        Gibbs free energy of reaction, and the results are applied in the
+        order of `reactions`. They are the same as from the serial generation.
+        """
+        if procnum == 1 or len(reactions) < 2:
+            for reaction in reactions:
+                self.applyKineticsToReaction(reaction)
+            return
+
+        from rmgpy.rmg.react import get_pool, compact_species
+
+        # Only reactions from families should be missing kinetics
+        for reaction in reactions:
+            assert isinstance(reaction, TemplateReaction)
+
+        compact = {}
+        def compact_reactants(species_list):
+            data = []
+            for spc in species_list:
+                try:
+                    data.append(compact[id(spc)])
+                except KeyError:
+                    data.append(compact.setdefault(id(spc), compact_species(spc)))
+            return data
+
+        groups = {}
+        tasks = []
+        for i, reaction in enumerate(reactions):
+            reverse = getattr(reaction, 'reverse', None)
+            if reverse is not None:
+                reverse = (compact_reactants(reverse.reactants), compact_reactants(reverse.products),
+                           reverse.template, reverse.degeneracy)
+            collider = reaction.specificCollider
+            if collider is not None:
+                collider = compact_reactants([collider])[0]
+            task = (i, reaction.family, compact_reactants(reaction.reactants), compact_reactants(reaction.products),
+                    collider, reaction.template, reaction.degeneracy, reverse, reaction.getFreeEnergyOfReaction(298))
+            key = (reaction.family, tuple(reaction.template))
+            try:
+                groups[key].append(task)
+            except KeyError:
+                groups[key] = [task]
+                tasks.append(groups[key])
+
+        results = [None] * len(reactions)
+        payload = [(group, self.kineticsEstimator, self.verboseComments) for group in tasks]
+        chunksize = max(1, len(payload) // (4 * procnum))
+        for group_results in get_pool(procnum).imap_unordered(_generate_compact_kinetics, payload, chunksize):
+            for i, kinetics, isForward in group_results:
+                results[i] = (kinetics, isForward)
+
+        for reaction, (kinetics, isForward) in zip(reactions, results):
+            self.setReactionKinetics(reaction, kinetics, isForward)
+
+    def setReactionKinetics(self, reaction, kinetics, isForward):
+        """
+        Set the `kinetics` generated for the `reaction`, flipping the
+        direction of the reaction if `isForward` is ``False``, i.e. if the
+        kinetics are defined in the reverse direction.
+        """
+        from rmgpy.data.rmg import getDB
         # Flip the reaction direction if the kinetics are defined in the reverse direction
         if not isForward:
             family = getDB('kinetics').families[reaction.family]
@@ -858,93 +1025,10 @@ class CoreEdgeReactionModel:
         # Only reactions from families should be missing kinetics
         assert isinstance(reaction, TemplateReaction)
         
-        family = getFamilyLibraryObject(reaction.family)
-
-        # Get the kinetics for the reaction
-        kinetics, source, entry, isForward = family.getKinetics(reaction, templateLabels=reaction.template, degeneracy=reaction.degeneracy, estimator=self.kineticsEstimator, returnAllKinetics=False)
         # Get the gibbs free energy of reaction at 298 K
         G298 = reaction.getFreeEnergyOfReaction(298)
-        gibbsIsPositive = G298 > -1e-8
-        
-        if family.ownReverse and hasattr(reaction,'reverse'):
-            if reaction.reverse:
-                # The kinetics family is its own reverse, so we could estimate kinetics in either direction
-                
-                # First get the kinetics for the other direction
-                rev_kinetics, rev_source, rev_entry, rev_isForward = family.getKinetics(reaction.reverse, templateLabels=reaction.reverse.template, degeneracy=reaction.reverse.degeneracy, estimator=self.kineticsEstimator, returnAllKinetics=False)
-                # Now decide which direction's kinetics to keep
-                keepReverse = False
-                if (entry is not None and rev_entry is None):
-                    # Only the forward has an entry, meaning an exact match in a depository or template
-                    # the reverse must have used an averaged estimated node - so use forward.
-                    reason = "This direction matched an entry in {0}, the other was just an estimate.".format(reaction.family)
-                elif (entry is None and rev_entry is not None):
-                    # Only the reverse has an entry (see above) - use reverse.
-                    keepReverse = True
-                    reason = "This direction matched an entry in {0}, the other was just an estimate.".format(reaction.family)
-                elif (entry is not None and rev_entry is not None 
-                      and entry is rev_entry):
-                    # Both forward and reverse have the same source and entry
-                    # Use the one for which the kinetics is the forward kinetics
-                    keepReverse = gibbsIsPositive and isForward and rev_isForward
-                    reason = "Both directions matched the same entry in {0}, but this direction is exergonic.".format(reaction.family)
-                elif self.kineticsEstimator == 'group additivity' and (kinetics.comment.find("Fitted to 1 rate")>0
-                      and not rev_kinetics.comment.find("Fitted to 1 rate")>0) :
-                        # forward kinetics were fitted to only 1 rate, but reverse are hopefully better
-                        keepReverse = True
-                        reason = "Other direction matched a group only fitted to 1 rate."
-                elif self.kineticsEstimator == 'group additivity' and (not kinetics.comment.find("Fitted to 1 rate")>0
-                      and rev_kinetics.comment.find("Fitted to 1 rate")>0) :
-                        # reverse kinetics were fitted to only 1 rate, but forward are hopefully better
-                        keepReverse = False
-                        reason = "Other direction matched a group only fitted to 1 rate."
-                elif entry is not None and rev_entry is not None:
-                    # Both directions matched explicit rate rules
-                    # Keep the direction with the lower (but nonzero) rank
-                    if entry.rank < rev_entry.rank and entry.rank != 0:
-                        keepReverse = False
-                        reason = "Both directions matched explicit rate rules, but this direction has a rule with a lower rank ({0} vs {1}).".format(entry.rank, rev_entry.rank)
-                    elif rev_entry.rank < entry.rank and rev_entry.rank != 0:
-                        keepReverse = True
-                        reason = "Both directions matched explicit rate rules, but this direction has a rule with a lower rank ({0} vs {1}).".format(rev_entry.rank, entry.rank)
-                    # Otherwise keep the direction that is exergonic at 298 K
-                    else:
-                        keepReverse = gibbsIsPositive and isForward and rev_isForward
-                        reason = "Both directions matched explicit rate rules, but this direction is exergonic."
-                else:
-                    # Keep the direction that is exergonic at 298 K
-                    # This must be done after the thermo generation step
-                    keepReverse = gibbsIsPositive and isForward and rev_isForward
-                    reason = "Both directions are estimates, but this direction is exergonic."
-
-                if keepReverse:
-                    kinetics = rev_kinetics
-                    source = rev_source
-                    entry = rev_entry
-                    isForward = not rev_isForward
-                    G298 = -G298
-                
-                if self.verboseComments:
-                    kinetics.comment += "\nKinetics were estimated in this direction instead of the reverse because:\n{0}".format(reason)
-                    kinetics.comment += "\ndGrxn(298 K) = {0:.2f} kJ/mol".format( G298 / 1000.)
-            
-        # The comments generated by the database for estimated kinetics can
-        # be quite long, and therefore not very useful
-        # We don't want to waste lots of memory storing these long, 
-        # uninformative strings, so here we replace them with much shorter ones
-        if not self.verboseComments:
-            # Only keep a short comment (to save memory)
-            if 'Exact' in kinetics.comment:
-                # Exact match of rate rule
-                pass
-            elif 'Matched reaction' in kinetics.comment:
-                # Stems from matching a reaction from a depository
-                pass
-            else:
-                # Estimated (averaged) rate rule
-                kinetics.comment =  kinetics.comment[kinetics.comment.find('Estimated'):]
-                
-        return kinetics, source, entry, isForward
+
+        return generateReactionKinetics(reaction, G298, self.kineticsEstimator, self.verboseComments)
     
     def printEnlargeSummary(self, newCoreSpecies, newCoreReactions, newEdgeSpecies, newEdgeReactions, reactionsMovedFromEdge=None, reactEdge=False):
         """
@@ -995,6 +1079,12 @@ class CoreEdgeReactionModel:
         logging.info('    The model core has {0:d} species and {1:d} reactions'.format(coreSpeciesCount, coreReactionCount))
         logging.info('    The model edge has {0:d} species and {1:d} reactions'.format(edgeSpeciesCount, edgeReactionCount))
         logging.info('')
+        logging.debug('Reaction index lookups so far: {0:d} hits, {1:d} misses'.format(self.reactionIndexHits, self.reactionIndexMisses))
+        for family in getDB('kinetics').families.itervalues():
+            hitRate = family.getMatchCacheHitRate()
+            if hitRate is not None:
+                logging.debug('Template match cache for {0}: {1:d} hits, {2:d} misses ({3:.0%} hit rate)'.format(
+                    family.label, family.matchCacheHits, family.matchCacheMisses, hitRate))
 
     def addSpeciesToCore(self, spec):
         """
@@ -1022,6 +1112,9 @@ class CoreEdgeReactionModel:
         
         # Add the species to the core
         self.core.species.append(spec)
+
+        if self.lazyResonance:
+            self.restoreResonanceStructures(spec)
         
         rxnList = []
         if spec in self.edge.species:
@@ -1302,29 +1395,27 @@ class CoreEdgeReactionModel:
                     # Recompute the isomers, reactants, and products for this network
                     network.updateConfigurations(self)
 
-        # Remove from the global list of reactions
-        # also remove it from the global list of reactions
-        for family in self.reactionDict:
-            if spec in self.reactionDict[family]:
-                del self.reactionDict[family][spec]
-            for reactant1 in self.reactionDict[family]:
-                if spec in self.reactionDict[family][reactant1]:
-                    del self.reactionDict[family][reactant1][spec]
-            for reactant1 in self.reactionDict[family]:
-                for reactant2 in self.reactionDict[family][reactant1]:
-                    tempRxnDeleteList = []
-                    for templateReaction in self.reactionDict[family][reactant1][reactant2]:
-                        if spec in templateReaction.reactants or spec in templateReaction.products:
-                            tempRxnDeleteList.append(templateReaction)
-                    for tempRxnToBeDeleted in tempRxnDeleteList:
-                        self.reactionDict[family][reactant1][reactant2].remove(tempRxnToBeDeleted)
+        # Remove from the reaction index
+        for familyDict in self.reactionDict.itervalues():
+            for key, rxnList in familyDict.items():
+                for rxn in rxnList:
+                    if spec in rxn.reactants or spec in rxn.products:
+                        break
+                else:
+                    continue
+                rxnList = [rxn for rxn in rxnList if spec not in rxn.reactants and spec not in rxn.products]
+                if rxnList:
+                    familyDict[key] = rxnList
+                else:
+                    del familyDict[key]
 
         # remove from the global list of species, to free memory
         formula = spec.molecule[0].getFormula()
         self.speciesDict[formula].remove(spec)
-        if spec in self.speciesCache:
-            self.speciesCache.remove(spec)
-            self.speciesCache.append(None)
+        key = spec.molecule[0].get_connectivity_key()
+        self.speciesKeyDict[key].remove(spec)
+        if not self.speciesKeyDict[key]:
+            del self.speciesKeyDict[key]
 
     def addReactionToCore(self, rxn):
         """
@@ -1772,71 +1863,50 @@ class CoreEdgeReactionModel:
     
     def registerReaction(self, rxn):
         """
-        Adds the reaction to the reaction database.
-
-        The reaction database is structured as a multi-level
-        dictionary, for efficient search and retrieval of
-        existing reactions.
+        Adds the reaction to the reaction index.
 
-        The database has two types of dictionary keys:
-        - reaction family
-        - reactant(s) keys
-
-        First, the keys are generated for the parameter reaction.
-        
-        Next, it is checked whether the reaction database already 
-        contains similar keys. If not, a new container is created,
-        either a dictionary for the family key and first reactant key,
-        or a list for the second reactant key.
+        The reaction index is a dictionary of dictionaries, the first
+        level of which is keyed by reaction family (or library) and the
+        second by a tuple of the sorted reactant keys and the sorted product
+        keys of the reaction, as returned by :func:`generateReactionKey`.
+        Existing reactions with the same reactants and products can thus
+        be found by a direct dictionary lookup.
 
-        Finally, the reaction is inserted as the first element in the 
-        list.
+        The reaction is inserted as the first element in the list of
+        reactions sharing its keys.
         """
 
-        key_family, key1, key2 = generateReactionKey(rxn)
+        key_family, reactantKeys, productKeys = generateReactionKey(rxn)
 
-        # make dictionary entries if necessary
-        if key_family not in self.reactionDict:
-            self.reactionDict[key_family] = {}
-
-        if not self.reactionDict[key_family].has_key(key1):
-            self.reactionDict[key_family][key1] = {}
-
-        if not self.reactionDict[key_family][key1].has_key(key2):
-            self.reactionDict[key_family][key1][key2] = []
-
-        # store this reaction at the top of the relevant short-list
-        self.reactionDict[key_family][key1][key2].insert(0, rxn)
+        try:
+            familyDict = self.reactionDict[key_family]
+        except KeyError:
+            familyDict = self.reactionDict[key_family] = {}
 
+        try:
+            familyDict[(reactantKeys, productKeys)].insert(0, rxn)
+        except KeyError:
+            familyDict[(reactantKeys, productKeys)] = [rxn]
 
     def searchRetrieveReactions(self, rxn):
         """
-        Searches through the reaction database for 
-        reactions with an identical reaction key as the key of the 
+        Searches through the reaction index for 
+        reactions with identical reaction keys as the keys of the 
         parameter reaction.
 
-        Both the reaction key based on the reactants as well as on the products
-        is used to search for possible candidate reactions.
+        For reaction families, reactions registered in the opposite direction
+        (i.e. with the products of the parameter reaction as reactants) are
+        also returned.
         """
 
-        # Get the short-list of reactions with the same family, reactant1 and reactant2
-        family_label, r1_fwd, r2_fwd = generateReactionKey(rxn)
-        
-        my_reactionList = []
+        family_label, reactantKeys, productKeys = generateReactionKey(rxn)
 
-        rxns = self.retrieve(family_label, r1_fwd, r2_fwd)
-        my_reactionList.extend(rxns)
-            
-            
-        family = getFamilyLibraryObject(family_label)       
-        # if the family is its own reverse (H-Abstraction) then check the other direction
-        if isinstance(family,KineticsFamily): 
+        my_reactionList = list(self.retrieve(family_label, reactantKeys, productKeys))
 
-            # Get the short-list of reactions with the same family, product1 and product2
-            family_label, r1_rev, r2_rev = generateReactionKey(rxn, useProducts=True)
-
-            rxns = self.retrieve(family_label, r1_rev, r2_rev)
-            my_reactionList.extend(rxns)
+        family = getFamilyLibraryObject(family_label)
+        # if the family is its own reverse (H-Abstraction) then check the other direction
+        if isinstance(family, KineticsFamily):
+            my_reactionList.extend(self.retrieve(family_label, productKeys, reactantKeys))
 
         return my_reactionList
 
@@ -1853,17 +1923,24 @@ class CoreEdgeReactionModel:
             if spc.reactive:
                 self.indexSpeciesDict[spc.index] = spc
 
-    def retrieve(self, family_label, key1, key2):
+    def retrieve(self, family_label, reactantKeys, productKeys):
         """
-        Returns a list of reactions from the reaction database with the 
-        same keys as the parameters.
+        Returns the list of reactions from the reaction index with the 
+        same family, reactant keys and product keys as the parameters.
+        The list stored in the index is returned without copying, so it
+        must not be modified by the caller.
 
-        Returns an empty list when one of the keys could not be found.
+        Returns an empty tuple when no such reaction was registered.
+        The numbers of successful and unsuccessful lookups are counted by the
+        `reactionIndexHits` and `reactionIndexMisses` attributes.
         """
         try:
-            return self.reactionDict[family_label][key1][key2][:]
-        except KeyError: # no such short-list: must be new, unless in seed.
-            return []
+            rxns = self.reactionDict[family_label][(reactantKeys, productKeys)]
+        except KeyError: # no such reaction: must be new, unless in seed.
+            self.reactionIndexMisses += 1
+            return ()
+        self.reactionIndexHits += 1
+        return rxns
 
     def getSpecies(self, obj):
         """
@@ -1892,36 +1969,34 @@ def generateReactionKey(rxn, useProducts=False):
     """
     Returns a tuple with 3 keys:
     - the reaction family (or library) the reaction belongs to
-    - the keys of the reactants.
+    - the keys of the reactants
+    - the keys of the products
 
-    None for the third element in the tuple if there is 
-    only 1 reactant.
+    If `useProducts` is ``True``, the roles of the reactants and
+    products are swapped, i.e. the key of the reverse reaction is returned.
 
-    The keys are sorted alphabetically.
+    The reactant and product keys (see :func:`getKey`) are sorted.
     """
 
     key_family = rxn.family
 
-    spc_list = rxn.products if useProducts else rxn.reactants
-    key1 = getKey(spc_list[0])
-    key2 = None if len(spc_list) == 1 else getKey(spc_list[1])
-    key1, key2 = sorted([key1, key2], reverse=True)# ensure None is always at end
-
-    return (key_family, key1, key2)
+    reactantKeys, productKeys = generateReactionId(rxn)
+    if useProducts:
+        return (key_family, productKeys, reactantKeys)
+    return (key_family, reactantKeys, productKeys)
 
 def generateReactionId(rxn):
     """
     Returns a tuple of the reactions reactant and product
     keys.
 
-    Both lists are sorted.
+    Both tuples are sorted.
 
-    The first element in the tuple is the reactants list.
+    The first element in the tuple is the reactants tuple.
     """
 
-
-    reactants = sorted([getKey(reactant) for reactant in rxn.reactants])
-    products = sorted([getKey(product) for product in rxn.products])
+    reactants = tuple(sorted([getKey(reactant) for reactant in rxn.reactants]))
+    products = tuple(sorted([getKey(product) for product in rxn.products]))
 
     return (reactants, products)
 
@@ -1950,12 +2025,150 @@ def getFamilyLibraryObject(label):
 
     raise Exception('Could not retrieve the family/library: {}'.format(label))
 
+def generateReactionKinetics(reaction, G298, kineticsEstimator, verboseComments):
+    """
+    Generate best possible kinetics for the given `reaction`, with Gibbs free
+    energy of reaction `G298` at 298 K, using the kinetics database and the
+    `kineticsEstimator` of the model. This does the work of
+    :meth:`CoreEdgeReactionModel.generateKinetics`, and is also run on the
+    worker processes by :meth:`CoreEdgeReactionModel.applyKineticsToReactions`.
+    """
+    family = getFamilyLibraryObject(reaction.family)
+
+    # Get the kinetics for the reaction
+    kinetics, source, entry, isForward = family.getKinetics(reaction, templateLabels=reaction.template, degeneracy=reaction.degeneracy, estimator=kineticsEstimator, returnAllKinetics=False)
+    gibbsIsPositive = G298 > -1e-8
+    
+    if family.ownReverse and hasattr(reaction,'reverse'):
+        if reaction.reverse:
+            # The kinetics family is its own reverse, so we could estimate kinetics in either direction
+            
+            # First get the kinetics for the other direction
+            rev_kinetics, rev_source, rev_entry, rev_isForward = family.getKinetics(reaction.reverse, templateLabels=reaction.reverse.template, degeneracy=reaction.reverse.degeneracy, estimator=kineticsEstimator, returnAllKinetics=False)
+            # Now decide which direction's kinetics to keep
+            keepReverse = False
+            if (entry is not None and rev_entry is None):
+                # Only the forward has an entry, meaning an exact match in a depository or template
+                # the reverse must have used an averaged estimated node - so use forward.
+                reason = "This direction matched an entry in {0}, the other was just an estimate.".format(reaction.family)
+            elif (entry is None and rev_entry is not None):
+                # Only the reverse has an entry (see above) - use reverse.
+                keepReverse = True
+                reason = "This direction matched an entry in {0}, the other was just an estimate.".format(reaction.family)
+            elif (entry is not None and rev_entry is not None 
+                  and entry is rev_entry):
+                # Both forward and reverse have the same source and entry
+                # Use the one for which the kinetics is the forward kinetics
+                keepReverse = gibbsIsPositive and isForward and rev_isForward
+                reason = "Both directions matched the same entry in {0}, but this direction is exergonic.".format(reaction.family)
+            elif kineticsEstimator == 'group additivity' and (kinetics.comment.find("Fitted to 1 rate")>0
+                  and not rev_kinetics.comment.find("Fitted to 1 rate")>0) :
+                    # forward kinetics were fitted to only 1 rate, but reverse are hopefully better
+                    keepReverse = True
+                    reason = "Other direction matched a group only fitted to 1 rate."
+            elif kineticsEstimator == 'group additivity' and (not kinetics.comment.find("Fitted to 1 rate")>0
+                  and rev_kinetics.comment.find("Fitted to 1 rate")>0) :
+                    # reverse kinetics were fitted to only 1 rate, but forward are hopefully better
+                    keepReverse = False
+                    reason = "Other direction matched a group only fitted to 1 rate."
+            elif entry is not None and rev_entry is not None:
+                # Both directions matched explicit rate rules
+                # Keep the direction with the lower (but nonzero) rank
+                if entry.rank < rev_entry.rank and entry.rank != 0:
+                    keepReverse = False
+                    reason = "Both directions matched explicit rate rules, but this direction has a rule with a lower rank ({0} vs {1}).".format(entry.rank, rev_entry.rank)
+                elif rev_entry.rank < entry.rank and rev_entry.rank != 0:
+                    keepReverse = True
+                    reason = "Both directions matched explicit rate rules, but this direction has a rule with a lower rank ({0} vs {1}).".format(rev_entry.rank, entry.rank)
+                # Otherwise keep the direction that is exergonic at 298 K
+                else:
+                    keepReverse = gibbsIsPositive and isForward and rev_isForward
+                    reason = "Both directions matched explicit rate rules, but this direction is exergonic."
+            else:
+                # Keep the direction that is exergonic at 298 K
+                # This must be done after the thermo generation step
+                keepReverse = gibbsIsPositive and isForward and rev_isForward
+                reason = "Both directions are estimates, but this direction is exergonic."
+
+            if keepReverse:
+                kinetics = rev_kinetics
+                source = rev_source
+                entry = rev_entry
+                isForward = not rev_isForward
+                G298 = -G298
+            
+            if verboseComments:
+                kinetics.comment += "\nKinetics were estimated in this direction instead of the reverse because:\n{0}".format(reason)
+                kinetics.comment += "\ndGrxn(298 K) = {0:.2f} kJ/mol".format( G298 / 1000.)
+        
+    # The comments generated by the database for estimated kinetics can
+    # be quite long, and therefore not very useful
+    # We don't want to waste lots of memory storing these long, 
+    # uninformative strings, so here we replace them with much shorter ones
+    if not verboseComments:
+        # Only keep a short comment (to save memory)
+        if 'Exact' in kinetics.comment:
+            # Exact match of rate rule
+            pass
+        elif 'Matched reaction' in kinetics.comment:
+            # Stems from matching a reaction from a depository
+            pass
+        else:
+            # Estimated (averaged) rate rule
+            kinetics.comment =  kinetics.comment[kinetics.comment.find('Estimated'):]
+            
+    return kinetics, source, entry, isForward
+
+
+def _generate_compact_kinetics(args):
+    """
+    Module-level function passed to workers by
+    :meth:`CoreEdgeReactionModel.applyKineticsToReactions`.
+
+    Generates the kinetics for a group of reactions sent in compact form and
+    returns a list of (index, kinetics, isForward) tuples.
+    """
+    from rmgpy.rmg.react import expand_species
+
+    tasks, kineticsEstimator, verboseComments = args
+    species = {}
+    def expand_reactants(species_list):
+        spcs = []
+        for data in species_list:
+            try:
+                spcs.append(species[id(data)])
+            except KeyError:
+                spcs.append(species.setdefault(id(data), expand_species(data)))
+        return spcs
+
+    results = []
+    for index, family, reactants, products, collider, template, degeneracy, reverse, G298 in tasks:
+        reaction = TemplateReaction(reactants=expand_reactants(reactants), products=expand_reactants(products),
+                                    family=family, template=template, degeneracy=degeneracy)
+        if collider is not None:
+            reaction.specificCollider = expand_reactants([collider])[0]
+        if reverse is not None:
+            reactants, products, template, degeneracy = reverse
+            reaction.reverse = TemplateReaction(reactants=expand_reactants(reactants),
+                                                products=expand_reactants(products),
+                                                family=family, template=template, degeneracy=degeneracy)
+        kinetics, source, entry, isForward = generateReactionKinetics(reaction, G298, kineticsEstimator,
+                                                                      verboseComments)
+        results.append((index, kinetics, isForward))
+    return results
+
+
 def getKey(spc):
     """
-    Returns a string of the species that can serve as a key in a dictionary.
+    Returns the key of the species in the reaction index, which is its index.
+    Unlike the label, which changes when a new species is renamed after a
+    thermo library, the index never changes once the species is made, so
+    registered reactions can always be retrieved. Non-reactive species all
+    share the index -1, which only makes the reaction index less selective,
+    since retrieved reactions are compared by their species references.
     """
 
-    return spc.label
+    return spc.index
 
 def areIdenticalSpeciesReferences(rxn1, rxn2):
     """
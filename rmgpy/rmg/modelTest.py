@@ -40,6 +40,7 @@ from rmgpy.rmg.model import *
 from rmgpy.data.base import ForbiddenStructures
 from rmgpy.data.kinetics.family import TemplateReaction
 from rmgpy.data.thermo import *
+from rmgpy.thermo import ThermoData
 ###################################################
 
 class TestSpecies(unittest.TestCase):
@@ -236,6 +237,138 @@ class TestCoreEdgeReactionModel(unittest.TestCase):
         self.assertEquals(len(cerm.indexSpeciesDict[2].molecule), 1)
         self.assertTrue(cerm.indexSpeciesDict[2].molecule[0].reactive)
 
+    def test_checkForExistingSpecies(self):
+        """
+        Test that CoreEdgeReactionModel.checkForExistingSpecies finds resonance structures
+        of registered species and distinguishes isomers.
+        """
+        cerm = CoreEdgeReactionModel()
+
+        spcs = [Species().fromSMILES('C=C[CH2]'),
+                Species().fromSMILES('CCCC'),
+                Species().fromSMILES('CC(C)C')]
+
+        for spc in spcs:
+            cerm.makeNewSpecies(spc)
+
+        self.assertEquals(len(cerm.speciesDict), 2)
+        self.assertEquals(len(cerm.speciesKeyDict), 3)
+
+        self.assertIs(cerm.checkForExistingSpecies(Molecule(SMILES='[CH2]C=C')), cerm.indexSpeciesDict[1])
+        self.assertIs(cerm.checkForExistingSpecies(Molecule(SMILES='CCCC')), cerm.indexSpeciesDict[2])
+        self.assertIs(cerm.checkForExistingSpecies(Molecule(SMILES='CC(C)C')), cerm.indexSpeciesDict[3])
+        self.assertIsNone(cerm.checkForExistingSpecies(Molecule(SMILES='[CH]1CC1')))
+
+    def test_lazy_resonance(self):
+        """
+        Test that only the representative resonance structure of edge species
+        is kept in the lazy resonance mode, and that the other structures are
+        restored when the species is added to the core.
+        """
+        cerm = CoreEdgeReactionModel()
+        cerm.lazyResonance = True
+
+        spc, isNew = cerm.makeNewSpecies(Species().fromSMILES('[CH2]C=CC=CC'), generateThermo=False)
+        cerm.addSpeciesToEdge(spc)
+        self.assertEquals(len(spc.molecule), 3)
+        # Choose a representative structure other than the first one, as the thermo estimate may do
+        spc.molecule.reverse()
+        representative = spc.molecule[0]
+
+        cerm.reduceResonanceStructures(spc)
+        self.assertEquals(spc.molecule, [representative])
+        self.assertIs(cerm.checkForExistingSpecies(Molecule(SMILES='C=C[CH]C=CC')), spc)
+
+        cerm.addSpeciesToCore(spc)
+        self.assertEquals(len(spc.molecule), 3)
+        self.assertTrue(spc.molecule[0].isIsomorphic(representative))
+        self.assertEquals(len(set([mol.toSMILES() for mol in spc.molecule])), 3)
+
+    def test_lazy_resonance_kinetics(self):
+        """
+        Test that the reactions of new resonance stabilized species still
+        match training reactions in the lazy resonance mode, as the extra
+        resonance structures are only dropped once the kinetics are generated,
+        and are restored for the edge species found again in later iterations.
+        """
+        import rmgpy.rmg.input
+        cerm = CoreEdgeReactionModel()
+        cerm.lazyResonance = True
+        depository = getDB('kinetics').families['H_Abstraction'].getTrainingDepository()
+
+        def makeNewReactions(spcs):
+            for rxn in react([(tuple(spcs), ['H_Abstraction'])], 1):
+                for spc in rxn.reactants + rxn.products:
+                    if spc.thermo is None:
+                        mol = spc.molecule[0]
+                        spc.thermo = ThermoData(
+                            Tdata=([300, 400, 500, 600, 800, 1000, 1500], 'K'),
+                            Cpdata=([4.0 * len(mol.atoms)] * 7, 'cal/(mol*K)'),
+                            H298=(100.0 * mol.getRadicalCount() - 20.0 * len(mol.atoms), 'kJ/mol'),
+                            S298=(150.0 + 10.0 * len(mol.atoms), 'J/(mol*K)'),
+                        )
+                cerm.makeNewReaction(rxn, generateThermo=False)
+
+        def addTrainingReaction(label, reactant, product):
+            # Add a training reaction with the other resonance structure of the product
+            index = max(depository.entries.keys() + [0]) + 1
+            entry = depository.loadEntry(index=index, label=label,
+                                         kinetics=Arrhenius(A=(1e13, 'cm^3/(mol*s)'), n=0, Ea=(20, 'kJ/mol'),
+                                                            T0=(1, 'K')),
+                                         rank=1)
+            entry.item.reactants = [Species().fromSMILES('CC=CC'), Species().fromSMILES(reactant)]
+            entry.item.products = [Species(molecule=[otherStructure.copy(deep=True)]),
+                                   Species().fromSMILES(product)]
+            return index
+
+        makeNewReactions([Species().fromSMILES('CC=CC'), Species().fromSMILES('[H]')])
+        products = [spc for spc in cerm.newSpeciesList if len(spc.molecule) == 2]
+        self.assertEquals(len(products), 1)
+        product = products[0]
+        # The thermo estimate may choose a representative structure other than the first one
+        product.molecule.reverse()
+        otherStructure = product.molecule[1]
+        reaction = [rxn for rxn in cerm.newReactionList if product in rxn.reactants + rxn.products][0]
+
+        index = addTrainingReaction('CC=CC + H <=> [CH2]C=CC + H2', '[H]', '[H][H]')
+        rmgpy.rmg.input.setGlobalRMG(RMG())
+        try:
+            cerm.applyThermoToSpecies(1)
+            self.assertEquals(len(product.molecule), 2)
+            cerm.restoreNewResonanceStructures()
+            cerm.applyKineticsToReactions([reaction])
+        finally:
+            rmgpy.rmg.input.rmg = None
+            del depository.entries[index]
+        self.assertIn('Matched reaction {0}'.format(index), reaction.kinetics.comment)
+
+        cerm.reduceNewResonanceStructures()
+        self.assertEquals(len(product.molecule), 1)
+
+        # In the next iteration, the reduced edge species is a product of a new reaction
+        cerm.newReactionList = []
+        cerm.newSpeciesList = []
+        makeNewReactions([Species().fromSMILES('CC=CC'), Species().fromSMILES('[CH3]')])
+        reaction = [rxn for rxn in cerm.newReactionList if product in rxn.reactants + rxn.products][0]
+        self.assertNotIn(product, cerm.newSpeciesList)
+        self.assertEquals(len(product.molecule), 1)
+
+        index = addTrainingReaction('CC=CC + CH3 <=> [CH2]C=CC + CH4', '[CH3]', 'C')
+        rmgpy.rmg.input.setGlobalRMG(RMG())
+        try:
+            cerm.applyThermoToSpecies(1)
+            cerm.restoreNewResonanceStructures()
+            self.assertEquals(len(product.molecule), 2)
+            self.assertTrue(product.molecule[1].isIsomorphic(otherStructure))
+            cerm.applyKineticsToReactions([reaction])
+        finally:
+            rmgpy.rmg.input.rmg = None
+            del depository.entries[index]
+        self.assertIn('Matched reaction {0}'.format(index), reaction.kinetics.comment)
+
+        cerm.reduceNewResonanceStructures()
+        self.assertEquals(len(product.molecule), 1)
+
     def testMakeNewReaction(self):
         """
         Test that CoreEdgeReactionModel.makeNewReaction method correctly works.
@@ -263,12 +396,67 @@ class TestCoreEdgeReactionModel(unittest.TestCase):
         # count no. of entries in reactionDict:
         counter = 0
         for fam, v1 in cerm.reactionDict.iteritems():
-            for key2, v2 in v1.iteritems():
-                for key3, rxnList in v2.iteritems():
-                    counter += len(rxnList)
+            for key, rxnList in v1.iteritems():
+                counter += len(rxnList)
 
         self.assertEquals(counter, 3)
     
+    def testApplyKineticsToReactions(self):
+        """
+        Test that generating the reactions and the kinetics of new reactions
+        on the worker pool gives the same results as generating them serially,
+        including for the nodes of the family tree that only match atoms in
+        rings.
+        """
+        from rmgpy.molecule.group import Group
+        from rmgpy.rmg.react import close_pool
+        family = getDB('kinetics').families['H_Abstraction']
+        parent = family.groups.entries['Cs_H']
+        family.addEntry(parent, Group().fromAdjacencyList("""
+1 *1 C u0 r1 {2,S} {3,S} {4,S} {5,S}
+2 *2 H u0 {1,S}
+3    R u0 {1,S}
+4    R u0 {1,S}
+5    R u0 {1,S}
+"""), 'Cs_H_ring')
+        # The workers must be forked with the modified tree
+        close_pool()
+
+        try:
+            spcA = Species().fromSMILES('[OH]')
+            smiles = ['CC', '[CH3]', 'CCC', 'C1CC1']
+            rxns = list(react([((spcA, Species().fromSMILES(smi)), ['H_Abstraction']) for smi in smiles], 1))
+            rxns2 = list(react([((spcA, Species().fromSMILES(smi)), ['H_Abstraction']) for smi in smiles], 2))
+            # The Gibbs free energy of reaction decides the direction of the kinetics
+            for rxn in rxns + rxns2:
+                for spc in rxn.reactants + rxn.products:
+                    if spc.thermo is None:
+                        mol = spc.molecule[0]
+                        spc.thermo = ThermoData(
+                            Tdata=([300, 400, 500, 600, 800, 1000, 1500], 'K'),
+                            Cpdata=([4.0 * len(mol.atoms)] * 7, 'cal/(mol*K)'),
+                            H298=(100.0 * mol.getRadicalCount() - 20.0 * len(mol.atoms), 'kJ/mol'),
+                            S298=(150.0 + 10.0 * len(mol.atoms), 'J/(mol*K)'),
+                        )
+            self.assertEqual(len(rxns), 6)
+            self.assertEqual(len(rxns2), len(rxns))
+            self.assertIn('Cs_H_ring', [label for rxn in rxns for label in rxn.template])
+
+            cerm = CoreEdgeReactionModel()
+            cerm.applyKineticsToReactions(rxns, procnum=1)
+            cerm.applyKineticsToReactions(rxns2, procnum=2)
+            for rxn, rxn2 in zip(rxns, rxns2):
+                self.assertEqual(str(rxn), str(rxn2))
+                self.assertEqual(rxn.template, rxn2.template)
+                self.assertEqual(repr(rxn.kinetics), repr(rxn2.kinetics))
+        finally:
+            close_pool()
+            del family.groups.entries['Cs_H_ring']
+            del family.rules.entries['Cs_H_ring']
+            parent.children.pop()
+            family.rules.clearKineticsCache()
+            family.groups.clearNodeFilters()
+
     def testThermoFilterSpecies(self):
         """
         test that thermoFilterSpecies leaves species alone if if toleranceThermoKeepInEdge
@@ -569,12 +757,129 @@ class TestCoreEdgeReactionModel(unittest.TestCase):
         self.assertTrue(found, 'checkForExistingReaction failed to identify existing reaction in the reverse direction')
         self.assertEqual(rxn, rxn_f)
 
+    def test_retrieve(self):
+        """
+        Test that retrieve finds registered reactions by their keys and counts hits and misses
+        """
+        cerm = CoreEdgeReactionModel()
+
+        s1 = Species(index=1, label='H').fromSMILES("[H]")
+        s2 = Species(index=2, label='CC').fromSMILES("CC")
+        s3 = Species(index=3, label='HH').fromSMILES("[H][H]")
+        s4 = Species(index=4, label='C[CH2]').fromSMILES("C[CH2]")
+
+        rxn = TemplateReaction(reactants=[s1, s2],
+                               products=[s3, s4],
+                               template=['C/H3/Cs/H3', 'H_rad'],
+                               degeneracy=6,
+                               family='H_Abstraction')
+        cerm.registerReaction(rxn)
+
+        self.assertEqual(generateReactionKey(rxn), ('H_Abstraction', (1, 2), (3, 4)))
+        self.assertEqual(list(cerm.retrieve('H_Abstraction', (1, 2), (3, 4))), [rxn])
+        self.assertEqual(list(cerm.retrieve('H_Abstraction', (3, 4), (1, 2))), [])
+        self.assertEqual(list(cerm.retrieve('R_Recombination', (1, 2), (3, 4))), [])
+        self.assertEqual(cerm.reactionIndexHits, 1)
+        self.assertEqual(cerm.reactionIndexMisses, 2)
+
+    def test_checkForExistingReaction_after_renaming(self):
+        """
+        Test that registered reactions are still found in both directions
+        after a product is renamed, e.g. after a thermo library
+        """
+        cerm = CoreEdgeReactionModel()
+
+        s1 = Species(index=1, label='H').fromSMILES("[H]")
+        s2 = Species(index=2, label='CC').fromSMILES("CC")
+        s3 = Species(index=3, label='[H][H]').fromSMILES("[H][H]")
+        s4 = Species(index=4, label='C[CH2]').fromSMILES("C[CH2]")
+
+        rxn_f = TemplateReaction(reactants=[s1, s2],
+                                 products=[s3, s4],
+                                 template=['C/H3/Cs/H3', 'H_rad'],
+                                 degeneracy=6,
+                                 family='H_Abstraction')
+        cerm.registerReaction(rxn_f)
+        s3.label = 'H2'
+        s4.label = 'C2H5'
+
+        rxn_f2 = TemplateReaction(reactants=[s2, s1],
+                                  products=[s4, s3],
+                                  template=['C/H3/Cs/H3', 'H_rad'],
+                                  degeneracy=6,
+                                  family='H_Abstraction')
+        found, rxn = cerm.checkForExistingReaction(rxn_f2)
+        self.assertTrue(found)
+        self.assertIs(rxn, rxn_f)
+
+        rxn_r = TemplateReaction(reactants=[s3, s4],
+                                 products=[s1, s2],
+                                 template=['H2', 'C_rad/H2/Cs/H3'],
+                                 degeneracy=2,
+                                 family='H_Abstraction')
+        found, rxn = cerm.checkForExistingReaction(rxn_r)
+        self.assertTrue(found)
+        self.assertIs(rxn, rxn_f)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Reset the loaded database
+        """
+        import rmgpy.data.rmg
+        from rmgpy.rmg.react import close_pool
+        # The forked workers keep the database of this test class
+        close_pool()
+        rmgpy.data.rmg.database = None
+
+
+class TestApplyThermoToSpecies(unittest.TestCase):
+    """
+    Contains unit tests of CoreEdgeReactionModel.applyThermoToSpecies.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        A method that is run before each unit test in this class.
+        """
+        import rmgpy.rmg.input
+        from rmgpy.rmg.react import close_pool
+        # The worker pool must be forked after the thermo database is loaded
+        close_pool()
+        rmgpy.rmg.input.setGlobalRMG(RMG())
+
+        database = RMGDatabase()
+        path = os.path.join(settings['test_data.directory'], 'testing_database')
+        database.loadThermo(os.path.join(path, 'thermo'), thermoLibraries=['primaryThermoLibrary'])
+
+    def testRenameFromThermoLibrary(self):
+        """
+        Test that the species found in a thermo library are renamed after
+        the library entry, both serially and on the worker pool.
+        """
+        smiles = ['[H][H]', '[O][O]', 'CC']
+        labels = {}
+        for procnum in [1, 2]:
+            cerm = CoreEdgeReactionModel()
+            for s in smiles:
+                cerm.makeNewSpecies(Species().fromSMILES(s), generateThermo=False)
+            cerm.applyThermoToSpecies(procnum)
+            labels[procnum] = [spc.label for spc in cerm.newSpeciesList]
+
+        self.assertEqual(labels[1], ['H2', 'O2', 'CC'])
+        self.assertEqual(labels[2], labels[1])
+
     @classmethod
     def tearDownClass(cls):
         """
         Reset the loaded database
         """
         import rmgpy.data.rmg
+        import rmgpy.rmg.input
+        from rmgpy.rmg.react import close_pool
+        close_pool()
+        rmgpy.rmg.input.rmg = None
         rmgpy.data.rmg.database = None
 
 
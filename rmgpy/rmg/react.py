@@ -33,11 +33,88 @@ Contains functions for generating reactions.
 """
 import itertools
 import logging
+import time
 
+import numpy
+
+import rmgpy.data.rmg
 from rmgpy.data.rmg import getDB
+from rmgpy.molecule.resonance import get_resonance_cache, update_resonance_cache
+from rmgpy.species import Species
 from multiprocessing import Pool
 
+# The worker pool used for parallel reaction generation. It is created on
+# first use and reused for every subsequent enlarge step of the RMG job, so
+# that the kinetics database is only handed to the worker processes once.
+_pool = None
+_pool_procnum = 0
+_pool_database = None
+
 ################################################################################
+def get_pool(procnum):
+    """
+    Return the persistent worker pool with `procnum` processes, creating it
+    if necessary. The pool is recreated if the number of processes or the
+    loaded RMG database has changed since it was created.
+    """
+    global _pool, _pool_procnum, _pool_database
+
+    database = rmgpy.data.rmg.database
+    if _pool is not None and (_pool_procnum != procnum or _pool_database is not database):
+        close_pool()
+    if _pool is None:
+        _pool = Pool(processes=procnum, initializer=_initialize_worker, initargs=(database, get_resonance_cache()))
+        _pool_procnum = procnum
+        _pool_database = database
+    return _pool
+
+
+def close_pool():
+    """
+    Shut down the persistent worker pool, if one has been created.
+    """
+    global _pool, _pool_procnum, _pool_database
+
+    if _pool is not None:
+        _pool.close()
+        _pool.join()
+    _pool = None
+    _pool_procnum = 0
+    _pool_database = None
+
+
+def _initialize_worker(database, resonance_cache=None):
+    """
+    Make the RMG database available to a worker process. The database is
+    inherited when the worker is forked, so this only has to set the module
+    level reference used by :func:`getDB`. The entries `resonance_cache` of
+    the resonance structure cache of the master process are added to the
+    cache of the worker, which then keeps its own entries for as long as the
+    pool is used.
+    """
+    rmgpy.data.rmg.database = database
+    if resonance_cache:
+        update_resonance_cache(resonance_cache)
+
+
+def compact_species(spc):
+    """
+    Return a compact, picklable representation of the Species object `spc`
+    containing only what is needed to generate its reactions or thermo.
+    The molecules are stored as :class:`FrozenMolecule` objects, which are
+    cheaper to pickle and to convert back than adjacency lists.
+    """
+    return (spc.index, spc.label, tuple([mol.freeze() for mol in spc.molecule]))
+
+
+def expand_species(data):
+    """
+    Recreate a Species object from the output of :func:`compact_species`.
+    """
+    index, label, molecules = data
+    return Species(index=index, label=label, molecule=[mol.toMolecule() for mol in molecules])
+
+
 def react(spc_tuples, procnum=1):
     """
     Generate reactions between the species in the
@@ -54,27 +131,96 @@ def react(spc_tuples, procnum=1):
 
     Returns a flat generator object containing the generated Reaction objects.
     """
-    # Execute multiprocessing map. It blocks until the result is ready.
-    # This method chops the iterable into a number of chunks which it
-    # submits to the process pool as separate tasks.
     if procnum == 1:
         logging.info('For reaction generation {0} process is used.'.format(procnum))
         reactions = map(_react_species_star, spc_tuples)
     else:
         logging.info('For reaction generation {0} processes are used.'.format(procnum))
-        p = Pool(processes=procnum)
-        reactions = p.map(_react_species_star, spc_tuples)
-        p.close()
-        p.join()
+        tasks = [(args[0], args[1] if len(args) > 1 else None) for args in spc_tuples]
+        chunksize = max(1, len(tasks) // (4 * procnum))
+        results = _run_tasks(tasks, procnum, chunksize)
+        reactions = [[rxn for family, elapsed, rxns in result for rxn in rxns] for result in results]
 
     return itertools.chain.from_iterable(reactions)
 
 
+def _run_tasks(tasks, procnum, chunksize=1, order=None):
+    """
+    Run the reaction generation `tasks` on the persistent worker pool. Each
+    task is a tuple of a species tuple and a list of family labels (or
+    ``None`` for all families). The tasks are dispatched in the given `order`
+    of task indices, if provided.
+
+    Returns a list with, for each task in the original order, a list of
+    (family label, generation time, reactions) tuples. Timings and reactions
+    are reported per family when the task lists its families explicitly.
+    """
+    # Send each species to the workers as adjacency lists instead of
+    # pickling the full Species objects, and only convert each once
+    compact = {}
+    payload = []
+    for i in (order if order is not None else xrange(len(tasks))):
+        species_tuple, families = tasks[i]
+        species_data = []
+        for spc in species_tuple:
+            try:
+                data = compact[id(spc)]
+            except KeyError:
+                data = compact[id(spc)] = compact_species(spc)
+            species_data.append(data)
+        payload.append((i, tuple(species_data), families))
+
+    # Results come back in completion order, so put them back in task
+    # order to keep the model generation deterministic
+    results = [None] * len(tasks)
+    start = time.time()
+    for i, result in get_pool(procnum).imap_unordered(_react_compact_species_star, payload, chunksize):
+        results[i] = result
+    wall_time = time.time() - start
+
+    # Report the time spent on each task and how well the pool was used
+    task_times = []
+    for i, result in enumerate(results):
+        task_time = sum([elapsed for family, elapsed, rxns in result])
+        task_times.append(task_time)
+        logging.debug('Reaction generation task {0} ({1}) took {2:.3f} s'.format(
+            i, ', '.join([family for family, elapsed, rxns in result if family is not None]) or 'all families',
+            task_time))
+    if tasks and wall_time > 0:
+        logging.info('Ran {0} reaction generation tasks in {1:.2f} s (longest task {2:.2f} s, '
+                     'pool utilization {3:.0%})'.format(len(tasks), wall_time, max(task_times),
+                                                        sum(task_times) / (wall_time * procnum)))
+
+    return results
+
+
 def _react_species_star(args):
     """Wrapper to unpack zipped arguments for use with map"""
     return react_species(*args)
 
 
+def _react_compact_species_star(args):
+    """
+    Wrapper to unpack the arguments sent to a worker process by
+    :func:`_run_tasks`. Returns the task index together with a list of
+    (family label, generation time, reactions) tuples.
+    """
+    index, species_data, families = args
+    species_tuple = tuple([expand_species(data) for data in species_data])
+    kinetics_database = getDB('kinetics')
+    result = []
+    if families is None:
+        start = time.time()
+        reactions = kinetics_database.generate_reactions_from_families(species_tuple)
+        result.append((None, time.time() - start, reactions))
+    else:
+        for family in families:
+            start = time.time()
+            reactions = kinetics_database.generate_reactions_from_families(species_tuple, only_families=[family])
+            result.append((family, time.time() - start, reactions))
+    return index, result
+
+
 def react_species(species_tuple, only_families=None):
     """
     Given a tuple of Species objects, generates all possible reactions
@@ -88,64 +234,232 @@ def react_species(species_tuple, only_families=None):
     return reactions
 
 
-def react_all(core_spc_list, numOldCoreSpecies, unimolecularReact, bimolecularReact, trimolecularReact=None, procnum=1):
+class GenerationCostModel(object):
     """
-    Reacts the core species list via uni-, bi-, and trimolecular
-    reactions and splits reaction families per task for improved load balancing in parallel runs.
+    A model of the time needed to generate the reactions of a species tuple
+    with a single reaction family, built from the timings recorded in
+    previous iterations. The timings are grouped by family, number of
+    reactants and total number of atoms in the reactants.
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `costs`             A dict mapping (family, reactants, atoms) keys to the total time and number of timings
+    `familyCosts`       A dict mapping family labels to the total time and total number of atoms timed
+    `defaultCost`       The cost per atom assumed for families without any timings
+    =================== ========================================================
+
+    """
+
+    def __init__(self, defaultCost=1.0e-3):
+        self.costs = {}
+        self.familyCosts = {}
+        self.defaultCost = defaultCost
+
+    def getKey(self, family, species_tuple):
+        """
+        Return the key used to group the timings of reacting `species_tuple`
+        with the given `family`.
+        """
+        return family, len(species_tuple), sum([len(spc.molecule[0].atoms) for spc in species_tuple])
+
+    def record(self, family, species_tuple, elapsed):
+        """
+        Record that generating the reactions of `species_tuple` with `family`
+        took `elapsed` seconds.
+        """
+        key = self.getKey(family, species_tuple)
+        total, count = self.costs.get(key, (0.0, 0))
+        self.costs[key] = (total + elapsed, count + 1)
+        total, atoms = self.familyCosts.get(family, (0.0, 0))
+        self.familyCosts[family] = (total + elapsed, atoms + key[2])
+
+    def estimate(self, family, species_tuple):
+        """
+        Return the expected time to generate the reactions of `species_tuple`
+        with `family`. Combinations that have not been timed yet are
+        estimated from the average cost per atom of the family.
+        """
+        key = self.getKey(family, species_tuple)
+        try:
+            total, count = self.costs[key]
+        except KeyError:
+            pass
+        else:
+            return total / count
+        try:
+            total, atoms = self.familyCosts[family]
+        except KeyError:
+            return self.defaultCost * key[2]
+        return total / atoms * key[2]
+
+
+# The cost model is kept for the whole RMG job so that each iteration
+# can be partitioned using the timings of all previous ones
+_cost_model = GenerationCostModel()
+
+
+def partition_tasks(spc_tuples, families, procnum, cost_model):
+    """
+    Split the work of reacting each species tuple in `spc_tuples` with each
+    of the reaction `families` into tasks of similar estimated cost.
+    Families are grouped per species tuple until a task reaches the target
+    cost, so expensive species tuples are split over several tasks while
+    cheap ones are handled in a single task.
+
+    Returns a list of (species tuple, families) tasks in a deterministic
+    order, and a list of the estimated cost of each task.
+    """
+    estimates = [[cost_model.estimate(family, spc_tuple) for family in families] for spc_tuple in spc_tuples]
+    total_cost = sum([sum(costs) for costs in estimates])
+    # Aim for several tasks per process so the pool can even out the load
+    target_cost = total_cost / (4 * procnum)
+
+    tasks = []
+    task_costs = []
+    for spc_tuple, costs in zip(spc_tuples, estimates):
+        task_families = []
+        task_cost = 0.0
+        for family, cost in zip(families, costs):
+            if task_families and task_cost + cost > target_cost:
+                tasks.append((spc_tuple, task_families))
+                task_costs.append(task_cost)
+                task_families = []
+                task_cost = 0.0
+            task_families.append(family)
+            task_cost += cost
+        if task_families:
+            tasks.append((spc_tuple, task_families))
+            task_costs.append(task_cost)
+
+    return tasks, task_costs
+
+
+class ReactedCombinations(object):
+    """
+    Keeps track of the combinations of core species that have already been
+    reacted, by their index in the core species list, so that each
+    combination is only reacted once over the course of an RMG job.
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `unimolecular`      A boolean array of the species that have been reacted unimolecularly
+    `bimolecular`       A boolean array of the pairs (i, j) with i <= j that have been reacted
+    `trimolecular`      A boolean array of the triples (i, j, k) with i <= j <= k that have been reacted
+    =================== ========================================================
+
     """
-    # Select reactive species that can undergo unimolecular reactions:
-    spc_tuples = [(core_spc_list[i],)
-                  for i in xrange(numOldCoreSpecies) if (unimolecularReact[i] and core_spc_list[i].reactive)]
 
-    for i in xrange(numOldCoreSpecies):
-        for j in xrange(i, numOldCoreSpecies):
-            # Find reactions involving the species that are bimolecular.
-            # This includes a species reacting with itself (if its own concentration is high enough).
-            if bimolecularReact[i, j]:
-                if core_spc_list[i].reactive and core_spc_list[j].reactive:
-                    spc_tuples.append((core_spc_list[i], core_spc_list[j]))
+    def __init__(self):
+        self.unimolecular = numpy.zeros(0, bool)
+        self.bimolecular = numpy.zeros((0, 0), bool)
+        self.trimolecular = numpy.zeros((0, 0, 0), bool)
+
+    def resize(self, numSpecies, trimolecular=False):
+        """
+        Grow the arrays to hold `numSpecies` core species, keeping the
+        combinations already marked as reacted.
+        """
+        n = len(self.unimolecular)
+        if numSpecies > n:
+            unimolecular = numpy.zeros(numSpecies, bool)
+            unimolecular[:n] = self.unimolecular
+            self.unimolecular = unimolecular
+            bimolecular = numpy.zeros((numSpecies, numSpecies), bool)
+            bimolecular[:n, :n] = self.bimolecular
+            self.bimolecular = bimolecular
+        n = len(self.trimolecular)
+        if trimolecular and numSpecies > n:
+            trimolecular = numpy.zeros((numSpecies, numSpecies, numSpecies), bool)
+            trimolecular[:n, :n, :n] = self.trimolecular
+            self.trimolecular = trimolecular
+
+
+def generate_spc_tuple_indices(reactive, unimolecularReact, bimolecularReact, trimolecularReact=None, reacted=None):
+    """
+    Return the indices of the combinations of species flagged for reaction in
+    the `unimolecularReact`, `bimolecularReact` and `trimolecularReact`
+    arrays, in that order. Only combinations with indices in increasing order
+    and whose species are all `reactive` are returned. If a
+    :class:`ReactedCombinations` object is given as `reacted`, combinations
+    that have been reacted before are skipped and the returned ones are
+    marked as reacted.
+
+    The flagged entries are found with :func:`numpy.nonzero`, so the cost is
+    proportional to the number of flagged combinations rather than to the
+    size of the arrays.
+    """
+    n = len(reactive)
+    reactive = numpy.asarray(reactive, bool)
+    if reacted is not None:
+        reacted.resize(n, trimolecular=trimolecularReact is not None)
+
+    i = numpy.flatnonzero(numpy.asarray(unimolecularReact[:n], bool))
+    select = reactive[i]
+    if reacted is not None:
+        select &= ~reacted.unimolecular[i]
+    i = i[select]
+    if reacted is not None:
+        reacted.unimolecular[i] = True
+    indices = [(a,) for a in i.tolist()]
+
+    i, j = numpy.nonzero(numpy.asarray(bimolecularReact[:n, :n], bool))
+    select = (i <= j) & reactive[i] & reactive[j]
+    if reacted is not None:
+        select &= ~reacted.bimolecular[i, j]
+    i, j = i[select], j[select]
+    if reacted is not None:
+        reacted.bimolecular[i, j] = True
+    indices.extend(zip(i.tolist(), j.tolist()))
 
     if trimolecularReact is not None:
-        for i in xrange(numOldCoreSpecies):
-            for j in xrange(i, numOldCoreSpecies):
-                for k in xrange(j, numOldCoreSpecies):
-                    # Find reactions involving the species that are trimolecular.
-                    if trimolecularReact[i, j, k]:
-                        if core_spc_list[i].reactive and core_spc_list[j].reactive and core_spc_list[k].reactive:
-                            spc_tuples.append((core_spc_list[i], core_spc_list[j], core_spc_list[k]))
+        i, j, k = numpy.nonzero(numpy.asarray(trimolecularReact[:n, :n, :n], bool))
+        select = (i <= j) & (j <= k) & reactive[i] & reactive[j] & reactive[k]
+        if reacted is not None:
+            select &= ~reacted.trimolecular[i, j, k]
+        i, j, k = i[select], j[select], k[select]
+        if reacted is not None:
+            reacted.trimolecular[i, j, k] = True
+        indices.extend(zip(i.tolist(), j.tolist(), k.tolist()))
+
+    return indices
+
+
+def react_all(core_spc_list, numOldCoreSpecies, unimolecularReact, bimolecularReact, trimolecularReact=None, procnum=1,
+              reacted=None):
+    """
+    Reacts the core species list via uni-, bi-, and trimolecular
+    reactions. In parallel runs the work is split into tasks of similar
+    cost using the generation times recorded in previous iterations.
+
+    If a :class:`ReactedCombinations` object is given as `reacted`, only
+    combinations of species that have not been reacted before are reacted.
+    """
+    reactive = [spc.reactive for spc in core_spc_list[:numOldCoreSpecies]]
+    spc_tuples = [tuple([core_spc_list[i] for i in index])
+                  for index in generate_spc_tuple_indices(reactive, unimolecularReact, bimolecularReact,
+                                                          trimolecularReact, reacted)]
 
     if procnum == 1:
         # React all families like normal (provide empty argument for only_families)
         spc_fam_tuples = zip(spc_tuples)
-    else:
-        # Identify and split families that are prone to generate many reactions into sublists.
-        family_list = getDB('kinetics').families.keys()
-        major_families = [
-            'H_Abstraction', 'R_Recombination', 'Intra_Disproportionation', 'Intra_RH_Add_Endocyclic',
-            'Singlet_Carbene_Intra_Disproportionation', 'Intra_ene_reaction', 'Disproportionation',
-            '1,4_Linear_birad_scission', 'R_Addition_MultipleBond', '2+2_cycloaddition_Cd', 'Diels_alder_addition',
-            'Intra_RH_Add_Exocyclic', 'Intra_Retro_Diels_alder_bicyclic', 'Intra_2+2_cycloaddition_Cd',
-            'Birad_recombination', 'Intra_Diels_alder_monocyclic', '1,4_Cyclic_birad_scission', '1,2_Insertion_carbene',
-        ]
-
-        split_list = []
-        leftovers = []
-        for fam in family_list:
-            if fam in major_families:
-                split_list.append([fam])
-            else:
-                leftovers.append(fam)
-        split_list.append(leftovers)
-
-        # Only employ family splitting for reactants that have a larger number than min_atoms
-        min_atoms = 10
-        spc_fam_tuples = []
-        for i, spc_tuple in enumerate(spc_tuples):
-            if any([len(spc.molecule[0].atoms) > min_atoms for spc in spc_tuple]):
-                for item in split_list:
-                    spc_fam_tuples.append((spc_tuple, item))
-            else:
-                spc_fam_tuples.append((spc_tuple, ))
-
-    return list(react(spc_fam_tuples, procnum))
+        return list(react(spc_fam_tuples, procnum))
+
+    logging.info('For reaction generation {0} processes are used.'.format(procnum))
+    families = getDB('kinetics').families.keys()
+    tasks, task_costs = partition_tasks(spc_tuples, families, procnum, _cost_model)
+
+    # Dispatch the most expensive tasks first so no long task is left to the end
+    order = sorted(xrange(len(tasks)), key=lambda i: -task_costs[i])
+    results = _run_tasks(tasks, procnum, order=order)
+
+    # Update the cost model and collect the reactions in the same order
+    # as in a serial run, independent of how the work was partitioned
+    reactions = {}
+    for (spc_tuple, task_families), result in zip(tasks, results):
+        for family, elapsed, rxns in result:
+            _cost_model.record(family, spc_tuple, elapsed)
+            reactions[id(spc_tuple), family] = rxns
 
+    return [rxn for spc_tuple in spc_tuples for family in families for rxn in reactions[id(spc_tuple), family]]
@@ -38,7 +38,8 @@ from rmgpy.data.rmg import RMGDatabase
 from rmgpy.species import Species
 
 from rmgpy.rmg.main import RMG
-from rmgpy.rmg.react import react, react_all
+from rmgpy.rmg.react import react, react_all, get_pool, close_pool, GenerationCostModel, partition_tasks, \
+    ReactedCombinations, generate_spc_tuple_indices, compact_species, expand_species
 
 ###################################################
 
@@ -138,11 +139,95 @@ class TestReact(unittest.TestCase):
         self.assertEqual(len(reaction_list), 44)
         self.assertTrue(all([isinstance(rxn, TemplateReaction) for rxn in reaction_list]))
 
+    def testPersistentPool(self):
+        """
+        Test that the worker pool is reused until the database or the number of processes changes
+        """
+        pool = get_pool(2)
+        self.assertIs(get_pool(2), pool)
+
+        new_pool = get_pool(3)
+        self.assertIsNot(new_pool, pool)
+
+        close_pool()
+        self.assertIsNot(get_pool(3), new_pool)
+
+    def testExpandSpecies(self):
+        """
+        Test that the species sent to the workers keep the ring membership of their atoms
+        """
+        spc = Species().fromSMILES('C=C1CC1')
+        spc.generate_resonance_structures()
+        for mol in spc.molecule:
+            mol.identifyRingMembership()
+        spc2 = expand_species(compact_species(spc))
+        self.assertEqual(len(spc2.molecule), len(spc.molecule))
+        for mol, mol2 in zip(spc.molecule, spc2.molecule):
+            self.assertTrue(mol2.isIsomorphic(mol))
+            self.assertEqual([atom.props['inRing'] for atom in mol2.atoms],
+                             [atom.props['inRing'] for atom in mol.atoms])
+
+    def testGenerateSpcTupleIndices(self):
+        """
+        Test that only new combinations of reactive species are generated
+        """
+        reacted = ReactedCombinations()
+        n = 3
+        reactive = [True, True, False]
+        indices = generate_spc_tuple_indices(reactive, np.ones(n), np.ones([n, n]), np.ones([n, n, n]), reacted)
+        self.assertEqual(indices, [(0,), (1,), (0, 0), (0, 1), (1, 1), (0, 0, 0), (0, 0, 1), (0, 1, 1), (1, 1, 1)])
+
+        # Nothing is generated again for the same species
+        indices = generate_spc_tuple_indices(reactive, np.ones(n), np.ones([n, n]), np.ones([n, n, n]), reacted)
+        self.assertEqual(indices, [])
+
+        # Only the combinations with a new species are generated
+        n = 4
+        reactive = [True, True, False, True]
+        indices = generate_spc_tuple_indices(reactive, np.ones(n), np.ones([n, n]), None, reacted)
+        self.assertEqual(indices, [(3,), (0, 3), (1, 3), (3, 3)])
+
+    def testCostModel(self):
+        """
+        Test that the cost model estimates generation times from recorded timings
+        """
+        cost_model = GenerationCostModel(defaultCost=1.0)
+        ethane = Species().fromSMILES('CC')
+        propane = Species().fromSMILES('CCC')
+
+        # Without timings, the default cost per atom is used
+        self.assertAlmostEqual(cost_model.estimate('H_Abstraction', (ethane,)), 8.0)
+
+        cost_model.record('H_Abstraction', (ethane,), 2.0)
+        cost_model.record('H_Abstraction', (ethane,), 4.0)
+        self.assertAlmostEqual(cost_model.estimate('H_Abstraction', (ethane,)), 3.0)
+        # Other sizes are scaled from the family's average cost per atom
+        self.assertAlmostEqual(cost_model.estimate('H_Abstraction', (propane,)), 6.0 / 16 * 11)
+        self.assertAlmostEqual(cost_model.estimate('R_Recombination', (ethane,)), 8.0)
+
+    def testPartitionTasks(self):
+        """
+        Test that expensive species tuples are split over several tasks
+        """
+        cost_model = GenerationCostModel(defaultCost=1.0)
+        small = (Species().fromSMILES('C'),)
+        large = (Species().fromSMILES('CCCCCCCCCCC'),)
+        for family in TESTFAMILIES:
+            cost_model.record(family, small, 0.001)
+            cost_model.record(family, large, 1.0)
+
+        tasks, task_costs = partition_tasks([small, large], TESTFAMILIES, 2, cost_model)
+
+        self.assertEqual(tasks[0], (small, TESTFAMILIES))
+        self.assertEqual([families for spc_tuple, families in tasks[1:]], [[family] for family in TESTFAMILIES])
+        self.assertAlmostEqual(sum(task_costs), 4.004)
+
     def tearDown(self):
         """
         Reset the loaded database
         """
         import rmgpy.data.rmg
+        close_pool()
         rmgpy.data.rmg.database = None
 
 
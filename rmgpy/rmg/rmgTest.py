@@ -123,7 +123,7 @@ class TestRMGWorkFlow(unittest.TestCase):
     def testCheckForExistingSpeciesForBiAromatics(self):
         """
         Test RMG checkForExistingSpecies can correctly check isomorphism for biaromatics. 
-        In this test, DPP is a species already stored in rmg speciesDict, mol_test is a newly
+        In this test, DPP is a species already registered in the rmg species dictionaries, mol_test is a newly
         created molecule which has one kekulized benzene ring and one double_bond-single_bond
         benzene ring.
         """
@@ -132,11 +132,7 @@ class TestRMGWorkFlow(unittest.TestCase):
         rmg_test.reactionModel = CoreEdgeReactionModel()
         DPP = Species().fromSMILES('C1=CC=C(C=C1)CCCC1C=CC=CC=1')
         DPP.generate_resonance_structures()
-        formula = DPP.molecule[0].getFormula()
-        if formula in rmg_test.reactionModel.speciesDict:
-            rmg_test.reactionModel.speciesDict[formula].append(DPP)
-        else:
-            rmg_test.reactionModel.speciesDict[formula] = [DPP]
+        rmg_test.reactionModel.registerSpecies(DPP)
 
         mol_test = Molecule().fromAdjacencyList(
 """
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+"""
+This module contains a persistent cache of thermo estimates, which allows
+RMG jobs to reuse the thermo that earlier jobs estimated for the same species
+with the same thermo database. The cache is an SQLite file that can be shared
+between jobs and worker processes.
+"""
+
+import cPickle
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+
+import rmgpy
+
+################################################################################
+
+class ThermoCache(object):
+    """
+    A size-bounded, persistent cache of thermo estimates stored in an SQLite
+    file. Entries are identified by the augmented InChI of the species and
+    the solvent, and belong to the `fingerprint` of the thermo database that
+    was used to estimate them, so that results from other databases are
+    never reused. When the cache holds more than `maxEntries` entries, the
+    least recently used ones are removed.
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `path`              The path of the SQLite file
+    `fingerprint`       The fingerprint of the thermo database in use
+    `maxEntries`        The maximum number of entries kept in the cache
+    `hits`              The number of species whose thermo was found in the cache
+    `misses`            The number of species whose thermo was not in the cache
+    =================== ========================================================
+
+    """
+
+    evictionInterval = 100
+
+    def __init__(self, path, fingerprint='', maxEntries=100000):
+        self.path = os.path.abspath(path)
+        self.fingerprint = fingerprint
+        self.maxEntries = maxEntries
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._pid = None
+        self._insertions = 0
+
+    def __reduce__(self):
+        """
+        A helper function used when pickling a ThermoCache object. The
+        connection to the database is not pickled.
+        """
+        return (ThermoCache, (self.path, self.fingerprint, self.maxEntries))
+
+    @property
+    def connection(self):
+        """
+        The connection to the SQLite file. A new connection is made in each
+        process, since connections cannot be shared with forked workers.
+        """
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            self._connection = sqlite3.connect(self.path, timeout=60)
+            self._connection.text_factory = str
+            self._connection.execute('CREATE TABLE IF NOT EXISTS thermo ('
+                                     'identifier TEXT NOT NULL, solvent TEXT NOT NULL, fingerprint TEXT NOT NULL, '
+                                     'label TEXT, thermo BLOB NOT NULL, E0 REAL, structures TEXT, '
+                                     'lastUsed REAL NOT NULL, PRIMARY KEY (identifier, solvent, fingerprint))')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS thermo_lastUsed ON thermo (lastUsed)')
+            self._connection.commit()
+            self._pid = os.getpid()
+        return self._connection
+
+    def close(self):
+        """
+        Close the connection to the SQLite file.
+        """
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+        self._pid = None
+
+    def get(self, identifier, solvent=''):
+        """
+        Return a tuple of the thermo, the energy at 0 K in J/mol and the list
+        of SMILES of the resonance structures in order for the species with
+        the given `identifier`, or ``None`` if it is not in the cache.
+        """
+        connection = self.connection
+        row = connection.execute('SELECT thermo, E0, structures FROM thermo '
+                                 'WHERE identifier = ? AND solvent = ? AND fingerprint = ?',
+                                 (identifier, solvent, self.fingerprint)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        connection.execute('UPDATE thermo SET lastUsed = ? WHERE identifier = ? AND solvent = ? AND fingerprint = ?',
+                           (time.time(), identifier, solvent, self.fingerprint))
+        connection.commit()
+        thermo, E0, structures = row
+        return cPickle.loads(str(thermo)), E0, structures.split() if structures else []
+
+    def put(self, identifier, thermo, E0=None, structures=None, solvent='', label=''):
+        """
+        Store the `thermo` of the species with the given `identifier`, with
+        its energy at 0 K `E0` in J/mol and the list of SMILES `structures`
+        of its resonance structures in order.
+        """
+        connection = self.connection
+        connection.execute('INSERT OR REPLACE INTO thermo VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                           (identifier, solvent, self.fingerprint, label,
+                            sqlite3.Binary(cPickle.dumps(thermo, cPickle.HIGHEST_PROTOCOL)),
+                            E0, ' '.join(structures or []), time.time()))
+        connection.commit()
+        self._insertions += 1
+        if self._insertions % self.evictionInterval == 0:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries until at most `maxEntries`
+        entries remain. Returns the number of removed entries.
+        """
+        connection = self.connection
+        count = connection.execute('SELECT COUNT(*) FROM thermo').fetchone()[0]
+        if count <= self.maxEntries:
+            return 0
+        connection.execute('DELETE FROM thermo WHERE rowid IN '
+                           '(SELECT rowid FROM thermo ORDER BY lastUsed LIMIT ?)', (count - self.maxEntries,))
+        connection.commit()
+        logging.debug('Removed {0:d} entries from the thermo cache {1}'.format(count - self.maxEntries, self.path))
+        return count - self.maxEntries
+
+    def purge(self, fingerprint=None, olderThan=None):
+        """
+        Remove entries from the cache: all entries, or only those with the
+        given database `fingerprint` and/or those not used for `olderThan`
+        seconds. Returns the number of removed entries.
+        """
+        conditions = []
+        values = []
+        if fingerprint is not None:
+            conditions.append('fingerprint = ?')
+            values.append(fingerprint)
+        if olderThan is not None:
+            conditions.append('lastUsed < ?')
+            values.append(time.time() - olderThan)
+        query = 'DELETE FROM thermo'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        connection = self.connection
+        removed = connection.execute(query, values).rowcount
+        connection.commit()
+        connection.execute('VACUUM')
+        return removed
+
+    def getStatistics(self):
+        """
+        Return a dictionary with the number of entries in the cache, the
+        number of entries per database fingerprint and the file size in bytes.
+        """
+        connection = self.connection
+        fingerprints = dict(connection.execute('SELECT fingerprint, COUNT(*) FROM thermo GROUP BY fingerprint'))
+        return {
+            'entries': sum(fingerprints.values()),
+            'fingerprints': fingerprints,
+            'size': os.path.getsize(self.path),
+        }
+
+    def getEntries(self, limit=None):
+        """
+        Return a list of (identifier, solvent, fingerprint, label, last used
+        time) tuples of the most recently used entries in the cache.
+        """
+        query = 'SELECT identifier, solvent, fingerprint, label, lastUsed FROM thermo ORDER BY lastUsed DESC'
+        if limit is not None:
+            return self.connection.execute(query + ' LIMIT ?', (limit,)).fetchall()
+        return self.connection.execute(query).fetchall()
+
+    def getSpeciesThermo(self, spc, solventName=''):
+        """
+        Return the cached thermo of the Species object `spc`, or ``None`` if
+        it is not in the cache. Like a new estimate, this sets the energy at
+        0 K of the species and orders its resonance structures as they were
+        ordered by the estimate.
+        """
+        from rmgpy.statmech import Conformer
+
+        try:
+            identifier = spc.getAugmentedInChI()
+        except Exception:
+            logging.debug('Could not generate an identifier for {0}; not using the thermo cache.'.format(spc.label))
+            return None
+        result = self.get(identifier, solventName)
+        if result is None:
+            return None
+        thermo, E0, structures = result
+
+        # Order the resonance structures as in the estimate
+        molecules = list(spc.molecule)
+        ordered = []
+        for smiles in structures:
+            for molecule in molecules:
+                if molecule.toSMILES() == smiles:
+                    ordered.append(molecule)
+                    molecules.remove(molecule)
+                    break
+        spc.molecule = ordered + molecules
+
+        if E0 is not None:
+            if spc.conformer is None:
+                spc.conformer = Conformer()
+            spc.conformer.E0 = (E0, 'J/mol')
+        return thermo
+
+    def saveSpeciesThermo(self, spc, thermo, solventName=''):
+        """
+        Store the `thermo` estimated for the Species object `spc`.
+        """
+        try:
+            identifier = spc.getAugmentedInChI()
+        except Exception:
+            return
+        E0 = spc.conformer.E0.value_si if spc.conformer is not None and spc.conformer.E0 is not None else None
+        self.put(identifier, thermo, E0=E0, structures=[molecule.toSMILES() for molecule in spc.molecule],
+                 solvent=solventName, label=spc.label)
+
+
+def getThermoDatabaseFingerprint(thermoDatabase, solvationDatabase=None):
+    """
+    Return a fingerprint of the thermo database `thermoDatabase`, made from
+    the RMG version and the contents of the files its libraries and groups
+    were loaded from, in order. The cached thermo of liquid phase jobs
+    includes the solvation correction, so for these the files of the
+    solvation database `solvationDatabase` are included as well.
+    """
+    md5 = hashlib.md5()
+    md5.update(rmgpy.__version__)
+    paths = thermoDatabase.libraryFiles + thermoDatabase.groupFiles
+    if solvationDatabase is not None:
+        paths = paths + solvationDatabase.libraryFiles + solvationDatabase.groupFiles
+    for path in paths:
+        md5.update(os.path.basename(path))
+        with open(path, 'rb') as f:
+            md5.update(f.read())
+    return md5.hexdigest()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+"""
+This module contains unit tests of the rmgpy.thermo.thermocache module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from rmgpy.thermo import ThermoData
+from rmgpy.thermo.thermocache import ThermoCache, getThermoDatabaseFingerprint
+
+################################################################################
+
+class TestThermoCache(unittest.TestCase):
+    """
+    Contains unit tests of the :class:`ThermoCache` class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'thermo_cache.sqlite')
+        self.thermo = ThermoData(
+            Tdata=([300, 400, 500, 600, 800, 1000, 1500], 'K'),
+            Cpdata=([35.7, 40.4, 45.3, 49.9, 57.9, 64.2, 74.6], 'J/(mol*K)'),
+            H298=(-74.6, 'kJ/mol'),
+            S298=(186.3, 'J/(mol*K)'),
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testPutGet(self):
+        """
+        Test that thermo stored in the cache is found only for the same
+        species, solvent and database fingerprint.
+        """
+        cache = ThermoCache(self.path, fingerprint='a')
+        cache.put('InChI=1S/CH4/h1H4', self.thermo, E0=-100.0, structures=['C'])
+        cache.close()
+
+        cache = ThermoCache(self.path, fingerprint='a')
+        thermo, E0, structures = cache.get('InChI=1S/CH4/h1H4')
+        self.assertAlmostEqual(thermo.H298.value_si, self.thermo.H298.value_si)
+        self.assertAlmostEqual(thermo.S298.value_si, self.thermo.S298.value_si)
+        self.assertEqual(E0, -100.0)
+        self.assertEqual(structures, ['C'])
+        self.assertIsNone(cache.get('InChI=1S/CH4/h1H4', solvent='water'))
+        self.assertIsNone(cache.get('InChI=1S/C2H6/c1-2/h1-2H3'))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        cache.close()
+
+        cache = ThermoCache(self.path, fingerprint='b')
+        self.assertIsNone(cache.get('InChI=1S/CH4/h1H4'))
+        cache.close()
+
+    def testEvict(self):
+        """
+        Test that the least recently used entries are evicted.
+        """
+        cache = ThermoCache(self.path, maxEntries=2)
+        for identifier in ['a', 'b', 'c']:
+            cache.put(identifier, self.thermo)
+        cache.get('a')
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        cache.close()
+
+    def testPurge(self):
+        """
+        Test that entries are purged by database fingerprint.
+        """
+        for fingerprint in ['a', 'b']:
+            cache = ThermoCache(self.path, fingerprint=fingerprint)
+            cache.put('InChI=1S/CH4/h1H4', self.thermo)
+            cache.close()
+        cache = ThermoCache(self.path)
+        self.assertEqual(cache.getStatistics()['fingerprints'], {'a': 1, 'b': 1})
+        self.assertEqual(cache.purge(fingerprint='a'), 1)
+        self.assertEqual(cache.getStatistics()['entries'], 1)
+        self.assertEqual(cache.purge(olderThan=3600), 0)
+        self.assertEqual(cache.purge(), 1)
+        cache.close()
+
+    def testFingerprint(self):
+        """
+        Test that the database fingerprint changes with the thermo and, if
+        given, the solvation database files.
+        """
+        class FakeDatabase(object):
+            def __init__(self, libraryFiles, groupFiles):
+                self.libraryFiles = libraryFiles
+                self.groupFiles = groupFiles
+
+        paths = []
+        for name in ['library.py', 'group.py', 'solvent.py', 'abraham.py']:
+            paths.append(os.path.join(self.directory, name))
+            with open(paths[-1], 'w') as f:
+                f.write('name = {0!r}\n'.format(name))
+        thermo = FakeDatabase([paths[0]], [paths[1]])
+        solvation = FakeDatabase([paths[2]], [paths[3]])
+
+        gas = getThermoDatabaseFingerprint(thermo)
+        liquid = getThermoDatabaseFingerprint(thermo, solvation)
+        self.assertEqual(getThermoDatabaseFingerprint(thermo), gas)
+        self.assertNotEqual(liquid, gas)
+
+        with open(paths[3], 'a') as f:
+            f.write('entry = None\n')
+        self.assertEqual(getThermoDatabaseFingerprint(thermo), gas)
+        self.assertNotEqual(getThermoDatabaseFingerprint(thermo, solvation), liquid)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
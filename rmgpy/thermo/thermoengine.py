@@ -38,6 +38,21 @@ from rmgpy.statmech import Conformer
 from rmgpy.thermo import Wilhoit, NASA, ThermoData
 import rmgpy.data.rmg
 
+# An optional persistent cache of thermo estimates (a ThermoCache object)
+# which is shared with the jobs that use the same thermo database
+thermoCache = None
+
+def setThermoCache(cache):
+    """
+    Use the :class:`ThermoCache` object `cache` to look up and store thermo
+    estimates in :func:`generateThermoData`, or stop using a cache if
+    `cache` is ``None``.
+    """
+    global thermoCache
+    if thermoCache is not None and thermoCache is not cache:
+        thermoCache.close()
+    thermoCache = cache
+
 def processThermoData(spc, thermo0, thermoClass=NASA, solventName = ''):
     """
     Converts via Wilhoit into required `thermoClass` and sets `E0`.
@@ -122,6 +137,9 @@ def generateThermoData(spc, thermoClass=NASA, solventName=''):
     
     It then calls :meth:`processThermoData`, to convert (via Wilhoit) to NASA
     and set the E0.
+
+    If a thermo cache has been set with :func:`setThermoCache`, NASA thermo
+    estimated before with the same database is taken from the cache instead.
     
     Result stored in `spc.thermo` and returned.
     """
@@ -132,6 +150,11 @@ def generateThermoData(spc, thermoClass=NASA, solventName=''):
     except Exception:
         logging.debug('Could not obtain the thermo database. Not generating thermo...')
         return None
+
+    if thermoCache is not None and thermoClass is NASA:
+        thermo = thermoCache.getSpeciesThermo(spc, solventName)
+        if thermo is not None:
+            return thermo
     
     thermo0 = thermodb.getThermoData(spc) 
 
@@ -151,8 +174,11 @@ def generateThermoData(spc, thermoClass=NASA, solventName=''):
         and thermoCentralDatabase.satisfyRegistrationRequirements(spc, thermo0, thermodb):
         
         thermoCentralDatabase.registerInCentralThermoDB(spc)
-        
-    return processThermoData(spc, thermo0, thermoClass, solventName)
+
+    thermo = processThermoData(spc, thermo0, thermoClass, solventName)
+    if thermoCache is not None and thermoClass is NASA:
+        thermoCache.saveSpeciesThermo(spc, thermo, solventName)
+    return thermo
 
 
 def evaluator(spc, solventName = ''):
@@ -185,3 +211,69 @@ def submit(spc, solventName = ''):
     """
     spc.thermo = evaluator(spc, solventName= solventName)
 
+
+def submit_many(spcs, solventName='', procnum=1):
+    """
+    Calculate the thermo of each of the Species objects in `spcs`, using
+    `procnum` worker processes that hold the RMG database.
+
+    The result for each species is the same as from :func:`submit`: the
+    species gets its thermo, the resonance structures are ordered as by the
+    thermo estimate, and the energy at 0 K is set on the conformer. The
+    results are applied in the order of `spcs`. The thermo cache lookups made
+    by the workers are added to the hits and misses of the thermo cache.
+    """
+    if procnum == 1 or len(spcs) < 2:
+        for spc in spcs:
+            submit(spc, solventName)
+        return
+
+    from rmgpy.rmg.react import get_pool, compact_species
+
+    # Generate the resonance structures here, as evaluator() would, so the
+    # workers can report the final order of the structures by index
+    tasks = []
+    for i, spc in enumerate(spcs):
+        logging.debug("Evaluating spc %s ", spc)
+        spc.generate_resonance_structures()
+        tasks.append((i, compact_species(spc), solventName))
+
+    results = [None] * len(tasks)
+    chunksize = max(1, len(tasks) // (4 * procnum))
+    for i, result in get_pool(procnum).imap_unordered(_evaluate_compact_species, tasks, chunksize):
+        results[i] = result
+
+    for spc, (thermo, order, E0, symmetryNumber, cacheHits, cacheMisses) in zip(spcs, results):
+        if thermoCache is not None:
+            thermoCache.hits += cacheHits
+            thermoCache.misses += cacheMisses
+        spc.molecule = [spc.molecule[index] for index in order]
+        if E0 is not None:
+            if spc.conformer is None:
+                spc.conformer = Conformer()
+            spc.conformer.E0 = E0
+        if spc.symmetryNumber == -1:
+            spc.symmetryNumber = symmetryNumber
+        spc.thermo = thermo
+
+def _evaluate_compact_species(args):
+    """
+    Module-level function passed to workers by :func:`submit_many`.
+
+    Generates the thermo for a species sent in compact form and returns it
+    together with the new order of its resonance structures, its energy at
+    0 K, its symmetry number and the numbers of thermo cache hits and misses
+    of the worker while generating it.
+    """
+    from rmgpy.rmg.react import expand_species
+
+    index, data, solventName = args
+    spc = expand_species(data)
+    molecules = dict([(id(molecule), i) for i, molecule in enumerate(spc.molecule)])
+    cacheHits, cacheMisses = (thermoCache.hits, thermoCache.misses) if thermoCache is not None else (0, 0)
+    thermo = generateThermoData(spc, solventName=solventName)
+    if thermoCache is not None:
+        cacheHits, cacheMisses = thermoCache.hits - cacheHits, thermoCache.misses - cacheMisses
+    order = [molecules[id(molecule)] for molecule in spc.molecule]
+    E0 = spc.conformer.E0 if spc.conformer is not None else None
+    return index, (thermo, order, E0, spc.symmetryNumber, cacheHits, cacheMisses)
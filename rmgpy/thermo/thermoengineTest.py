@@ -33,6 +33,8 @@ This module contains unit tests of the rmgpy.parallel module.
 """
 
 import os
+import shutil
+import tempfile
 import unittest
 import random
 
@@ -41,7 +43,9 @@ from rmgpy.data.rmg import RMGDatabase
 from rmgpy.rmg.main import RMG
 
 from rmgpy.species import Species
-from rmgpy.thermo.thermoengine import submit
+from rmgpy.thermo.thermocache import ThermoCache
+from rmgpy.thermo.thermoengine import submit, submit_many, setThermoCache
+from rmgpy.rmg.react import close_pool
 
 try:
     from scoop import futures, _control, shared
@@ -136,5 +140,50 @@ def funcSubmitGet():
     return True
 
 
+class TestSubmitMany(unittest.TestCase):
+
+    def setUp(self):
+        load()
+
+    def tearDown(self):
+        close_pool()
+        tearDown()
+
+    def testParallelMatchesSerial(self):
+        """
+        Test that thermo generated by the worker pool is identical to serial thermo
+        """
+        smiles = ['C', 'CC', '[CH2]C=C', 'C=CC=C[CH2]', 'c1ccccc1']
+        serial = [Species().fromSMILES(s) for s in smiles]
+        parallel = [Species().fromSMILES(s) for s in smiles]
+
+        submit_many(serial)
+        submit_many(parallel, procnum=2)
+
+        for spc1, spc2 in zip(serial, parallel):
+            self.assertEqual(spc1.thermo.comment, spc2.thermo.comment)
+            self.assertAlmostEqual(spc1.thermo.getEnthalpy(298), spc2.thermo.getEnthalpy(298))
+            self.assertAlmostEqual(spc1.thermo.getEntropy(298), spc2.thermo.getEntropy(298))
+            self.assertEqual(spc1.conformer.E0.value_si, spc2.conformer.E0.value_si)
+            self.assertEqual([mol.toSMILES() for mol in spc1.molecule], [mol.toSMILES() for mol in spc2.molecule])
+
+    def testThermoCacheCounts(self):
+        """
+        Test that the thermo cache lookups made by the worker pool are counted
+        """
+        smiles = ['C', 'CC', '[CH2]C=C', 'C=CC=C[CH2]']
+        directory = tempfile.mkdtemp()
+        cache = ThermoCache(os.path.join(directory, 'thermo.sqlite'))
+        setThermoCache(cache)
+        try:
+            submit_many([Species().fromSMILES(s) for s in smiles], procnum=2)
+            self.assertEqual((cache.hits, cache.misses), (0, len(smiles)))
+            submit_many([Species().fromSMILES(s) for s in smiles], procnum=2)
+            self.assertEqual((cache.hits, cache.misses), (len(smiles), len(smiles)))
+        finally:
+            setThermoCache(None)
+            shutil.rmtree(directory)
+
+
 if __name__ == '__main__' and os.environ.get('IS_ORIGIN', "1") == "1":
     unittest.main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+"""
+This module contains simple benchmarks of performance-critical parts of RMG,
+which can be run from the command line using ``scripts/benchmark.py``. Each
+benchmark is a function that logs a small table of timings; they are meant to
+be used to compare the behavior of RMG before and after a change, not as a
+test of correctness.
+
+The available benchmarks are:
+
+=========================== ====================================================
+Benchmark                   Description
+=========================== ====================================================
+``species``                 Lookup of existing species vs. the size of the edge
+``vf2``                     Isomorphism checks with and without candidate pruning
+``edge``                    Storage of resonance-stabilized edge species with and without lazy resonance
+``startup``                 Loading of the kinetics database with eager and lazy families and libraries
+=========================== ====================================================
+"""
+
+import argparse
+import cPickle
+import logging
+import os.path
+import random
+import time
+
+from rmgpy import settings
+
+from rmgpy.molecule.group import Group
+from rmgpy.molecule.molecule import Molecule
+from rmgpy.molecule.vf2 import VF2
+from rmgpy.species import Species
+
+################################################################################
+
+def generate_random_smiles(numHeavyAtoms, rand):
+    """
+    Return the SMILES string of a random acyclic molecule containing
+    `numHeavyAtoms` heavy atoms (mostly carbon, with some oxygen), using the
+    :class:`random.Random` instance `rand`. Such molecules provide many
+    isomers per formula, which is the worst case for species lookup.
+    """
+    symbols = ['C' if rand.random() < 0.85 else 'O' for i in range(numHeavyAtoms)]
+    symbols[0] = 'C'
+    maxDegree = {'C': 4, 'O': 2}
+    children = [[] for i in range(numHeavyAtoms)]
+    degree = [0] * numHeavyAtoms
+    for index in range(1, numHeavyAtoms):
+        candidates = [parent for parent in range(index) if degree[parent] < maxDegree[symbols[parent]]]
+        if not candidates:
+            symbols[index] = 'C'
+            candidates = [index - 1]
+        parent = rand.choice(candidates)
+        children[parent].append(index)
+        degree[parent] += 1
+        degree[index] += 1
+
+    def write(index):
+        branches = [write(child) for child in children[index]]
+        smiles = symbols[index]
+        for branch in branches[:-1]:
+            smiles += '(' + branch + ')'
+        if branches:
+            smiles += branches[-1]
+        return smiles
+
+    return write(0)
+
+
+def generate_random_molecules(number, rand, minHeavyAtoms=6, maxHeavyAtoms=10):
+    """
+    Return a list of `number` random, not necessarily unique, molecules.
+    """
+    return [Molecule(SMILES=generate_random_smiles(rand.randint(minHeavyAtoms, maxHeavyAtoms), rand))
+            for i in range(number)]
+
+################################################################################
+
+def benchmark_species_lookup(edgeSizes, numQueries=500, seed=0):
+    """
+    Time :meth:`CoreEdgeReactionModel.checkForExistingSpecies` for models
+    containing each of the numbers of species in `edgeSizes`, and compare it
+    to a linear scan over the species with the same formula. Half of the
+    `numQueries` queried molecules are already in the model.
+    """
+    from rmgpy.rmg.model import CoreEdgeReactionModel
+
+    rand = random.Random(seed)
+    logging.info('{0:>10} {1:>10} {2:>16} {3:>16}'.format('Edge size', 'Formulas', 'Indexed (ms)', 'Scan (ms)'))
+    for edgeSize in edgeSizes:
+        model = CoreEdgeReactionModel()
+        while len(model.newSpeciesList) < edgeSize:
+            for molecule in generate_random_molecules(edgeSize - len(model.newSpeciesList), rand):
+                model.makeNewSpecies(molecule, generateThermo=False)
+
+        queries = [rand.choice(model.newSpeciesList).molecule[0].copy(deep=True) for i in range(numQueries // 2)]
+        queries.extend(generate_random_molecules(numQueries - len(queries), rand))
+
+        t0 = time.time()
+        for molecule in queries:
+            model.checkForExistingSpecies(molecule)
+        indexedTime = (time.time() - t0) / len(queries)
+
+        t0 = time.time()
+        for molecule in queries:
+            for spec in model.speciesDict.get(molecule.getFormula(), []):
+                if spec.isIsomorphic(molecule, strict=False):
+                    break
+        scanTime = (time.time() - t0) / len(queries)
+
+        logging.info('{0:>10d} {1:>10d} {2:>16.4f} {3:>16.4f}'.format(
+            len(model.newSpeciesList), len(model.speciesDict), indexedTime * 1000., scanTime * 1000.))
+
+
+def benchmark_isomorphism(sizes, numMolecules=100, seed=0):
+    """
+    Time isomorphism checks between random molecules containing each of the
+    numbers of heavy atoms in `sizes` and shuffled copies of them, and subgraph
+    isomorphism checks of the molecules against a small group, with and
+    without the rejection of candidate pairs by :class:`VF2`. The numbers of
+    candidate pairs checked for feasibility and rejected are also reported.
+    """
+    group = Group().fromAdjacencyList("""
+    1 C u0 {2,S} {3,S}
+    2 C u0 {1,S}
+    3 O u0 {1,S} {4,S}
+    4 H u0 {3,S}
+    """)
+
+    rand = random.Random(seed)
+    vf2 = VF2()
+    logging.info('{0:>12} {1:>10} {2:>8} {3:>14} {4:>14} {5:>12}'.format(
+        'Heavy atoms', 'Check', 'Pruning', 'Pairs checked', 'Pairs pruned', 'Time (ms)'))
+    for size in sizes:
+        molecules = generate_random_molecules(numMolecules, rand, minHeavyAtoms=size, maxHeavyAtoms=size)
+        copies = []
+        for molecule in molecules:
+            atoms = molecule.copy(deep=True).atoms
+            rand.shuffle(atoms)
+            copies.append(Molecule(atoms=atoms))
+
+        for check in ['isomorphic', 'subgraph']:
+            for prune in [False, True]:
+                vf2.pruneCandidates = prune
+                vf2.pairsExplored = vf2.pairsPruned = 0
+                t0 = time.time()
+                for molecule, copy in zip(molecules, copies):
+                    if check == 'isomorphic':
+                        vf2.isIsomorphic(molecule, copy, None)
+                    else:
+                        vf2.isSubgraphIsomorphic(molecule, group, None)
+                elapsed = (time.time() - t0) / numMolecules
+                logging.info('{0:>12d} {1:>10} {2:>8} {3:>14d} {4:>14d} {5:>12.4f}'.format(
+                    size, check, 'on' if prune else 'off', vf2.pairsExplored, vf2.pairsPruned, elapsed * 1000.))
+
+
+def benchmark_edge_species(numSpecies=1000, numCore=50, seed=0):
+    """
+    Compare the storage of `numSpecies` random resonance-stabilized edge
+    species with and without the lazy resonance mode of
+    :class:`CoreEdgeReactionModel`. The number of stored resonance structures,
+    the pickled size of the edge (as a measure of its memory use), the time
+    to make deep copies of the species and the time to restore the resonance
+    structures of `numCore` of them, as when adding them to the core, are
+    reported.
+    """
+    from rmgpy.rmg.model import CoreEdgeReactionModel
+
+    rand = random.Random(seed)
+    smiles = ['[CH2]C=CC=C' + generate_random_smiles(rand.randint(2, 6), rand) for i in range(numSpecies)]
+    logging.info('{0:>6} {1:>10} {2:>12} {3:>12} {4:>12} {5:>12}'.format(
+        'Lazy', 'Species', 'Structures', 'Size (kB)', 'Copy (ms)', 'Restore (ms)'))
+    for lazy in [False, True]:
+        model = CoreEdgeReactionModel()
+        model.lazyResonance = lazy
+        for smi in smiles:
+            spc, isNew = model.makeNewSpecies(Molecule(SMILES=smi), generateThermo=False)
+            if isNew:
+                model.addSpeciesToEdge(spc)
+        if lazy:
+            model.reduceNewResonanceStructures()
+
+        numStructures = sum([len(spc.molecule) for spc in model.edge.species])
+        size = len(cPickle.dumps(model.edge.species, cPickle.HIGHEST_PROTOCOL))
+
+        t0 = time.time()
+        for spc in model.edge.species:
+            spc.copy(deep=True)
+        copyTime = time.time() - t0
+
+        t0 = time.time()
+        if lazy:
+            for spc in random.Random(seed).sample(model.edge.species, min(numCore, len(model.edge.species))):
+                model.restoreResonanceStructures(spc)
+        restoreTime = time.time() - t0
+
+        logging.info('{0:>6} {1:>10d} {2:>12d} {3:>12.1f} {4:>12.1f} {5:>12.1f}'.format(
+            'on' if lazy else 'off', len(model.edge.species), numStructures,
+            size / 1024., copyTime * 1000., restoreTime * 1000.))
+
+
+def benchmark_database_startup(path, families, libraries, smiles):
+    """
+    Compare loading the kinetics database at `path` with the given
+    `families` and `libraries` eagerly and lazily. For each mode, the time
+    to load the database (as for a job that exits right after starting) and
+    the time to then generate the reactions of each pair of the species in
+    `smiles` (as for a small job) are reported, along with the numbers of
+    family components (groups, rules and depositories) and libraries that
+    were loaded at that point. The lazy mode runs first, so it does not
+    benefit from files cached by the operating system during the eager run.
+    """
+    from rmgpy.data.kinetics.database import KineticsDatabase
+
+    species = [Species(SMILES=smi) for smi in smiles]
+    pairs = [(spc1, spc2) for index, spc1 in enumerate(species) for spc2 in species[index:]]
+
+    def count_loaded(database):
+        numComponents = sum([3 - len(family.unloadedComponents) for family in database.families.itervalues()])
+        numLibraries = sum([1 for library in database.libraries.itervalues() if not library.unloadedComponents])
+        return '{0:d}/{1:d}'.format(numComponents, 3 * len(database.families)), \
+               '{0:d}/{1:d}'.format(numLibraries, len(database.libraries))
+
+    logging.info('{0:>6} {1:>12} {2:>12} {3:>12} {4:>12} {5:>12} {6:>12}'.format(
+        'Lazy', 'Load (s)', 'Components', 'Libraries', 'Job (s)', 'Components', 'Libraries'))
+    for lazy in [True, False]:
+        t0 = time.time()
+        database = KineticsDatabase()
+        database.load(path, families=families, libraries=libraries, lazy=lazy)
+        loadTime = time.time() - t0
+        loadedAfterLoad = count_loaded(database)
+
+        t0 = time.time()
+        numReactions = 0
+        for spc in species:
+            numReactions += len(database.generate_reactions_from_families([spc.copy(deep=True)]))
+        for spc1, spc2 in pairs:
+            numReactions += len(database.generate_reactions_from_families([spc1.copy(deep=True),
+                                                                           spc2.copy(deep=True)]))
+        jobTime = time.time() - t0
+        loadedAfterJob = count_loaded(database)
+
+        logging.info('{0:>6} {1:>12.2f} {2:>12} {3:>12} {4:>12.2f} {5:>12} {6:>12}'.format(
+            'on' if lazy else 'off', loadTime, loadedAfterLoad[0], loadedAfterLoad[1],
+            jobTime, loadedAfterJob[0], loadedAfterJob[1]))
+        logging.debug('Generated {0:d} reactions'.format(numReactions))
+
+################################################################################
+
+def parseCommandLineArguments():
+    """
+    Parse the command-line arguments for the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description='Run performance benchmarks of RMG.')
+    subparsers = parser.add_subparsers(dest='benchmark', help='the benchmark to run')
+
+    species = subparsers.add_parser('species', help='lookup of existing species vs. the size of the edge')
+    species.add_argument('--sizes', metavar='N', type=int, nargs='+', default=[100, 1000, 10000],
+                         help='the numbers of edge species to benchmark')
+    species.add_argument('--queries', metavar='N', type=int, default=500,
+                         help='the number of species lookups to time')
+
+    vf2 = subparsers.add_parser('vf2', help='isomorphism checks with and without candidate pruning')
+    vf2.add_argument('--sizes', metavar='N', type=int, nargs='+', default=[10, 20, 40],
+                     help='the numbers of heavy atoms of the molecules to benchmark')
+    vf2.add_argument('--molecules', metavar='N', type=int, default=100,
+                     help='the number of molecules of each size')
+
+    edge = subparsers.add_parser('edge', help='storage of edge species with and without lazy resonance')
+    edge.add_argument('--species', metavar='N', type=int, default=1000,
+                      help='the number of edge species to generate')
+    edge.add_argument('--core', metavar='N', type=int, default=50,
+                      help='the number of edge species to add to the core')
+
+    startup = subparsers.add_parser('startup', help='loading of the kinetics database with eager and lazy families')
+    startup.add_argument('--database', metavar='PATH',
+                         default=os.path.join(settings['database.directory'], 'kinetics'),
+                         help='the kinetics database to load')
+    startup.add_argument('--families', metavar='LABEL', nargs='+', default=['default'],
+                         help='the kinetics families to load')
+    startup.add_argument('--libraries', metavar='LABEL', nargs='*', default=[],
+                         help='the kinetics libraries to load')
+    startup.add_argument('--species', metavar='SMILES', nargs='+', default=['C', 'CC', '[OH]', '[CH3]'],
+                         help='the species to react in the small job')
+
+    return parser.parse_args()
+
+
+def main():
+    """
+    Driver function that parses the command-line arguments and runs the requested benchmark.
+    """
+    args = parseCommandLineArguments()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if args.benchmark == 'species':
+        benchmark_species_lookup(args.sizes, numQueries=args.queries)
+    elif args.benchmark == 'vf2':
+        benchmark_isomorphism(args.sizes, numMolecules=args.molecules)
+    elif args.benchmark == 'edge':
+        benchmark_edge_species(numSpecies=args.species, numCore=args.core)
+    elif args.benchmark == 'startup':
+        benchmark_database_startup(args.database, args.families, args.libraries, args.species)
@@ -43,6 +43,7 @@ import warnings
 from rmgpy.solver.base import TerminationTime, TerminationConversion
 from rmgpy.solver.liquid import LiquidReactor
 from rmgpy.kinetics.diffusionLimited import diffusionLimiter
+from rmgpy.data.rmg import RMGDatabase
 from rmgpy.rmg.settings import SimulatorSettings
 from .loader import loadRMGJob
 
@@ -595,7 +596,9 @@ def createFluxDiagram(inputFile, chemkinFile, speciesDict, savePath=None, specie
             else:
                 # Enable diffusion-limited rates
                 if diffusionLimited and isinstance(reactionSystem, LiquidReactor):
-                    rmg.loadDatabase()
+                    # Only the solvation database is needed for the diffusion limits
+                    rmg.database = RMGDatabase()
+                    rmg.database.loadSolvation(os.path.join(rmg.databaseDirectory, 'solvation'))
                     solventData = rmg.database.solvation.getSolventData(rmg.solvent)
                     diffusionLimiter.enable(solventData, rmg.database.solvation)
 
@@ -39,6 +39,7 @@ from rmgpy.tools.plot import ReactionSensitivityPlot, ThermoSensitivityPlot
 from rmgpy.rmg.settings import ModelSettings
 from rmgpy.solver.liquid import LiquidReactor
 from rmgpy.kinetics.diffusionLimited import diffusionLimiter
+from rmgpy.data.rmg import RMGDatabase
 
 def plot_sensitivity(outputDirectory, reactionSystemIndex, sensitiveSpeciesList, number=10, fileformat='.png'):
     """
@@ -115,7 +116,9 @@ def simulate(rmg, diffusionLimited=True):
 
         if isinstance(reactionSystem, LiquidReactor):
             if diffusionLimited:
-                rmg.loadDatabase()
+                # Only the solvation database is needed for the diffusion limits
+                rmg.database = RMGDatabase()
+                rmg.database.loadSolvation(os.path.join(rmg.databaseDirectory, 'solvation'))
                 solventData = rmg.database.solvation.getSolventData(rmg.solvent)
                 diffusionLimiter.enable(solventData, rmg.database.solvation)
 
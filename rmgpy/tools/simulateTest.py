@@ -35,6 +35,7 @@ import shutil
 
 from rmgpy.tools.simulate import run_simulation
 import rmgpy
+import rmgpy.data.rmg
 
 class SimulateTest(unittest.TestCase):
 
@@ -72,6 +73,34 @@ class SimulateTest(unittest.TestCase):
 
         shutil.rmtree(os.path.join(folder, 'solver'))
 
+    def test_liquid_diffusion_limited(self):
+        """
+        Test that only the solvation database is loaded for diffusion limited rates
+        """
+        from rmgpy.kinetics.diffusionLimited import diffusionLimiter
+        folder = os.path.join(os.path.dirname(rmgpy.__file__), 'tools/data/sim/liquid')
+
+        inputFile = os.path.join(folder, 'input.py')
+        chemkinFile = os.path.join(folder, 'chem.inp')
+        dictFile = os.path.join(folder, 'species_dictionary.txt')
+
+        try:
+            run_simulation(inputFile, chemkinFile, dictFile, diffusionLimited=True)
+            self.assertTrue(diffusionLimiter.enabled)
+        finally:
+            if diffusionLimiter.enabled:
+                diffusionLimiter.disable()
+
+        database = rmgpy.data.rmg.database
+        self.assertIsNotNone(database.solvation)
+        self.assertIsNone(database.thermo)
+        self.assertIsNone(database.kinetics)
+
+        simfile = os.path.join(folder, 'solver', 'simulation_1_28.csv')
+        self.assertTrue(os.path.isfile(simfile))
+
+        shutil.rmtree(os.path.join(folder, 'solver'))
+
     def tearDown(self):
         import rmgpy.data.rmg
         rmgpy.data.rmg.database = None
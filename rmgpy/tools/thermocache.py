@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+"""
+This module contains a command-line interface to inspect and purge the
+persistent thermo cache used by RMG jobs (see the ``thermoCache`` option of
+the input file), which can be run using ``scripts/thermoCache.py``.
+"""
+
+import argparse
+import datetime
+import logging
+
+from rmgpy.thermo.thermocache import ThermoCache
+
+################################################################################
+
+def show_info(cache):
+    """
+    Log the number of entries and the size of the thermo `cache`, and the
+    number of entries for each thermo database fingerprint.
+    """
+    statistics = cache.getStatistics()
+    logging.info('Thermo cache {0}'.format(cache.path))
+    logging.info('    {0:d} entries, {1:.1f} MB'.format(statistics['entries'], statistics['size'] / 1048576.))
+    for fingerprint, count in sorted(statistics['fingerprints'].items(), key=lambda item: -item[1]):
+        logging.info('    {0} {1:>10d} entries'.format(fingerprint, count))
+
+
+def list_entries(cache, limit=None):
+    """
+    Log the most recently used entries of the thermo `cache`.
+    """
+    for identifier, solvent, fingerprint, label, lastUsed in cache.getEntries(limit):
+        logging.info('{0} {1} {2:<20} {3:<16} {4}'.format(
+            datetime.datetime.fromtimestamp(lastUsed).strftime('%Y-%m-%d %H:%M'),
+            fingerprint[:8], label, solvent or '-', identifier))
+
+
+def purge_entries(cache, fingerprint=None, olderThan=None):
+    """
+    Remove entries from the thermo `cache`: all entries, or only those with the
+    given database `fingerprint` and/or those not used for `olderThan` days.
+    """
+    removed = cache.purge(fingerprint=fingerprint,
+                          olderThan=olderThan * 86400. if olderThan is not None else None)
+    logging.info('Removed {0:d} entries from the thermo cache {1}'.format(removed, cache.path))
+
+################################################################################
+
+def parseCommandLineArguments():
+    """
+    Parse the command-line arguments for the thermo cache tool.
+    """
+    parser = argparse.ArgumentParser(description='Inspect and purge the persistent thermo cache of RMG.')
+    parser.add_argument('path', metavar='FILE', type=str, help='the thermo cache file')
+    subparsers = parser.add_subparsers(dest='command', help='the command to run')
+
+    subparsers.add_parser('info', help='show the number of entries and the size of the cache')
+
+    entries = subparsers.add_parser('list', help='list the most recently used entries')
+    entries.add_argument('--limit', metavar='N', type=int, default=None,
+                         help='the maximum number of entries to list')
+
+    purge = subparsers.add_parser('purge', help='remove entries from the cache (all entries by default)')
+    purge.add_argument('--fingerprint', metavar='HASH', type=str, default=None,
+                       help='only remove the entries of the thermo database with this fingerprint')
+    purge.add_argument('--older-than', metavar='DAYS', type=float, default=None, dest='olderThan',
+                       help='only remove the entries not used in the given number of days')
+
+    return parser.parse_args()
+
+
+def main():
+    """
+    Driver function that parses the command-line arguments and runs the requested command.
+    """
+    args = parseCommandLineArguments()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    cache = ThermoCache(args.path)
+    try:
+        if args.command == 'info':
+            show_info(cache)
+        elif args.command == 'list':
+            list_entries(cache, limit=args.limit)
+        elif args.command == 'purge':
+            purge_entries(cache, fingerprint=args.fingerprint, olderThan=args.olderThan)
+    finally:
+        cache.close()